@@ -0,0 +1,160 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module dcr.artifact_cache: Reuse the stage outputs of identical documents.
+
+The outputs of the expensive process steps are stored in a content-addressed
+cache. The cache key is derived from the SHA256 hash string of the document,
+its language and the configuration of the process step, which includes the
+hash string of the input file if it is itself the output of a process step. If the same document
+is processed again, the cached output is linked or copied to the target file
+instead of running the process step once more.
+"""
+import errno
+import hashlib
+import json
+import os
+import shutil
+
+import dcr_core.core_glob
+
+import dcr.cfg.glob
+
+# -----------------------------------------------------------------------------
+# Global variables.
+# -----------------------------------------------------------------------------
+STAGE_OCR = "ocr"
+STAGE_TET = "tet"
+
+
+# -----------------------------------------------------------------------------
+# Determine the cache key of the current document and a process step.
+# -----------------------------------------------------------------------------
+def get_artifact_key(stage: str, *stage_config: str) -> str:
+    """Determine the cache key of the current document and a process step.
+
+    Args:
+        stage (str): The process step.
+        *stage_config (str): The configuration of the process step.
+
+    Returns:
+        str: The cache key, empty if the artifact cache is not active.
+    """
+    if not dcr_core.core_glob.setup.artifact_cache_directory or not dcr.cfg.glob.document.document_sha256:
+        return ""
+
+    return hashlib.sha256(
+        json.dumps(
+            [
+                dcr.cfg.glob.document.document_sha256,
+                dcr.cfg.glob.document.document_id_language,
+                stage,
+                *stage_config,
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# Determine the full file name of a cached artifact.
+# -----------------------------------------------------------------------------
+def get_full_name_artifact(artifact_key: str, file_type: str) -> str:
+    """Determine the full file name of a cached artifact.
+
+    Args:
+        artifact_key (str): The cache key.
+        file_type (str): The file type of the artifact.
+
+    Returns:
+        str: The full file name in the artifact cache.
+    """
+    return os.path.join(
+        dcr_core.core_glob.setup.artifact_cache_directory,
+        artifact_key[:2],
+        artifact_key + "." + file_type,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Link a file or copy it, if linking is not possible.
+# -----------------------------------------------------------------------------
+def link_or_copy_file(full_name_curr: str, full_name_next: str) -> None:
+    """Link a file or copy it, if linking is not possible.
+
+    Args:
+        full_name_curr (str): The existing file.
+        full_name_next (str): The new file.
+
+    Raises:
+        OSError: If the file can neither be linked nor copied.
+    """
+    try:
+        os.link(full_name_curr, full_name_next)
+    except OSError as err:
+        # Hard links are not possible across file systems.
+        if err.errno not in (errno.EXDEV, errno.EPERM):
+            raise
+
+        shutil.copy2(full_name_curr, full_name_next)
+
+
+# -----------------------------------------------------------------------------
+# Restore a cached artifact.
+# -----------------------------------------------------------------------------
+def restore_artifact(artifact_key: str, full_name_next: str) -> bool:
+    """Restore a cached artifact.
+
+    Args:
+        artifact_key (str): The cache key, empty if the artifact cache is not active.
+        full_name_next (str): The target file.
+
+    Returns:
+        bool: True if the cached artifact has been restored.
+    """
+    if not artifact_key:
+        return False
+
+    full_name_artifact = get_full_name_artifact(artifact_key, os.path.splitext(full_name_next)[1][1:])
+
+    if not os.path.isfile(full_name_artifact):
+        return False
+
+    link_or_copy_file(full_name_artifact, full_name_next)
+
+    dcr_core.core_glob.logger.debug("Artifact '%s' restored from the artifact cache to '%s'", artifact_key, full_name_next)
+
+    return True
+
+
+# -----------------------------------------------------------------------------
+# Store an artifact in the artifact cache.
+# -----------------------------------------------------------------------------
+def store_artifact(artifact_key: str, full_name: str) -> None:
+    """Store an artifact in the artifact cache.
+
+    The artifact is first linked or copied to a temporary file, which
+    then atomically becomes the cached artifact. Therefore, concurrent
+    worker processes never see an incomplete artifact.
+
+    Args:
+        artifact_key (str): The cache key, empty if the artifact cache is not active.
+        full_name (str): The file with the stage output.
+    """
+    if not artifact_key:
+        return
+
+    full_name_artifact = get_full_name_artifact(artifact_key, os.path.splitext(full_name)[1][1:])
+
+    if os.path.isfile(full_name_artifact):
+        return
+
+    os.makedirs(os.path.dirname(full_name_artifact), exist_ok=True)
+
+    full_name_temp = full_name_artifact + "." + str(os.getpid()) + ".tmp"
+
+    link_or_copy_file(full_name, full_name_temp)
+
+    os.replace(full_name_temp, full_name_artifact)
+
+    dcr_core.core_glob.logger.debug("Artifact '%s' stored in the artifact cache", artifact_key)
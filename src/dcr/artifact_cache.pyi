@@ -0,0 +1,13 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module stub file."""
+STAGE_OCR: str
+STAGE_TET: str
+
+def get_artifact_key(stage: str, *stage_config: str) -> str: ...
+def get_full_name_artifact(artifact_key: str, file_type: str) -> str: ...
+def link_or_copy_file(full_name_curr: str, full_name_next: str) -> None: ...
+def restore_artifact(artifact_key: str, full_name_next: str) -> bool: ...
+def store_artifact(artifact_key: str, full_name: str) -> None: ...
@@ -27,8 +27,10 @@ class Setup(dcr_core.cls_setup.Setup):
     # -----------------------------------------------------------------------------
     # Class variables.
     # -----------------------------------------------------------------------------
-    _CONFIG_PARAM_NO = 129
+    _CONFIG_PARAM_NO = 162
 
+    _DCR_CFG_ACTION_PAGE_SIZE: ClassVar[str] = "action_page_size"
+    _DCR_CFG_ARTIFACT_CACHE_DIRECTORY: ClassVar[str] = "artifact_cache_directory"
     _DCR_CFG_DB_CONNECTION_PORT: ClassVar[str] = "db_connection_port"
     _DCR_CFG_DB_CONNECTION_PREFIX: ClassVar[str] = "db_connection_prefix"
     _DCR_CFG_DB_CONTAINER_PORT: ClassVar[str] = "db_container_port"
@@ -39,20 +41,60 @@ class Setup(dcr_core.cls_setup.Setup):
     _DCR_CFG_DB_INITIAL_DATA_FILE: ClassVar[str] = "db_initial_data_file"
     _DCR_CFG_DB_PASSWORD: ClassVar[str] = "db_password"
     _DCR_CFG_DB_PASSWORD_ADMIN: ClassVar[str] = "db_password_admin"
+    _DCR_CFG_DB_POOL_CLASS: ClassVar[str] = "db_pool_class"
+    _DCR_CFG_DB_POOL_MAX_OVERFLOW: ClassVar[str] = "db_pool_max_overflow"
+    _DCR_CFG_DB_POOL_PRE_PING: ClassVar[str] = "db_pool_pre_ping"
+    _DCR_CFG_DB_POOL_RECYCLE: ClassVar[str] = "db_pool_recycle"
+    _DCR_CFG_DB_POOL_SIZE: ClassVar[str] = "db_pool_size"
     _DCR_CFG_DB_SCHEMA: ClassVar[str] = "db_schema"
+    _DCR_CFG_DB_STATEMENT_TIMEOUT: ClassVar[str] = "db_statement_timeout"
     _DCR_CFG_DB_USER: ClassVar[str] = "db_user"
     _DCR_CFG_DB_USER_ADMIN: ClassVar[str] = "db_user_admin"
+    _DCR_CFG_DB_WRITE_BEHIND_DOCUMENTS: ClassVar[str] = "db_write_behind_documents"
+    _DCR_CFG_DB_WRITE_BEHIND_INTERVAL: ClassVar[str] = "db_write_behind_interval"
     _DCR_CFG_DIRECTORY_INBOX_ACCEPTED: ClassVar[str] = "directory_inbox_accepted"
     _DCR_CFG_DIRECTORY_INBOX_REJECTED: ClassVar[str] = "directory_inbox_rejected"
     _DCR_CFG_DOC_ID_IN_FILE_NAME: ClassVar[str] = "doc_id_in_file_name"
     _DCR_CFG_IGNORE_DUPLICATES: ClassVar[str] = "ignore_duplicates"
+    _DCR_CFG_INBOX_FILES_MAX: ClassVar[str] = "inbox_files_max"
+    _DCR_CFG_INBOX_MOVE_JOURNAL_FILE: ClassVar[str] = "inbox_move_journal_file"
+    _DCR_CFG_INBOX_SCAN_CHUNK_SIZE: ClassVar[str] = "inbox_scan_chunk_size"
+    _DCR_CFG_INBOX_TEXT_LAYER_SAMPLE_PAGES: ClassVar[str] = "inbox_text_layer_sample_pages"
+    _DCR_CFG_LEASE_BATCH_SIZE: ClassVar[str] = "lease_batch_size"
+    _DCR_CFG_LEASE_DURATION: ClassVar[str] = "lease_duration"
     _DCR_CFG_LT_EXPORT_RULE_FILE_HEADING: ClassVar[str] = "lt_export_rule_file_heading"
     _DCR_CFG_LT_EXPORT_RULE_FILE_LIST_BULLET: ClassVar[str] = "lt_export_rule_file_list_bullet"
     _DCR_CFG_LT_EXPORT_RULE_FILE_LIST_NUMBER: ClassVar[str] = "lt_export_rule_file_list_number"
+    _DCR_CFG_MAX_WORKERS_INBOX: ClassVar[str] = "max_workers_inbox"
+    _DCR_CFG_MAX_WORKERS_PANDOC: ClassVar[str] = "max_workers_pandoc"
+    _DCR_CFG_MAX_WORKERS_PARSER: ClassVar[str] = "max_workers_parser"
+    _DCR_CFG_MAX_WORKERS_PDF2IMAGE: ClassVar[str] = "max_workers_pdf2image"
+    _DCR_CFG_MAX_WORKERS_PDFLIB: ClassVar[str] = "max_workers_pdflib"
+    _DCR_CFG_MAX_WORKERS_TESSERACT: ClassVar[str] = "max_workers_tesseract"
+    _DCR_CFG_MAX_WORKERS_TOKENIZER: ClassVar[str] = "max_workers_tokenizer"
+    _DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT: ClassVar[str] = "ocr_blank_page_ink_limit"
+    _DCR_CFG_OCR_ENGINE_POOL: ClassVar[str] = "ocr_engine_pool"
+    _DCR_CFG_OCR_PREPROCESSING: ClassVar[str] = "ocr_preprocessing"
+    _DCR_CFG_OCR_PREPROCESSING_DPI: ClassVar[str] = "ocr_preprocessing_dpi"
+    _DCR_CFG_PDF2IMAGE_CHUNK_SIZE: ClassVar[str] = "pdf2image_chunk_size"
+    _DCR_CFG_PDF2IMAGE_CHUNK_WORKERS: ClassVar[str] = "pdf2image_chunk_workers"
+    _DCR_CFG_PDF2IMAGE_IN_MEMORY: ClassVar[str] = "pdf2image_in_memory"
     _DCR_CFG_SECTION: ClassVar[str] = "dcr"
     _DCR_CFG_SECTION_CORE: ClassVar[str] = "dcr_core"
     _DCR_CFG_SECTION_CORE_SPACY: ClassVar[str] = "dcr_core.spacy"
     _DCR_CFG_SECTION_ENV_TEST: ClassVar[str] = "dcr.env.test"
+    _DCR_CFG_SHA256_CACHE_FILE: ClassVar[str] = "sha256_cache_file"
+    _DCR_CFG_TOKENIZE_2_DATABASE_CHUNK_SIZE: ClassVar[str] = "tokenize_2_database_chunk_size"
+    _DCR_CFG_WATCH_INTERVAL: ClassVar[str] = "watch_interval"
+
+    DB_POOL_CLASS_NULL: ClassVar[str] = "null"
+    DB_POOL_CLASS_QUEUE: ClassVar[str] = "queue"
+
+    OCR_PREPROCESSING_BINARISE: ClassVar[str] = "binarise"
+    OCR_PREPROCESSING_DESKEW: ClassVar[str] = "deskew"
+    OCR_PREPROCESSING_DOWNSCALE: ClassVar[str] = "downscale"
+    OCR_PREPROCESSING_GRAYSCALE: ClassVar[str] = "grayscale"
+    OCR_PREPROCESSING_NONE: ClassVar[str] = "none"
 
     # -----------------------------------------------------------------------------
     # Initialise the instance.
@@ -96,6 +138,49 @@ class Setup(dcr_core.cls_setup.Setup):
         self.lt_export_rule_file_list_bullet = "data/lt_export_rule_list_bullet.json"
         self.lt_export_rule_file_list_number = "data/lt_export_rule_list_number.json"
 
+        self.max_workers_inbox = 1
+        self.max_workers_pandoc = 1
+        self.max_workers_parser = 1
+        self.max_workers_pdf2image = 1
+        self.max_workers_pdflib = 1
+        self.max_workers_tesseract = 1
+        self.max_workers_tokenizer = 1
+
+        self.pdf2image_chunk_size = 50
+        self.pdf2image_chunk_workers = 0
+        self.is_pdf2image_in_memory = False
+
+        self.is_ocr_engine_pool = True
+        self.ocr_blank_page_ink_limit = 10
+        self.ocr_preprocessing: list[str] = []
+        self.ocr_preprocessing_dpi = 300
+
+        self.lease_batch_size = 10
+        self.lease_duration = 0
+
+        self.db_pool_class = Setup.DB_POOL_CLASS_QUEUE
+        self.db_pool_max_overflow = 10
+        self.db_pool_recycle = 3600
+        self.db_pool_size = 5
+        self.db_statement_timeout = 0
+        self.db_write_behind_documents = 1
+        self.db_write_behind_interval = 0
+        self.is_db_pool_pre_ping = True
+
+        self.tokenize_2_database_chunk_size = 1000
+
+        self.action_page_size = 100
+
+        self.artifact_cache_directory = ""
+        self.sha256_cache_file = dcr_core.core_utils.get_os_independent_name("data/sha256_cache.json")
+
+        self.inbox_files_max = 0
+        self.inbox_move_journal_file = dcr_core.core_utils.get_os_independent_name("data/inbox_move_journal.jsonl")
+        self.inbox_scan_chunk_size = 1000
+        self.inbox_text_layer_sample_pages = 0
+
+        self.watch_interval = 60
+
         super()._load_config()
         self._load_config()
 
@@ -119,14 +204,86 @@ class Setup(dcr_core.cls_setup.Setup):
         self.db_connection_port = self._determine_config_param_integer(Setup._DCR_CFG_DB_CONNECTION_PORT, self.db_connection_port)
         self.db_container_port = self._determine_config_param_integer(Setup._DCR_CFG_DB_CONTAINER_PORT, self.db_container_port)
 
+        self._check_config_db_pool_class()
+        self.db_pool_max_overflow = self._determine_config_param_integer(Setup._DCR_CFG_DB_POOL_MAX_OVERFLOW, self.db_pool_max_overflow)
+        self.db_pool_recycle = self._determine_config_param_integer(Setup._DCR_CFG_DB_POOL_RECYCLE, self.db_pool_recycle)
+        self.db_pool_size = self._determine_config_param_integer(Setup._DCR_CFG_DB_POOL_SIZE, self.db_pool_size)
+        self.db_statement_timeout = self._determine_config_param_integer(Setup._DCR_CFG_DB_STATEMENT_TIMEOUT, self.db_statement_timeout)
+        self.db_write_behind_documents = self._determine_config_param_integer(
+            Setup._DCR_CFG_DB_WRITE_BEHIND_DOCUMENTS,
+            self.db_write_behind_documents,
+        )
+        self.db_write_behind_interval = self._determine_config_param_integer(
+            Setup._DCR_CFG_DB_WRITE_BEHIND_INTERVAL,
+            self.db_write_behind_interval,
+        )
+        self.is_db_pool_pre_ping = self._determine_config_param_boolean(Setup._DCR_CFG_DB_POOL_PRE_PING, self.is_db_pool_pre_ping)
+
         self._check_config_directory_inbox_accepted()
         self._check_config_directory_inbox_rejected()
         self._check_config_doc_id_in_file_name()
 
         self.is_ignore_duplicates = self._determine_config_param_boolean(Setup._DCR_CFG_IGNORE_DUPLICATES, self.is_ignore_duplicates)
 
+        self.max_workers_inbox = self._determine_config_param_integer(Setup._DCR_CFG_MAX_WORKERS_INBOX, self.max_workers_inbox)
+        self.max_workers_pandoc = self._determine_config_param_integer(Setup._DCR_CFG_MAX_WORKERS_PANDOC, self.max_workers_pandoc)
+        self.max_workers_parser = self._determine_config_param_integer(Setup._DCR_CFG_MAX_WORKERS_PARSER, self.max_workers_parser)
+        self.max_workers_pdf2image = self._determine_config_param_integer(Setup._DCR_CFG_MAX_WORKERS_PDF2IMAGE, self.max_workers_pdf2image)
+        self.max_workers_pdflib = self._determine_config_param_integer(Setup._DCR_CFG_MAX_WORKERS_PDFLIB, self.max_workers_pdflib)
+        self.max_workers_tesseract = self._determine_config_param_integer(Setup._DCR_CFG_MAX_WORKERS_TESSERACT, self.max_workers_tesseract)
+        self.max_workers_tokenizer = self._determine_config_param_integer(Setup._DCR_CFG_MAX_WORKERS_TOKENIZER, self.max_workers_tokenizer)
+
+        self.pdf2image_chunk_size = self._determine_config_param_integer(Setup._DCR_CFG_PDF2IMAGE_CHUNK_SIZE, self.pdf2image_chunk_size)
+        self.pdf2image_chunk_workers = self._determine_config_param_integer(
+            Setup._DCR_CFG_PDF2IMAGE_CHUNK_WORKERS,
+            self.pdf2image_chunk_workers,
+        )
+        self.is_pdf2image_in_memory = self._determine_config_param_boolean(Setup._DCR_CFG_PDF2IMAGE_IN_MEMORY, self.is_pdf2image_in_memory)
+
+        self.is_ocr_engine_pool = self._determine_config_param_boolean(Setup._DCR_CFG_OCR_ENGINE_POOL, self.is_ocr_engine_pool)
+        self.ocr_blank_page_ink_limit = self._determine_config_param_integer(
+            Setup._DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT,
+            self.ocr_blank_page_ink_limit,
+        )
+        self._check_config_ocr_preprocessing()
+        self.ocr_preprocessing_dpi = self._determine_config_param_integer(Setup._DCR_CFG_OCR_PREPROCESSING_DPI, self.ocr_preprocessing_dpi)
+
+        self.lease_batch_size = self._determine_config_param_integer(Setup._DCR_CFG_LEASE_BATCH_SIZE, self.lease_batch_size)
+        self.lease_duration = self._determine_config_param_integer(Setup._DCR_CFG_LEASE_DURATION, self.lease_duration)
+
+        self.tokenize_2_database_chunk_size = self._determine_config_param_integer(
+            Setup._DCR_CFG_TOKENIZE_2_DATABASE_CHUNK_SIZE,
+            self.tokenize_2_database_chunk_size,
+        )
+
+        self.action_page_size = self._determine_config_param_integer(Setup._DCR_CFG_ACTION_PAGE_SIZE, self.action_page_size)
+
+        self.inbox_files_max = self._determine_config_param_integer(Setup._DCR_CFG_INBOX_FILES_MAX, self.inbox_files_max)
+        self.inbox_scan_chunk_size = self._determine_config_param_integer(Setup._DCR_CFG_INBOX_SCAN_CHUNK_SIZE, self.inbox_scan_chunk_size)
+        self.inbox_text_layer_sample_pages = self._determine_config_param_integer(
+            Setup._DCR_CFG_INBOX_TEXT_LAYER_SAMPLE_PAGES,
+            self.inbox_text_layer_sample_pages,
+        )
+
+        self.watch_interval = self._determine_config_param_integer(Setup._DCR_CFG_WATCH_INTERVAL, self.watch_interval)
+
         dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
+    # -----------------------------------------------------------------------------
+    # Check the configuration parameter - db_pool_class.
+    # -----------------------------------------------------------------------------
+    def _check_config_db_pool_class(self) -> None:
+        """Check the configuration parameter - db_pool_class."""
+        if Setup._DCR_CFG_DB_POOL_CLASS in self._config:
+            db_pool_class = str(self._config[Setup._DCR_CFG_DB_POOL_CLASS]).lower()
+
+            if db_pool_class not in {Setup.DB_POOL_CLASS_NULL, Setup.DB_POOL_CLASS_QUEUE}:
+                dcr_core.core_utils.terminate_fatal(
+                    f"Invalid value '{db_pool_class}' in the configuration parameter '{Setup._DCR_CFG_DB_POOL_CLASS}'"
+                )
+
+            self.db_pool_class = db_pool_class
+
     # -----------------------------------------------------------------------------
     # Check the configuration parameter - directory_inbox_accepted.
     # -----------------------------------------------------------------------------
@@ -164,6 +321,32 @@ class Setup(dcr_core.cls_setup.Setup):
             if str(self._config[Setup._DCR_CFG_DOC_ID_IN_FILE_NAME]).lower() in {"after", "before"}:
                 self.doc_id_in_file_name = str(self._config[Setup._DCR_CFG_DOC_ID_IN_FILE_NAME]).lower()
 
+    # -----------------------------------------------------------------------------
+    # Check the configuration parameter - ocr_preprocessing.
+    # -----------------------------------------------------------------------------
+    def _check_config_ocr_preprocessing(self) -> None:
+        """Check the configuration parameter - ocr_preprocessing."""
+        if Setup._DCR_CFG_OCR_PREPROCESSING in self._config:
+            self.ocr_preprocessing = []
+
+            for step in str(self._config[Setup._DCR_CFG_OCR_PREPROCESSING]).lower().split(","):
+                step = step.strip()
+                if step in {"", Setup.OCR_PREPROCESSING_NONE}:
+                    continue
+
+                if step not in {
+                    Setup.OCR_PREPROCESSING_BINARISE,
+                    Setup.OCR_PREPROCESSING_DESKEW,
+                    Setup.OCR_PREPROCESSING_DOWNSCALE,
+                    Setup.OCR_PREPROCESSING_GRAYSCALE,
+                }:
+                    dcr_core.core_utils.terminate_fatal(
+                        f"Invalid preprocessing step '{step}' in the configuration parameter '{Setup._DCR_CFG_OCR_PREPROCESSING}'"
+                    )
+
+                if step not in self.ocr_preprocessing:
+                    self.ocr_preprocessing.append(step)
+
     # -----------------------------------------------------------------------------
     # Load and check the configuration parameters.
     # -----------------------------------------------------------------------------
@@ -185,12 +368,42 @@ class Setup(dcr_core.cls_setup.Setup):
         for key, item in self._config.items():
             match key:
                 case (
-                    Setup._DCR_CFG_DB_CONNECTION_PORT
+                    Setup._DCR_CFG_ACTION_PAGE_SIZE
+                    | Setup._DCR_CFG_DB_CONNECTION_PORT
                     | Setup._DCR_CFG_DB_CONTAINER_PORT
+                    | Setup._DCR_CFG_DB_POOL_CLASS
+                    | Setup._DCR_CFG_DB_POOL_MAX_OVERFLOW
+                    | Setup._DCR_CFG_DB_POOL_PRE_PING
+                    | Setup._DCR_CFG_DB_POOL_RECYCLE
+                    | Setup._DCR_CFG_DB_POOL_SIZE
+                    | Setup._DCR_CFG_DB_STATEMENT_TIMEOUT
+                    | Setup._DCR_CFG_DB_WRITE_BEHIND_DOCUMENTS
+                    | Setup._DCR_CFG_DB_WRITE_BEHIND_INTERVAL
                     | Setup._DCR_CFG_DIRECTORY_INBOX_ACCEPTED
                     | Setup._DCR_CFG_DIRECTORY_INBOX_REJECTED
                     | Setup._DCR_CFG_DOC_ID_IN_FILE_NAME
                     | Setup._DCR_CFG_IGNORE_DUPLICATES
+                    | Setup._DCR_CFG_INBOX_FILES_MAX
+                    | Setup._DCR_CFG_INBOX_SCAN_CHUNK_SIZE
+                    | Setup._DCR_CFG_INBOX_TEXT_LAYER_SAMPLE_PAGES
+                    | Setup._DCR_CFG_LEASE_BATCH_SIZE
+                    | Setup._DCR_CFG_LEASE_DURATION
+                    | Setup._DCR_CFG_MAX_WORKERS_INBOX
+                    | Setup._DCR_CFG_MAX_WORKERS_PANDOC
+                    | Setup._DCR_CFG_MAX_WORKERS_PARSER
+                    | Setup._DCR_CFG_MAX_WORKERS_PDF2IMAGE
+                    | Setup._DCR_CFG_MAX_WORKERS_PDFLIB
+                    | Setup._DCR_CFG_MAX_WORKERS_TESSERACT
+                    | Setup._DCR_CFG_MAX_WORKERS_TOKENIZER
+                    | Setup._DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT
+                    | Setup._DCR_CFG_OCR_ENGINE_POOL
+                    | Setup._DCR_CFG_OCR_PREPROCESSING
+                    | Setup._DCR_CFG_OCR_PREPROCESSING_DPI
+                    | Setup._DCR_CFG_PDF2IMAGE_CHUNK_SIZE
+                    | Setup._DCR_CFG_PDF2IMAGE_CHUNK_WORKERS
+                    | Setup._DCR_CFG_PDF2IMAGE_IN_MEMORY
+                    | Setup._DCR_CFG_TOKENIZE_2_DATABASE_CHUNK_SIZE
+                    | Setup._DCR_CFG_WATCH_INTERVAL
                 ):
                     continue
                 case Setup._DCR_CFG_DB_CONNECTION_PREFIX:
@@ -221,6 +434,12 @@ class Setup(dcr_core.cls_setup.Setup):
                     self.lt_export_rule_file_list_bullet = dcr_core.core_utils.get_os_independent_name(item)
                 case Setup._DCR_CFG_LT_EXPORT_RULE_FILE_LIST_NUMBER:
                     self.lt_export_rule_file_list_number = dcr_core.core_utils.get_os_independent_name(item)
+                case Setup._DCR_CFG_SHA256_CACHE_FILE:
+                    self.sha256_cache_file = dcr_core.core_utils.get_os_independent_name(item) if item else ""
+                case Setup._DCR_CFG_INBOX_MOVE_JOURNAL_FILE:
+                    self.inbox_move_journal_file = dcr_core.core_utils.get_os_independent_name(item) if item else ""
+                case Setup._DCR_CFG_ARTIFACT_CACHE_DIRECTORY:
+                    self.artifact_cache_directory = dcr_core.core_utils.get_os_independent_name(item) if item else ""
                 case _:
                     pass
 
@@ -9,6 +9,8 @@ import dcr_core.cls_setup
 import dcr_core.core_utils
 
 class Setup(dcr_core.cls_setup.Setup):
+    _DCR_CFG_ACTION_PAGE_SIZE: str
+    _DCR_CFG_ARTIFACT_CACHE_DIRECTORY: str
     _DCR_CFG_DB_CONNECTION_PORT: str
     _DCR_CFG_DB_CONNECTION_PREFIX: str
     _DCR_CFG_DB_CONTAINER_PORT: str
@@ -19,13 +21,52 @@ class Setup(dcr_core.cls_setup.Setup):
     _DCR_CFG_DB_INITIAL_DATA_FILE: str
     _DCR_CFG_DB_PASSWORD: str
     _DCR_CFG_DB_PASSWORD_ADMIN: str
+    _DCR_CFG_DB_POOL_CLASS: str
+    _DCR_CFG_DB_POOL_MAX_OVERFLOW: str
+    _DCR_CFG_DB_POOL_PRE_PING: str
+    _DCR_CFG_DB_POOL_RECYCLE: str
+    _DCR_CFG_DB_POOL_SIZE: str
     _DCR_CFG_DB_SCHEMA: str
+    _DCR_CFG_DB_STATEMENT_TIMEOUT: str
     _DCR_CFG_DB_USER: str
     _DCR_CFG_DB_USER_ADMIN: str
+    _DCR_CFG_DB_WRITE_BEHIND_DOCUMENTS: str
+    _DCR_CFG_DB_WRITE_BEHIND_INTERVAL: str
     _DCR_CFG_DIRECTORY_INBOX_ACCEPTED: str
     _DCR_CFG_DIRECTORY_INBOX_REJECTED: str
     _DCR_CFG_DOC_ID_IN_FILE_NAME: str
     _DCR_CFG_IGNORE_DUPLICATES: str
+    _DCR_CFG_INBOX_FILES_MAX: str
+    _DCR_CFG_INBOX_MOVE_JOURNAL_FILE: str
+    _DCR_CFG_INBOX_SCAN_CHUNK_SIZE: str
+    _DCR_CFG_INBOX_TEXT_LAYER_SAMPLE_PAGES: str
+    _DCR_CFG_LEASE_BATCH_SIZE: str
+    _DCR_CFG_LEASE_DURATION: str
+    _DCR_CFG_MAX_WORKERS_INBOX: str
+    _DCR_CFG_MAX_WORKERS_PANDOC: str
+    _DCR_CFG_MAX_WORKERS_PARSER: str
+    _DCR_CFG_MAX_WORKERS_PDF2IMAGE: str
+    _DCR_CFG_MAX_WORKERS_PDFLIB: str
+    _DCR_CFG_MAX_WORKERS_TESSERACT: str
+    _DCR_CFG_MAX_WORKERS_TOKENIZER: str
+    _DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT: str
+    _DCR_CFG_OCR_ENGINE_POOL: str
+    _DCR_CFG_OCR_PREPROCESSING: str
+    _DCR_CFG_OCR_PREPROCESSING_DPI: str
+    _DCR_CFG_PDF2IMAGE_CHUNK_SIZE: str
+    _DCR_CFG_PDF2IMAGE_CHUNK_WORKERS: str
+    _DCR_CFG_PDF2IMAGE_IN_MEMORY: str
+    _DCR_CFG_SHA256_CACHE_FILE: str
+    _DCR_CFG_TOKENIZE_2_DATABASE_CHUNK_SIZE: str
+    _DCR_CFG_WATCH_INTERVAL: str
+
+    DB_POOL_CLASS_NULL: str
+    DB_POOL_CLASS_QUEUE: str
+    OCR_PREPROCESSING_BINARISE: str
+    OCR_PREPROCESSING_DESKEW: str
+    OCR_PREPROCESSING_DOWNSCALE: str
+    OCR_PREPROCESSING_GRAYSCALE: str
+    OCR_PREPROCESSING_NONE: str
 
     def __init__(self) -> None:
         self.db_connection_port = None
@@ -46,8 +87,43 @@ class Setup(dcr_core.cls_setup.Setup):
         self.doc_id_in_file_name: str
         self.is_delete_auxiliary_files: bool
         self.is_ignore_duplicates = None
+        self.max_workers_inbox: int
+        self.max_workers_pandoc: int
+        self.max_workers_parser: int
+        self.max_workers_pdf2image: int
+        self.max_workers_pdflib: int
+        self.max_workers_tesseract: int
+        self.max_workers_tokenizer: int
+        self.lease_batch_size: int
+        self.lease_duration: int
+        self.db_pool_class: str
+        self.db_pool_max_overflow: int
+        self.is_db_pool_pre_ping: bool
+        self.db_pool_recycle: int
+        self.db_pool_size: int
+        self.db_statement_timeout: int
+        self.tokenize_2_database_chunk_size: int
+        self.db_write_behind_documents: int
+        self.db_write_behind_interval: int
+        self.action_page_size: int
+        self.sha256_cache_file: str
+        self.inbox_text_layer_sample_pages: int
+        self.inbox_files_max: int
+        self.inbox_scan_chunk_size: int
+        self.watch_interval: int
+        self.inbox_move_journal_file: str
+        self.artifact_cache_directory: str
+        self.pdf2image_chunk_size: int
+        self.pdf2image_chunk_workers: int
+        self.is_pdf2image_in_memory: bool
+        self.is_ocr_engine_pool: bool
+        self.ocr_blank_page_ink_limit: int
+        self.ocr_preprocessing: list[str]
+        self.ocr_preprocessing_dpi: int
     def _check_config(self) -> None: ...
+    def _check_config_db_pool_class(self) -> None: ...
     def _check_config_directory_inbox_accepted(self) -> None: ...
     def _check_config_directory_inbox_rejected(self) -> None: ...
     def _check_config_doc_id_in_file_name(self) -> None: ...
+    def _check_config_ocr_preprocessing(self) -> None: ...
     def _load_config(self) -> None: ...
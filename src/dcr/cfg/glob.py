@@ -30,11 +30,21 @@ directory_inbox_accepted: os.PathLike[str] | str
 directory_inbox_rejected: os.PathLike[str] | str
 
 document: dcr.db.cls_document.Document
+document_sha256_index: dict[bytes, str] = {}
+
+is_keep_warm: bool = False
 
 language: dcr.db.cls_language.Language
 
+ocr_engine_pool: dcr.pp.cls_ocr_engine_pool.OCREnginePool | None = None
+
+pdf_inspection: dict[tuple[int, int, int, int], tuple[int, int, list[bool] | None]] = {}
+
 run: dcr.db.cls_run.Run
 
+sha256_cache: dict[str, str] = {}
+sha256_cache_used: dict[str, str] = {}
+
 start_time_document: int
 
 token: dcr.db.cls_token.Token
@@ -14,6 +14,7 @@ import dcr.db.cls_language
 import dcr.db.cls_run
 import dcr.db.cls_token
 import dcr.db.cls_version
+import dcr.pp.cls_ocr_engine_pool
 
 FILE_ENCODING_DEFAULT: str
 LOGGER_END: str
@@ -26,8 +27,14 @@ directory_inbox: os.PathLike[str] | str
 directory_inbox_accepted: os.PathLike[str] | str
 directory_inbox_rejected: os.PathLike[str] | str
 document: dcr.db.cls_document.Document
+document_sha256_index: dict[bytes, str]
+is_keep_warm: bool
 language: dcr.db.cls_language.Language
+ocr_engine_pool: dcr.pp.cls_ocr_engine_pool.OCREnginePool | None
+pdf_inspection: dict[tuple[int, int, int, int], tuple[int, int, list[bool] | None]]
 run: dcr.db.cls_run.Run
+sha256_cache: dict[str, str]
+sha256_cache_used: dict[str, str]
 start_time_document: int
 token: dcr.db.cls_token.Token
 version: dcr.db.cls_version.Version
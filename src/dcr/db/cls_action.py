@@ -5,8 +5,12 @@
 """Module dcr.db.cls_action: Managing the database table action."""
 from __future__ import annotations
 
+import datetime
 import os
+import socket
+import threading
 import time
+from collections.abc import Iterator
 from typing import ClassVar
 
 import dcr_core.core_glob
@@ -30,8 +34,12 @@ class Action:
     # -----------------------------------------------------------------------------
     # Class variables.
     # -----------------------------------------------------------------------------
+    LEASE_OWNER: ClassVar[str] = ""
+
     PDF2IMAGE_FILE_TYPE: ClassVar[str] = ""
 
+    _lease_heartbeat_stop: ClassVar[threading.Event | None] = None
+
     # -----------------------------------------------------------------------------
     # Initialise the instance.
     # -----------------------------------------------------------------------------
@@ -53,6 +61,7 @@ class Action:
         id_parent: int = 0,
         no_children: int = 0,
         no_pdf_pages: int = 0,
+        preprocessing_ns: dict[str, int] | None = None,
         status: str = "",
     ) -> None:
         """Initialise the instance.
@@ -90,6 +99,8 @@ class Action:
                     For a document of type scanned 'pdf', the number of image files created. Defaults to 0.
             no_pdf_pages (int, optional):
                     For a document of the type 'pdf' the number of pages. Defaults to 0.
+            preprocessing_ns (dict[str, int] | None, optional):
+                    The processing time of each image preprocessing step in nanoseconds. Defaults to None.
             status (str, optional):
                     Status. Defaults to "".
         """
@@ -116,13 +127,15 @@ class Action:
         self.action_id_run_last = id_run_last
         self.action_no_children = no_children
         self.action_no_pdf_pages = no_pdf_pages
+        self.action_preprocessing_ns = preprocessing_ns if preprocessing_ns is not None else {}
         self.action_status = status
 
         if Action.PDF2IMAGE_FILE_TYPE == "":
             Action.PDF2IMAGE_FILE_TYPE = dcr_core.core_glob.FILE_TYPE_JPEG
 
         if self.action_id == 0:
-            self.persist_2_db()
+            # The new action is inserted in the unit of work that finalises the current action.
+            self.persist_2_db(is_write_behind=True)
 
         self._exist = True
 
@@ -152,11 +165,210 @@ class Action:
             dcr.db.cls_db_core.DBCore.DBC_ID_DOCUMENT: self.action_id_document,
             dcr.db.cls_db_core.DBCore.DBC_ID_PARENT: self.action_id_parent,
             dcr.db.cls_db_core.DBCore.DBC_ID_RUN_LAST: self.action_id_run_last,
+            dcr.db.cls_db_core.DBCore.DBC_LEASE_EXPIRES_AT: None,
+            dcr.db.cls_db_core.DBCore.DBC_LEASE_OWNER: None,
             dcr.db.cls_db_core.DBCore.DBC_NO_CHILDREN: self.action_no_children,
             dcr.db.cls_db_core.DBCore.DBC_NO_PDF_PAGES: self.action_no_pdf_pages,
+            dcr.db.cls_db_core.DBCore.DBC_PREPROCESSING_NS: self.action_preprocessing_ns or None,
             dcr.db.cls_db_core.DBCore.DBC_STATUS: self.action_status,
         }
 
+    # -----------------------------------------------------------------------------
+    # Claim a batch of unprocessed actions based on action_code.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def _claim_actions(cls, action_code: str, id_last: int, is_lease_expired: bool = False) -> list[sqlalchemy.engine.Row]:
+        """Claim a batch of unprocessed actions based on action_code.
+
+        The rows are locked with FOR UPDATE SKIP LOCKED, so that concurrent
+        launchers never claim the same action. Actions with an expired lease
+        are claimed again.
+
+        Args:
+            action_code (str):
+                    The requested action code.
+            id_last (int):
+                    Only actions with a higher row id are claimed.
+            is_lease_expired (bool, optional):
+                    Only actions with an expired lease are claimed. Defaults to False.
+
+        Returns:
+            list[sqlalchemy.engine.Row]:
+                    The claimed rows in ascending order of the row id.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        if Action.LEASE_OWNER == "":
+            Action.LEASE_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+        ids_claimable = (
+            sqlalchemy.select(dbt.c.id)
+            .where(
+                sqlalchemy.and_(
+                    dbt.c.action_code == action_code,
+                    dbt.c.id > id_last,
+                    dbt.c.status.in_(
+                        [
+                            dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR,
+                            dcr.db.cls_document.Document.DOCUMENT_STATUS_START,
+                        ]
+                    ),
+                    dbt.c.lease_expires_at < sqlalchemy.func.now()
+                    if is_lease_expired
+                    else sqlalchemy.or_(
+                        dbt.c.lease_expires_at.is_(None),
+                        dbt.c.lease_expires_at < sqlalchemy.func.now(),
+                    ),
+                )
+            )
+            .order_by(dbt.c.id.asc())
+            .limit(dcr_core.core_glob.setup.lease_batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        stmnt = (
+            sqlalchemy.update(dbt)
+            .where(dbt.c.id.in_(ids_claimable.scalar_subquery()))
+            .values(
+                {
+                    dcr.db.cls_db_core.DBCore.DBC_LEASE_EXPIRES_AT: sqlalchemy.func.now()
+                    + datetime.timedelta(seconds=dcr_core.core_glob.setup.lease_duration),
+                    dcr.db.cls_db_core.DBCore.DBC_LEASE_OWNER: Action.LEASE_OWNER,
+                }
+            )
+            .returning(*dbt.columns)
+        )
+
+        with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
+            rows = sorted(conn.execute(stmnt).fetchall(), key=lambda row: row[dcr.db.cls_db_core.DBCore.DBC_ID])
+            conn.close()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+        return rows
+
+    # -----------------------------------------------------------------------------
+    # Extend the leases held by this process.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def _renew_leases(cls) -> None:
+        """Extend the leases held by this process."""
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+        with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
+            conn.execute(
+                sqlalchemy.update(dbt)
+                .where(dbt.c.lease_owner == Action.LEASE_OWNER)
+                .values(
+                    {
+                        dcr.db.cls_db_core.DBCore.DBC_LEASE_EXPIRES_AT: sqlalchemy.func.now()
+                        + datetime.timedelta(seconds=dcr_core.core_glob.setup.lease_duration),
+                    }
+                )
+            )
+            conn.close()
+
+    # -----------------------------------------------------------------------------
+    # Heartbeat: extend the leases held by this process periodically.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def _run_lease_heartbeat(cls, stop: threading.Event) -> None:
+        """Heartbeat: extend the leases held by this process periodically.
+
+        Args:
+            stop (threading.Event):
+                    Ends the heartbeat.
+        """
+        while not stop.wait(max(1, dcr_core.core_glob.setup.lease_duration // 3)):
+            cls._renew_leases()
+
+    # -----------------------------------------------------------------------------
+    # Select a page of unprocessed actions based on action_code.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def _select_actions(cls, action_code: str, id_last: int) -> list[sqlalchemy.engine.Row]:
+        """Select a page of unprocessed actions based on action_code.
+
+        Args:
+            action_code (str):
+                    The requested action code.
+            id_last (int):
+                    Only actions with a higher row id are selected.
+
+        Returns:
+            list[sqlalchemy.engine.Row]:
+                    The rows found in ascending order of the row id.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+        stmnt = (
+            sqlalchemy.select(dbt)
+            .where(
+                sqlalchemy.and_(
+                    dbt.c.action_code == action_code,
+                    dbt.c.id > id_last,
+                    dbt.c.status.in_(
+                        [
+                            dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR,
+                            dcr.db.cls_document.Document.DOCUMENT_STATUS_START,
+                        ]
+                    ),
+                )
+            )
+            .order_by(dbt.c.id.asc())
+            .limit(dcr_core.core_glob.setup.action_page_size)
+        )
+
+        with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
+            rows = conn.execute(stmnt).fetchall()
+            conn.close()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+        return rows
+
+    # -----------------------------------------------------------------------------
+    # Claim the unprocessed actions based on action_code batch by batch.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def claim_action_by_action_code(cls, action_code: str) -> Iterator[list[sqlalchemy.engine.Row]]:
+        """Claim the unprocessed actions based on action_code batch by batch.
+
+        The next batch is claimed only when the previous one has been
+        consumed. As long as this process holds leases, a heartbeat thread
+        extends them; finalising an action releases its lease. A lease can
+        expire after the claiming has moved past its action, so finally the
+        actions with an expired lease are claimed again from the start.
+
+        Args:
+            action_code (str):
+                    The requested action code.
+
+        Yields:
+            Iterator[list[sqlalchemy.engine.Row]]:
+                    The claimed rows batch by batch.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+        # dcr_core.core_glob.logger.debug("param action_code=%s", action_code)
+
+        for is_lease_expired in (False, True):
+            id_last = 0
+
+            while rows := cls._claim_actions(action_code=action_code, id_last=id_last, is_lease_expired=is_lease_expired):
+                if Action._lease_heartbeat_stop is None:
+                    Action._lease_heartbeat_stop = threading.Event()
+                    threading.Thread(target=cls._run_lease_heartbeat, args=(Action._lease_heartbeat_stop,), daemon=True).start()
+
+                yield rows
+
+                id_last = rows[-1][dcr.db.cls_db_core.DBCore.DBC_ID]
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
     # -----------------------------------------------------------------------------
     # Create the database table.
     # -----------------------------------------------------------------------------
@@ -211,9 +423,17 @@ class Action:
                 sqlalchemy.ForeignKey(dcr.db.cls_db_core.DBCore.DBT_RUN + "." + dcr.db.cls_db_core.DBCore.DBC_ID, ondelete="CASCADE"),
                 nullable=False,
             ),
+            sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_LEASE_EXPIRES_AT, sqlalchemy.DateTime, nullable=True),
+            sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_LEASE_OWNER, sqlalchemy.String, nullable=True),
             sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_NO_CHILDREN, sqlalchemy.Integer, nullable=True),
             sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_NO_PDF_PAGES, sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_PREPROCESSING_NS, sqlalchemy.JSON, nullable=True),
             sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_STATUS, sqlalchemy.String, nullable=False),
+            sqlalchemy.Index(
+                dcr.db.cls_db_core.DBCore.DBI_ACTION_ACTION_CODE_STATUS,
+                dcr.db.cls_db_core.DBCore.DBC_ACTION_CODE,
+                dcr.db.cls_db_core.DBCore.DBC_STATUS,
+            ),
         )
 
         dcr.utils.progress_msg(f"The database table '{dcr.db.cls_db_core.DBCore.DBT_ACTION}' has now been created")
@@ -242,7 +462,7 @@ class Action:
 
         self.action_status = dcr.db.cls_document.Document.DOCUMENT_STATUS_END
 
-        self.persist_2_db()
+        self.persist_2_db(is_write_behind=True)
 
         dcr.utils.check_exists_object(
             is_document=True,
@@ -252,7 +472,9 @@ class Action:
         dcr.cfg.glob.document.document_id_run_last = dcr.cfg.glob.run.run_id
         dcr.cfg.glob.document.document_status = dcr.db.cls_document.Document.DOCUMENT_STATUS_END
 
-        dcr.cfg.glob.document.persist_2_db()
+        dcr.cfg.glob.document.persist_2_db(is_write_behind=True)
+
+        dcr.cfg.glob.db_core.complete_unit_of_work()
 
         if self.action_action_code == dcr.db.cls_run.Run.ACTION_CODE_INBOX:
             dcr.utils.progress_msg(
@@ -291,7 +513,7 @@ class Action:
         self.action_error_no += 1
         self.action_status = dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR
 
-        self.persist_2_db()
+        self.persist_2_db(is_write_behind=True)
 
         dcr.utils.check_exists_object(
             is_document=True,
@@ -304,7 +526,9 @@ class Action:
         dcr.cfg.glob.document.document_id_run_last = dcr.cfg.glob.run.run_id
         dcr.cfg.glob.document.document_status = dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR
 
-        dcr.cfg.glob.document.persist_2_db()
+        dcr.cfg.glob.document.persist_2_db(is_write_behind=True)
+
+        dcr.cfg.glob.db_core.complete_unit_of_work()
 
         if self.action_action_code == dcr.db.cls_run.Run.ACTION_CODE_INBOX:
             dcr.utils.progress_msg(
@@ -346,11 +570,9 @@ class Action:
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
         # dcr_core.core_glob.logger.debug("param id_action=%i", id_action)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_ACTION,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dcr.cfg.glob.db_core.flush_dbt_updates(table_name=dcr.db.cls_db_core.DBCore.DBT_ACTION, id_where=id_action)
+
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             row = conn.execute(
@@ -400,6 +622,7 @@ class Action:
             id_run_last=row[dcr.db.cls_db_core.DBCore.DBC_ID_RUN_LAST],
             no_children=row[dcr.db.cls_db_core.DBCore.DBC_NO_CHILDREN],
             no_pdf_pages=row[dcr.db.cls_db_core.DBCore.DBC_NO_PDF_PAGES],
+            preprocessing_ns=row[dcr.db.cls_db_core.DBCore.DBC_PREPROCESSING_NS],
             status=row[dcr.db.cls_db_core.DBCore.DBC_STATUS],
         )
 
@@ -501,11 +724,50 @@ class Action:
 
         return dcr_core.core_utils.get_stem_name(str(self.action_file_name))
 
+    # -----------------------------------------------------------------------------
+    # Check whether the last action on a file has been finalised.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def is_finalised(cls, full_name: str) -> bool:
+        """Check whether the last action on a file has been finalised.
+
+        Args:
+            full_name (str):
+                    The processed file.
+
+        Returns:
+            bool:   True if the status of the last action on the file is 'end' or 'error'.
+        """
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+        with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+            rows = conn.execute(
+                sqlalchemy.select(dbt.c.directory_name, dbt.c.status)
+                .where(dbt.c.file_name == os.path.basename(full_name))
+                .order_by(dbt.c.id.desc())
+            ).fetchall()
+            conn.close()
+
+        for row in rows:
+            if os.path.normpath(row[0]) == os.path.normpath(os.path.dirname(full_name)):
+                return row[1] in (
+                    dcr.db.cls_document.Document.DOCUMENT_STATUS_END,
+                    dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR,
+                )
+
+        return False
+
     # -----------------------------------------------------------------------------
     # Persist the object in the database.
     # -----------------------------------------------------------------------------
-    def persist_2_db(self) -> None:
-        """Persist the object in the database."""
+    def persist_2_db(self, is_write_behind: bool = False) -> None:
+        """Persist the object in the database.
+
+        Args:
+            is_write_behind (bool, optional):
+                    An insert or update is only written by the next flush
+                    of the unit of work. Defaults to False.
+        """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
         full_name = dcr_core.core_utils.get_full_name_from_components(self.action_directory_name, self.action_file_name)
@@ -519,55 +781,184 @@ class Action:
         if self.action_id == 0:
             self.action_status = self.action_status if self.action_status != "" else dcr.db.cls_document.Document.DOCUMENT_STATUS_START
 
-            self.action_id = dcr.cfg.glob.db_core.insert_dbt_row(
-                table_name=dcr.db.cls_db_core.DBCore.DBT_ACTION,
-                columns=self._get_columns(),
-            )
+            if is_write_behind:
+                self.action_id = dcr.cfg.glob.db_core.insert_dbt_row_write_behind(
+                    table_name=dcr.db.cls_db_core.DBCore.DBT_ACTION,
+                    columns=self._get_columns(),
+                )
+            else:
+                self.action_id = dcr.cfg.glob.db_core.insert_dbt_row(
+                    table_name=dcr.db.cls_db_core.DBCore.DBT_ACTION,
+                    columns=self._get_columns(),
+                )
         else:
             if self.action_id_parent == 1:
                 if self.action_id_parent != self.action_id:
                     self.action_id_parent = self.action_id
 
-            dcr.cfg.glob.db_core.update_dbt_id(
-                table_name=dcr.db.cls_db_core.DBCore.DBT_ACTION,
-                id_where=self.action_id,
-                columns=self._get_columns(),
-            )
+            if is_write_behind:
+                dcr.cfg.glob.db_core.update_dbt_id_write_behind(
+                    table_name=dcr.db.cls_db_core.DBCore.DBT_ACTION,
+                    id_where=self.action_id,
+                    columns=self._get_columns(),
+                )
+            else:
+                dcr.cfg.glob.db_core.update_dbt_id(
+                    table_name=dcr.db.cls_db_core.DBCore.DBT_ACTION,
+                    id_where=self.action_id,
+                    columns=self._get_columns(),
+                )
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
+    # -----------------------------------------------------------------------------
+    # Stop the lease heartbeat and release the leases still held.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def release_leases(cls) -> None:
+        """Stop the lease heartbeat and release the leases still held."""
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
+        if Action._lease_heartbeat_stop is None:
+            return
+
+        Action._lease_heartbeat_stop.set()
+        Action._lease_heartbeat_stop = None
+
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+        with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
+            conn.execute(
+                sqlalchemy.update(dbt)
+                .where(dbt.c.lease_owner == Action.LEASE_OWNER)
+                .values(
+                    {
+                        dcr.db.cls_db_core.DBCore.DBC_LEASE_EXPIRES_AT: None,
+                        dcr.db.cls_db_core.DBCore.DBC_LEASE_OWNER: None,
+                    }
+                )
+            )
+            conn.close()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
     # -----------------------------------------------------------------------------
     # Select unprocessed actions based on action_code.
     # -----------------------------------------------------------------------------
     @classmethod
-    def select_action_by_action_code(cls, conn: Connection, action_code: str) -> sqlalchemy.engine.CursorResult:
+    def select_action_by_action_code(cls, action_code: str) -> Iterator[sqlalchemy.engine.Row]:
         """Select unprocessed actions based on action_code.
 
+        Args:
+            action_code (str):
+                    The requested action code.
+
+        Yields:
+            Iterator[sqlalchemy.engine.Row]:
+                    The rows found.
+        """
+        for rows in cls.select_action_pages_by_action_code(action_code):
+            yield from rows
+
+    # -----------------------------------------------------------------------------
+    # Select unprocessed actions and their documents based on action_code.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def select_action_document_by_action_code(cls, action_code: str) -> Iterator[tuple[Action, dcr.db.cls_document.Document]]:
+        """Select unprocessed actions and their documents based on action_code.
+
+        The documents of each page of actions are read with a single
+        database query. The actions of the same document within a page
+        share one document instance.
+
+        Args:
+            action_code (str):
+                    The requested action code.
+
+        Yields:
+            Iterator[tuple[Action, dcr.db.cls_document.Document]]:
+                    The actions found with their documents.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+        # dcr_core.core_glob.logger.debug("param action_code=%s", action_code)
+
+        for rows in cls.select_action_pages_by_action_code(action_code):
+            documents = dcr.db.cls_document.Document.select_document_by_ids(
+                {row[dcr.db.cls_db_core.DBCore.DBC_ID_DOCUMENT] for row in rows},
+            )
+
+            for row in rows:
+                yield Action.from_row(row), documents[row[dcr.db.cls_db_core.DBCore.DBC_ID_DOCUMENT]]
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    # -----------------------------------------------------------------------------
+    # Select unprocessed actions based on action_code page by page.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def select_action_pages_by_action_code(cls, action_code: str) -> Iterator[list[sqlalchemy.engine.Row]]:
+        """Select unprocessed actions based on action_code page by page.
+
+        The actions are read page by page in ascending order of the row id
+        (keyset pagination), each page in its own short transaction. With
+        leasing enabled (lease_duration > 0) the actions are claimed batch
+        by batch from the work queue instead.
+
+        Args:
+            action_code (str):
+                    The requested action code.
+
+        Yields:
+            Iterator[list[sqlalchemy.engine.Row]]:
+                    The rows found page by page.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+        # dcr_core.core_glob.logger.debug("param action_code=%s", action_code)
+
+        if dcr_core.core_glob.setup.lease_duration > 0:
+            yield from cls.claim_action_by_action_code(action_code)
+            return
+
+        id_last = 0
+
+        while rows := cls._select_actions(action_code=action_code, id_last=id_last):
+            yield rows
+
+            id_last = rows[-1][dcr.db.cls_db_core.DBCore.DBC_ID]
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    # -----------------------------------------------------------------------------
+    # Select unprocessed actions based on action_code und document id.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def select_action_by_action_code_id_document(
+        cls, conn: Connection, action_code: str, id_document: int
+    ) -> sqlalchemy.engine.CursorResult:
+        """Select unprocessed actions based on action_code und parent id.
+
         Args:
             conn (Connection):
                     The database connection.
             action_code (str):
                     The requested action code.
+            id_document (int):
+                    The requested parent id.
 
         Returns:
             sqlalchemy.engine.CursorResult:
                     The rows found.
         """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
-        # dcr_core.core_glob.logger.debug("param Connection =%s", Connection)
-        # dcr_core.core_glob.logger.debug("param action_code=%s", action_code)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_ACTION,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
 
         stmnt = (
             sqlalchemy.select(dbt)
             .where(
                 sqlalchemy.and_(
                     dbt.c.action_code == action_code,
+                    dbt.c.id_document == id_document,
                     dbt.c.status.in_(
                         [
                             dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR,
@@ -583,44 +974,34 @@ class Action:
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
-        # dcr_core.core_glob.logger.debug("return           =%s", stmnt)
         return conn.execute(stmnt)
 
     # -----------------------------------------------------------------------------
-    # Select unprocessed actions based on action_code und document id.
+    # Select the documents with unprocessed actions based on action codes.
     # -----------------------------------------------------------------------------
     @classmethod
-    def select_action_by_action_code_id_document(
-        cls, conn: Connection, action_code: str, id_document: int
-    ) -> sqlalchemy.engine.CursorResult:
-        """Select unprocessed actions based on action_code und parent id.
+    def select_id_document_by_action_codes(cls, conn: Connection, action_codes: list[str]) -> sqlalchemy.engine.CursorResult:
+        """Select the documents with unprocessed actions based on action codes.
 
         Args:
             conn (Connection):
                     The database connection.
-            action_code (str):
-                    The requested action code.
-            id_document (int):
-                    The requested parent id.
+            action_codes (list[str]):
+                    The requested action codes.
 
         Returns:
             sqlalchemy.engine.CursorResult:
-                    The rows found.
+                    The document ids found in ascending order.
         """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_ACTION,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
 
         stmnt = (
-            sqlalchemy.select(dbt)
+            sqlalchemy.select(dbt.c.id_document)
             .where(
                 sqlalchemy.and_(
-                    dbt.c.action_code == action_code,
-                    dbt.c.id_document == id_document,
+                    dbt.c.action_code.in_(action_codes),
                     dbt.c.status.in_(
                         [
                             dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR,
@@ -629,7 +1010,8 @@ class Action:
                     ),
                 )
             )
-            .order_by(dbt.c.id.asc())
+            .distinct()
+            .order_by(dbt.c.id_document.asc())
         )
 
         # dcr_core.core_glob.logger.debug("SQL Statement=%s", stmnt)
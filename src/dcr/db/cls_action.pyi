@@ -3,6 +3,8 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module stub file."""
+import threading
+from collections.abc import Iterator
 from typing import ClassVar
 
 import sqlalchemy
@@ -10,8 +12,12 @@ import sqlalchemy.engine
 import sqlalchemy.orm
 from sqlalchemy.engine import Connection
 
+import dcr.db.cls_document
+
 class Action:
+    LEASE_OWNER: ClassVar[str]
     PDF2IMAGE_FILE_TYPE: ClassVar[str]
+    _lease_heartbeat_stop: ClassVar[threading.Event | None]
 
     def __init__(
         self,
@@ -31,6 +37,7 @@ class Action:
         id_parent: int = ...,
         no_children: int = ...,
         no_pdf_pages: int = ...,
+        preprocessing_ns: dict[str, int] | None = ...,
         status: str = ...,
     ) -> None:
         self._exist = None
@@ -50,9 +57,20 @@ class Action:
         self.action_id_run_last = None
         self.action_no_children = None
         self.action_no_pdf_pages = None
+        self.action_preprocessing_ns = None
         self.action_status = None
+    @classmethod
+    def _claim_actions(cls, action_code: str, id_last: int, is_lease_expired: bool = ...) -> list[sqlalchemy.engine.Row]: ...
     def _get_columns(self) -> None: ...
     @classmethod
+    def _renew_leases(cls) -> None: ...
+    @classmethod
+    def _run_lease_heartbeat(cls, stop: threading.Event) -> None: ...
+    @classmethod
+    def _select_actions(cls, action_code: str, id_last: int) -> list[sqlalchemy.engine.Row]: ...
+    @classmethod
+    def claim_action_by_action_code(cls, action_code: str) -> Iterator[list[sqlalchemy.engine.Row]]: ...
+    @classmethod
     def create_dbt(cls) -> None: ...
     def exists(self) -> bool: ...
     def finalise(self) -> None: ...
@@ -65,10 +83,20 @@ class Action:
     def get_file_type(self) -> str: ...
     def get_full_name(self) -> str: ...
     def get_stem_name(self) -> str: ...
-    def persist_2_db(self) -> None: ...
     @classmethod
-    def select_action_by_action_code(cls, conn: Connection, action_code: str) -> sqlalchemy.engine.CursorResult: ...
+    def is_finalised(cls, full_name: str) -> bool: ...
+    def persist_2_db(self, is_write_behind: bool = ...) -> None: ...
+    @classmethod
+    def release_leases(cls) -> None: ...
+    @classmethod
+    def select_action_by_action_code(cls, action_code: str) -> Iterator[sqlalchemy.engine.Row]: ...
+    @classmethod
+    def select_action_document_by_action_code(cls, action_code: str) -> Iterator[tuple[Action, dcr.db.cls_document.Document]]: ...
+    @classmethod
+    def select_action_pages_by_action_code(cls, action_code: str) -> Iterator[list[sqlalchemy.engine.Row]]: ...
     @classmethod
     def select_action_by_action_code_id_document(
         cls, conn: Connection, action_code: str, id_document: int
     ) -> sqlalchemy.engine.CursorResult: ...
+    @classmethod
+    def select_id_document_by_action_codes(cls, conn: Connection, action_codes: list[str]) -> sqlalchemy.engine.CursorResult: ...
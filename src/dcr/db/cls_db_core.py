@@ -5,9 +5,14 @@
 """Module dcr.db.cls_vdb_core: Managing the database."""
 from __future__ import annotations
 
+import itertools
 import json
 import os
 import pathlib
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
 from typing import ClassVar
 from typing import TypeAlias
 
@@ -46,6 +51,13 @@ class DBCore:
     # -----------------------------------------------------------------------------
     # Class variables.
     # -----------------------------------------------------------------------------
+    _BIND_ID_WHERE: ClassVar[str] = "id_where"
+
+    _STMNT_TYPE_DELETE: ClassVar[str] = "delete"
+    _STMNT_TYPE_INSERT: ClassVar[str] = "insert"
+    _STMNT_TYPE_INSERT_MANY: ClassVar[str] = "insert_many"
+    _STMNT_TYPE_UPDATE: ClassVar[str] = "update"
+
     DB_DIALECT_POSTGRESQL: ClassVar[str] = "postgresql"
 
     DBC_ACTION_CODE: ClassVar[str] = "action_code"
@@ -84,6 +96,8 @@ class DBCore:
     DBC_ID_RUN_LAST: ClassVar[str] = "id_run_last"
     DBC_ISO_LANGUAGE_NAME: ClassVar[str] = "iso_language_name"
     DBC_ISO_LANGUAGE_NAME_DEFAULT: ClassVar[str] = "English"
+    DBC_LEASE_EXPIRES_AT: ClassVar[str] = "lease_expires_at"
+    DBC_LEASE_OWNER: ClassVar[str] = "lease_owner"
     DBC_LINE_TYPE: ClassVar[str] = "line_type"
     DBC_MODIFIED_AT: ClassVar[str] = "modified_at"
     DBC_NO_CHILDREN: ClassVar[str] = "no_children"
@@ -98,6 +112,7 @@ class DBCore:
     DBC_PAGE_DATA: ClassVar[str] = "page_data"
     DBC_PAGE_NO: ClassVar[str] = "page_no"
     DBC_PARA_NO: ClassVar[str] = "para_no"
+    DBC_PREPROCESSING_NS: ClassVar[str] = "preprocessing_ns"
     DBC_ROW_NO: ClassVar[str] = "row_no"
     DBC_SENT_NO: ClassVar[str] = "sent_no"
     DBC_SHA256: ClassVar[str] = "sha256"
@@ -109,6 +124,10 @@ class DBCore:
     DBC_TOTAL_PROCESSED_TO_BE: ClassVar[str] = "total_processed_to_be"
     DBC_VERSION: ClassVar[str] = "version"
 
+    DBI_ACTION_ACTION_CODE_STATUS: ClassVar[str] = "ix_action_action_code_status"
+    DBI_DOCUMENT_SHA256: ClassVar[str] = "ix_document_sha256"
+    DBI_TOKEN_ID_DOCUMENT_PAGE_NO: ClassVar[str] = "ix_token_id_document_page_no"
+
     DBT_ACTION: ClassVar[str] = "action"
     DBT_DOCUMENT: ClassVar[str] = "document"
     DBT_LANGUAGE: ClassVar[str] = "language"
@@ -116,6 +135,12 @@ class DBCore:
     DBT_TOKEN: ClassVar[str] = "token"
     DBT_VERSION: ClassVar[str] = "version"
 
+    DB_INDEXES: ClassVar[dict[str, tuple[str, list[str]]]] = {
+        DBI_ACTION_ACTION_CODE_STATUS: (DBT_ACTION, [DBC_ACTION_CODE, DBC_STATUS]),
+        DBI_DOCUMENT_SHA256: (DBT_DOCUMENT, [DBC_SHA256]),
+        DBI_TOKEN_ID_DOCUMENT_PAGE_NO: (DBT_TOKEN, [DBC_ID_DOCUMENT, DBC_PAGE_NO]),
+    }
+
     JSON_NAME_API_VERSION = "apiVersion"
     JSON_NAME_COLUMN_NAME = "columnName"
     JSON_NAME_COLUMN_VALUE = "columnValue"
@@ -148,6 +173,15 @@ class DBCore:
         self._db_current_password = ""  # nosec
         self._db_current_user = ""
 
+        self._dbt_cache: dict[str, sqlalchemy.Table] = {}
+        self._stmnt_cache: dict[tuple[str, str], sqlalchemy.sql.expression.Executable] = {}
+
+        self._write_behind_documents = 0
+        self._write_behind_ids: dict[str, deque[int]] = {}
+        self._write_behind_inserts: dict[tuple[str, int], Columns] = {}
+        self._write_behind_start = time.perf_counter()
+        self._write_behind_updates: dict[tuple[str, int], Columns] = {}
+
         if is_admin:
             self._connect_db_admin()
         else:
@@ -229,7 +263,7 @@ class DBCore:
             + self._db_current_user
             + "&password="
             + self._db_current_password,
-            poolclass=sqlalchemy.pool.NullPool,
+            **self._get_engine_options(),
         )
 
         try:
@@ -539,6 +573,73 @@ class DBCore:
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
+    # -----------------------------------------------------------------------------
+    # Get the engine options for the connection pool of a database user.
+    # -----------------------------------------------------------------------------
+    @staticmethod
+    def _get_engine_options() -> dict[str, Any]:
+        """Get the engine options for the connection pool of a database user.
+
+        With the pool class 'queue' the connections are kept open and reused,
+        so that each process - main process or worker process - works with
+        long-lived connections instead of a new connection per database access.
+
+        Returns:
+            dict[str, Any]: The keyword arguments for sqlalchemy.create_engine.
+        """
+        if dcr_core.core_glob.setup.db_pool_class == dcr.cfg.cls_setup.Setup.DB_POOL_CLASS_NULL:
+            engine_options: dict[str, Any] = {
+                "poolclass": sqlalchemy.pool.NullPool,
+            }
+        else:
+            engine_options = {
+                "max_overflow": dcr_core.core_glob.setup.db_pool_max_overflow,
+                "pool_pre_ping": dcr_core.core_glob.setup.is_db_pool_pre_ping,
+                "pool_recycle": dcr_core.core_glob.setup.db_pool_recycle,
+                "pool_size": dcr_core.core_glob.setup.db_pool_size,
+                "poolclass": sqlalchemy.pool.QueuePool,
+            }
+
+        if dcr_core.core_glob.setup.db_statement_timeout > 0:
+            engine_options["connect_args"] = {
+                "options": "-c statement_timeout=" + str(dcr_core.core_glob.setup.db_statement_timeout),
+            }
+
+        return engine_options
+
+    # -----------------------------------------------------------------------------
+    # Get a cached DML statement for a database table.
+    # -----------------------------------------------------------------------------
+    def _get_stmnt(self, table_name: str, stmnt_type: str) -> sqlalchemy.sql.expression.Executable:
+        """Get a cached DML statement for a database table.
+
+        The statements only contain bind parameters, so that SQLAlchemy
+        compiles each of them once and reuses the compiled form.
+
+        Args:
+            table_name (str): Table name.
+            stmnt_type (str): Statement type: delete, insert, insert_many or update.
+
+        Returns:
+            sqlalchemy.sql.expression.Executable: The statement.
+        """
+        if (table_name, stmnt_type) not in self._stmnt_cache:
+            dbt = self.get_dbt(table_name)
+
+            match stmnt_type:
+                case DBCore._STMNT_TYPE_DELETE:
+                    stmnt = sqlalchemy.delete(dbt).where(dbt.c.id == sqlalchemy.bindparam(DBCore._BIND_ID_WHERE))
+                case DBCore._STMNT_TYPE_INSERT:
+                    stmnt = sqlalchemy.insert(dbt).returning(dbt.columns.id)
+                case DBCore._STMNT_TYPE_INSERT_MANY:
+                    stmnt = sqlalchemy.insert(dbt)
+                case _:
+                    stmnt = sqlalchemy.update(dbt).where(dbt.c.id == sqlalchemy.bindparam(DBCore._BIND_ID_WHERE))
+
+            self._stmnt_cache[(table_name, stmnt_type)] = stmnt
+
+        return self._stmnt_cache[(table_name, stmnt_type)]
+
     # -----------------------------------------------------------------------------
     # Show the details of the projected database connection.
     # -----------------------------------------------------------------------------
@@ -559,6 +660,67 @@ class DBCore:
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
+    # -----------------------------------------------------------------------------
+    # Upgrade the current database indexes - online.
+    # -----------------------------------------------------------------------------
+    def _upgrade_database_indexes(self) -> None:
+        """Upgrade the current database indexes - online.
+
+        Missing indexes are created with CREATE INDEX CONCURRENTLY, so that
+        the database tables remain writable during the upgrade. An invalid
+        index left behind by an interrupted upgrade is dropped first.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        with self.db_orm_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for (index_name, (table_name, column_names)) in DBCore.DB_INDEXES.items():
+                is_invalid = conn.execute(
+                    sqlalchemy.text(
+                        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                        + "WHERE c.relname = :index_name AND NOT i.indisvalid"
+                    ),
+                    {"index_name": index_name},
+                ).fetchone()
+                if is_invalid is not None:
+                    conn.execute(sqlalchemy.DDL(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+                conn.execute(
+                    sqlalchemy.DDL(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({', '.join(column_names)})")
+                )
+                dcr.utils.progress_msg(f"The index '{index_name}' of the database table '{table_name}' is available")
+
+            conn.close()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    # -----------------------------------------------------------------------------
+    # Upgrade the current database schema - version independent additions.
+    # -----------------------------------------------------------------------------
+    def _upgrade_database_schema(self) -> None:
+        """Upgrade the current database schema - version independent additions.
+
+        The statements are idempotent and can therefore be executed with
+        every upgrade run.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        with self.db_orm_engine.connect().execution_options(autocommit=True) as conn:
+            conn.execute(
+                sqlalchemy.DDL(
+                    f"ALTER TABLE {DBCore.DBT_ACTION} "
+                    + f"ADD COLUMN IF NOT EXISTS {DBCore.DBC_LEASE_EXPIRES_AT} TIMESTAMP, "
+                    + f"ADD COLUMN IF NOT EXISTS {DBCore.DBC_LEASE_OWNER} VARCHAR"
+                )
+            )
+            dcr.utils.progress_msg(f"The lease columns of the database table '{DBCore.DBT_ACTION}' are available")
+
+            conn.execute(sqlalchemy.DDL(f"ALTER TABLE {DBCore.DBT_ACTION} ADD COLUMN IF NOT EXISTS {DBCore.DBC_PREPROCESSING_NS} JSON"))
+            dcr.utils.progress_msg(f"The column '{DBCore.DBC_PREPROCESSING_NS}' of the database table '{DBCore.DBT_ACTION}' is available")
+
+            conn.close()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
     # -----------------------------------------------------------------------------
     # Upgrade the current database schema - from one version to the next.
     # -----------------------------------------------------------------------------
@@ -581,6 +743,27 @@ class DBCore:
             "Database file has the wrong version, version number=" + current_version,
         )
 
+    # -----------------------------------------------------------------------------
+    # Complete the unit of work of the current document.
+    # -----------------------------------------------------------------------------
+    def complete_unit_of_work(self) -> None:
+        """Complete the unit of work of the current document.
+
+        The write-behind updates are flushed as soon as either the configured
+        number of documents is reached or the configured interval has expired.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        self._write_behind_documents += 1
+
+        if self._write_behind_documents >= dcr_core.core_glob.setup.db_write_behind_documents or (
+            dcr_core.core_glob.setup.db_write_behind_interval > 0
+            and time.perf_counter() - self._write_behind_start >= dcr_core.core_glob.setup.db_write_behind_interval
+        ):
+            self.flush_dbt_updates()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
     # -----------------------------------------------------------------------------
     # Create the database.
     # -----------------------------------------------------------------------------
@@ -602,7 +785,9 @@ class DBCore:
         """Disconnect the database."""
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        self.db_orm_metadata.clear()
+        self.flush_dbt_updates()
+
+        self.invalidate_dbt_cache()
         # try:
         #     self.db_orm_metadata.clear()
         # except:
@@ -654,15 +839,87 @@ class DBCore:
         # dcr_core.core_glob.logger.debug("param table_name=%s", table_name)
         # dcr_core.core_glob.logger.debug("param id_where  =%i", id_where)
 
-        dbt = sqlalchemy.Table(table_name, self.db_orm_metadata, autoload_with=self.db_orm_engine)
+        self.flush_dbt_updates(table_name=table_name, id_where=id_where)
 
         with self.db_orm_engine.connect().execution_options(autocommit=True) as conn:
-            conn.execute(sqlalchemy.delete(dbt).where(dbt.c.id == id_where))
+            conn.execute(self._get_stmnt(table_name, DBCore._STMNT_TYPE_DELETE), {DBCore._BIND_ID_WHERE: id_where})
 
             conn.close()
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
+    # -----------------------------------------------------------------------------
+    # Flush the write-behind inserts and updates in a single transaction.
+    # -----------------------------------------------------------------------------
+    def flush_dbt_updates(self, table_name: str = "", id_where: int = 0) -> None:
+        """Flush the write-behind inserts and updates in a single transaction.
+
+        If a table name is given, the unit of work is only flushed if there
+        is a pending insert or update of the database row with the given
+        id - this ensures that a database row is never read in a stale state.
+
+        Args:
+            table_name (str, optional): Table name. Defaults to "".
+            id_where (int, optional): Content of column id. Defaults to 0.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+        # dcr_core.core_glob.logger.debug("param table_name=%s", table_name)
+        # dcr_core.core_glob.logger.debug("param id_where  =%i", id_where)
+
+        if (
+            table_name != ""
+            and (table_name, id_where) not in self._write_behind_inserts
+            and (table_name, id_where) not in self._write_behind_updates
+        ):
+            return
+
+        if self._write_behind_inserts or self._write_behind_updates:
+            with self.db_orm_engine.begin() as conn:
+                # The rows of a table are inserted together in the order of their row ids - a row may
+                # refer to a previous one, and the foreign keys are checked at the end of the statement.
+                inserts: dict[tuple[str, tuple[str, ...]], list[Columns]] = {}
+
+                for ((insert_table_name, _), columns) in self._write_behind_inserts.items():
+                    inserts.setdefault((insert_table_name, tuple(sorted(columns))), []).append(columns)
+
+                for ((insert_table_name, _), rows) in inserts.items():
+                    conn.execute(self._get_stmnt(insert_table_name, DBCore._STMNT_TYPE_INSERT_MANY), rows)
+
+                updates: dict[tuple[str, tuple[str, ...]], list[Columns]] = {}
+
+                for ((update_table_name, update_id_where), columns) in self._write_behind_updates.items():
+                    updates.setdefault((update_table_name, tuple(sorted(columns))), []).append(
+                        {**columns, DBCore._BIND_ID_WHERE: update_id_where}
+                    )
+
+                for ((update_table_name, _), params) in updates.items():
+                    conn.execute(self._get_stmnt(update_table_name, DBCore._STMNT_TYPE_UPDATE), params)
+
+            self._write_behind_inserts.clear()
+            self._write_behind_updates.clear()
+
+        self._write_behind_documents = 0
+        self._write_behind_start = time.perf_counter()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    # -----------------------------------------------------------------------------
+    # Get a database table - reflected once per process.
+    # -----------------------------------------------------------------------------
+    def get_dbt(self, table_name: str) -> sqlalchemy.Table:
+        """Get a database table - reflected once per process.
+
+        Args:
+            table_name (str): Table name.
+
+        Returns:
+            sqlalchemy.Table: The reflected database table.
+        """
+        if table_name not in self._dbt_cache:
+            self._dbt_cache[table_name] = sqlalchemy.Table(table_name, self.db_orm_metadata, autoload_with=self.db_orm_engine)
+
+        return self._dbt_cache[table_name]
+
     # -----------------------------------------------------------------------------
     # Insert a new row into a database table.
     # -----------------------------------------------------------------------------
@@ -684,10 +941,8 @@ class DBCore:
         # dcr_core.core_glob.logger.debug("param table_name=%s", table_name)
         # dcr_core.core_glob.logger.debug("param columns   =%s", columns)
 
-        dbt = sqlalchemy.Table(table_name, self.db_orm_metadata, autoload_with=self.db_orm_engine)
-
         with self.db_orm_engine.connect().execution_options(autocommit=True) as conn:
-            result = conn.execute(sqlalchemy.insert(dbt).values(columns).returning(dbt.columns.id))
+            result = conn.execute(self._get_stmnt(table_name, DBCore._STMNT_TYPE_INSERT), columns)
             row = result.fetchone()
 
             conn.close()
@@ -696,6 +951,108 @@ class DBCore:
 
         return row[0]  # type: ignore
 
+    # -----------------------------------------------------------------------------
+    # Insert a new row into a database table - write-behind.
+    # -----------------------------------------------------------------------------
+    def insert_dbt_row_write_behind(
+        self,
+        table_name: str,
+        columns: Columns,
+    ) -> int:
+        """Insert a new row into a database table - write-behind.
+
+        The row id is taken from the sequence of the database table at
+        once, but the row is only inserted by the next flush of the unit
+        of work, in the same transaction as the write-behind updates. The
+        row ids are reserved in blocks of 'db_write_behind_documents' ids,
+        the ids of a block not used are lost.
+
+        Args:
+            table_name (str): Table name.
+            columns (Columns): Pairs of column name and value.
+
+        Returns:
+            int: The row id of the new row.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+        # dcr_core.core_glob.logger.debug("param table_name=%s", table_name)
+        # dcr_core.core_glob.logger.debug("param columns   =%s", columns)
+
+        ids = self._write_behind_ids.setdefault(table_name, deque())
+
+        if not ids:
+            with self.db_orm_engine.connect() as conn:
+                ids.extend(
+                    sorted(
+                        conn.execute(
+                            sqlalchemy.select(
+                                sqlalchemy.func.nextval(sqlalchemy.func.pg_get_serial_sequence(table_name, DBCore.DBC_ID))
+                            ).select_from(sqlalchemy.func.generate_series(1, max(1, dcr_core.core_glob.setup.db_write_behind_documents)))
+                        ).scalars()
+                    )
+                )
+
+                conn.close()
+
+        id_row = ids.popleft()
+
+        self._write_behind_inserts[(table_name, id_row)] = {**columns, DBCore.DBC_ID: id_row}
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+        return id_row
+
+    # -----------------------------------------------------------------------------
+    # Insert new rows into a database table in chunks.
+    # -----------------------------------------------------------------------------
+    def insert_dbt_rows(
+        self,
+        table_name: str,
+        rows: Iterable[Columns],
+        chunk_size: int,
+    ) -> int:
+        """Insert new rows into a database table in chunks.
+
+        All rows are inserted within a single transaction, each chunk
+        with a single executemany database access.
+
+        Args:
+            table_name (str): Table name.
+            rows (Iterable[Columns]): The rows, each as pairs of column name and value.
+            chunk_size (int): The maximum number of rows per database access.
+
+        Returns:
+            int: The number of rows inserted.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+        # dcr_core.core_glob.logger.debug("param table_name=%s", table_name)
+        # dcr_core.core_glob.logger.debug("param chunk_size=%i", chunk_size)
+
+        rows_iter = iter(rows)
+        rows_no = 0
+
+        with self.db_orm_engine.begin() as conn:
+            while chunk := list(itertools.islice(rows_iter, max(chunk_size, 1))):
+                conn.execute(self._get_stmnt(table_name, DBCore._STMNT_TYPE_INSERT_MANY), chunk)
+                rows_no += len(chunk)
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+        return rows_no
+
+    # -----------------------------------------------------------------------------
+    # Invalidate the cached database tables and statements.
+    # -----------------------------------------------------------------------------
+    def invalidate_dbt_cache(self) -> None:
+        """Invalidate the cached database tables and statements.
+
+        Required after any change of the database schema.
+        """
+        self._dbt_cache.clear()
+        self._stmnt_cache.clear()
+
+        self.db_orm_metadata.clear()
+
     # -----------------------------------------------------------------------------
     # Load database data from a JSON file.
     # -----------------------------------------------------------------------------
@@ -766,15 +1123,47 @@ class DBCore:
         # dcr_core.core_glob.logger.debug("param table_name=%s", table_name)
         # dcr_core.core_glob.logger.debug("param id_where  =%i", id_where)
 
-        dbt = sqlalchemy.Table(table_name, self.db_orm_metadata, autoload_with=self.db_orm_engine)
+        self.flush_dbt_updates(table_name=table_name, id_where=id_where)
 
         with self.db_orm_engine.connect().execution_options(autocommit=True) as conn:
-            conn.execute(sqlalchemy.update(dbt).where(dbt.c.id == id_where).values(columns))
+            conn.execute(self._get_stmnt(table_name, DBCore._STMNT_TYPE_UPDATE), {**columns, DBCore._BIND_ID_WHERE: id_where})
 
             conn.close()
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
+    # -----------------------------------------------------------------------------
+    # Update a database row based on its id column - write-behind.
+    # -----------------------------------------------------------------------------
+    def update_dbt_id_write_behind(
+        self,
+        table_name: str,
+        id_where: int,
+        columns: Columns,
+    ) -> None:
+        """Update a database row based on its id column - write-behind.
+
+        The update is collected in the current unit of work and written
+        to the database by the next flush. A later update of the same
+        database row replaces an update still pending, and the update of
+        a row still to be inserted is taken over into the insert.
+
+        Args:
+            table_name (str): sqlalchemy.Table name.
+            id_where (int): Content of column id.
+            columns (Columns): Pairs of column name and value.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+        # dcr_core.core_glob.logger.debug("param table_name=%s", table_name)
+        # dcr_core.core_glob.logger.debug("param id_where  =%i", id_where)
+
+        if (table_name, id_where) in self._write_behind_inserts:
+            self._write_behind_inserts[(table_name, id_where)].update(columns)
+        else:
+            self._write_behind_updates[(table_name, id_where)] = dict(columns)
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
     # -----------------------------------------------------------------------------
     # Upgrade the current database schema.
     # -----------------------------------------------------------------------------
@@ -798,6 +1187,11 @@ class DBCore:
             while dcr.db.cls_version.Version.select_version_version_unique() != dcr_core.cls_setup.Setup.DCR_VERSION:
                 self._upgrade_database_version()
 
+        self._upgrade_database_schema()
+        self._upgrade_database_indexes()
+
+        self.invalidate_dbt_cache()
+
         self.disconnect_db()
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
@@ -5,13 +5,24 @@
 """Module stub file."""
 import os
 import pathlib
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
 from typing import ClassVar
 from typing import TypeAlias
 
+import sqlalchemy
+import sqlalchemy.sql.expression
+
 Columns: TypeAlias = dict[str, bool | float | int | None | os.PathLike[str] | str]
 ColumnValues: TypeAlias = tuple[bool | float | int | None | os.PathLike[str] | str]
 
 class DBCore:
+    _BIND_ID_WHERE: ClassVar[str]
+    _STMNT_TYPE_DELETE: ClassVar[str]
+    _STMNT_TYPE_INSERT: ClassVar[str]
+    _STMNT_TYPE_INSERT_MANY: ClassVar[str]
+    _STMNT_TYPE_UPDATE: ClassVar[str]
     DBC_ACTION_CODE: ClassVar[str]
     DBC_ACTION_CODE_LAST: ClassVar[str]
     DBC_ACTION_TEXT: ClassVar[str]
@@ -48,6 +59,8 @@ class DBCore:
     DBC_ID_RUN_LAST: ClassVar[str]
     DBC_ISO_LANGUAGE_NAME: ClassVar[str]
     DBC_ISO_LANGUAGE_NAME_DEFAULT: ClassVar[str]
+    DBC_LEASE_EXPIRES_AT: ClassVar[str]
+    DBC_LEASE_OWNER: ClassVar[str]
     DBC_LINE_TYPE: ClassVar[str]
     DBC_MODIFIED_AT: ClassVar[str]
     DBC_NO_CHILDREN: ClassVar[str]
@@ -62,6 +75,7 @@ class DBCore:
     DBC_PAGE_DATA: ClassVar[str]
     DBC_PAGE_NO: ClassVar[str]
     DBC_PARA_NO: ClassVar[str]
+    DBC_PREPROCESSING_NS: ClassVar[str]
     DBC_ROW_NO: ClassVar[str]
     DBC_SENT_NO: ClassVar[str]
     DBC_SHA256: ClassVar[str]
@@ -72,12 +86,16 @@ class DBCore:
     DBC_TOTAL_PROCESSED_OK: ClassVar[str]
     DBC_TOTAL_PROCESSED_TO_BE: ClassVar[str]
     DBC_VERSION: ClassVar[str]
+    DBI_ACTION_ACTION_CODE_STATUS: ClassVar[str]
+    DBI_DOCUMENT_SHA256: ClassVar[str]
+    DBI_TOKEN_ID_DOCUMENT_PAGE_NO: ClassVar[str]
     DBT_ACTION: ClassVar[str]
     DBT_DOCUMENT: ClassVar[str]
     DBT_LANGUAGE: ClassVar[str]
     DBT_RUN: ClassVar[str]
     DBT_TOKEN: ClassVar[str]
     DBT_VERSION: ClassVar[str]
+    DB_INDEXES: ClassVar[dict[str, tuple[str, list[str]]]]
     DB_DIALECT_POSTGRESQL: ClassVar[str]
     JSON_NAME_API_VERSION: str
     JSON_NAME_COLUMN_NAME: str
@@ -93,7 +111,14 @@ class DBCore:
         self._db_current_password = None
         self._db_current_user = None
         self._db_driver_conn = None
+        self._dbt_cache: dict[str, sqlalchemy.Table] = ...
         self._exist = None
+        self._stmnt_cache: dict[tuple[str, str], sqlalchemy.sql.expression.Executable] = ...
+        self._write_behind_documents = None
+        self._write_behind_ids: dict[str, deque[int]] = ...
+        self._write_behind_inserts: dict[tuple[str, int], Columns] = ...
+        self._write_behind_start = None
+        self._write_behind_updates: dict[tuple[str, int], Columns] = ...
         self.db_orm_engine = None
         self.db_orm_metadata = None
     def _connect_db_admin(self) -> None: ...
@@ -105,13 +130,25 @@ class DBCore:
     def _create_db_triggers(self, table_names: list[str]) -> None: ...
     def _create_schema(self) -> None: ...
     def _drop_database_postgresql(self) -> None: ...
+    @staticmethod
+    def _get_engine_options() -> dict[str, Any]: ...
+    def _get_stmnt(self, table_name: str, stmnt_type: str) -> sqlalchemy.sql.expression.Executable: ...
     def _show_connection_details(self) -> None: ...
+    def _upgrade_database_indexes(self) -> None: ...
+    def _upgrade_database_schema(self) -> None: ...
     def _upgrade_database_version(self) -> None: ...
+    def complete_unit_of_work(self) -> None: ...
     def create_database(self) -> None: ...
     def disconnect_db(self) -> None: ...
     def exists(self) -> bool: ...
     def delete_dbt_id(self, table_name: str, id_where: int) -> None: ...
+    def flush_dbt_updates(self, table_name: str = ..., id_where: int = ...) -> None: ...
+    def get_dbt(self, table_name: str) -> sqlalchemy.Table: ...
     def insert_dbt_row(self, table_name: str, columns: Columns) -> int: ...
+    def insert_dbt_row_write_behind(self, table_name: str, columns: Columns) -> int: ...
+    def insert_dbt_rows(self, table_name: str, rows: Iterable[Columns], chunk_size: int) -> int: ...
+    def invalidate_dbt_cache(self) -> None: ...
     def load_db_data_from_json(self, db_initial_data_file: pathlib.Path) -> None: ...
     def update_dbt_id(self, table_name: str, id_where: int, columns: Columns) -> None: ...
+    def update_dbt_id_write_behind(self, table_name: str, id_where: int, columns: Columns) -> None: ...
     def upgrade_database(self) -> None: ...
@@ -241,6 +241,10 @@ class Document:
             sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_NO_PDF_PAGES, sqlalchemy.Integer, nullable=False),
             sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_SHA256, sqlalchemy.String, nullable=True),
             sqlalchemy.Column(dcr.db.cls_db_core.DBCore.DBC_STATUS, sqlalchemy.String, nullable=False),
+            sqlalchemy.Index(
+                dcr.db.cls_db_core.DBCore.DBI_DOCUMENT_SHA256,
+                dcr.db.cls_db_core.DBCore.DBC_SHA256,
+            ),
         )
 
         dcr.utils.progress_msg(f"The database table '{dcr.db.cls_db_core.DBCore.DBT_DOCUMENT}' has now been created")
@@ -314,11 +318,9 @@ class Document:
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
         # dcr_core.core_glob.logger.debug("param id_document=%i", id_document)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_DOCUMENT,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dcr.cfg.glob.db_core.flush_dbt_updates(table_name=dcr.db.cls_db_core.DBCore.DBT_DOCUMENT, id_where=id_document)
+
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_DOCUMENT)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             row = conn.execute(
@@ -520,8 +522,14 @@ class Document:
     # -----------------------------------------------------------------------------
     # Persist the object in the database.
     # -----------------------------------------------------------------------------
-    def persist_2_db(self) -> None:
-        """Persist the object in the database."""
+    def persist_2_db(self, is_write_behind: bool = False) -> None:
+        """Persist the object in the database.
+
+        Args:
+            is_write_behind (bool, optional):
+                    An update is only written by the next flush
+                    of the unit of work. Defaults to False.
+        """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
         if self.document_file_size_bytes == 0:
@@ -541,6 +549,12 @@ class Document:
                 table_name=dcr.db.cls_db_core.DBCore.DBT_DOCUMENT,
                 columns=self._get_columns(),
             )
+        elif is_write_behind:
+            dcr.cfg.glob.db_core.update_dbt_id_write_behind(  # type: ignore
+                table_name=dcr.db.cls_db_core.DBCore.DBT_DOCUMENT,
+                id_where=self.document_id,
+                columns=self._get_columns(),
+            )
         else:
             dcr.cfg.glob.db_core.update_dbt_id(  # type: ignore
                 table_name=dcr.db.cls_db_core.DBCore.DBT_DOCUMENT,
@@ -550,6 +564,43 @@ class Document:
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
+    # -----------------------------------------------------------------------------
+    # Select the documents based on their row ids.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def select_document_by_ids(cls, ids_document: set[int]) -> dict[int, Document]:
+        """Select the documents based on their row ids.
+
+        Pending write-behind updates of the requested documents are
+        flushed first, so that no document is read in a stale state.
+
+        Args:
+            ids_document (set[int]):
+                    The required row ids.
+
+        Returns:
+            dict[int, Document]:
+                    The object instances found, keyed by row id.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        for id_document in ids_document:
+            dcr.cfg.glob.db_core.flush_dbt_updates(table_name=dcr.db.cls_db_core.DBCore.DBT_DOCUMENT, id_where=id_document)
+
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_DOCUMENT)
+
+        with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+            rows = conn.execute(
+                sqlalchemy.select(dbt).where(
+                    dbt.c.id.in_(ids_document),
+                )
+            ).fetchall()
+            conn.close()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+        return {row[dcr.db.cls_db_core.DBCore.DBC_ID]: Document.from_row(row) for row in rows}
+
     # -----------------------------------------------------------------------------
     # Get the duplicate file name based on the hash key.
     # -----------------------------------------------------------------------------
@@ -571,11 +622,7 @@ class Document:
         # dcr_core.core_glob.logger.debug("param id_document=%i", id_document)
         # dcr_core.core_glob.logger.debug("param sha256     =%s", sha256)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_DOCUMENT,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_DOCUMENT)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             stmnt = sqlalchemy.select(dbt.c.file_name).where(
@@ -600,3 +647,47 @@ class Document:
             # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
             return row[0]  # type: ignore
+
+    # -----------------------------------------------------------------------------
+    # Get the file names of all documents with a hash key.
+    # -----------------------------------------------------------------------------
+    @classmethod
+    def select_sha256_index(cls) -> dict[bytes, str]:
+        """Get the file names of all documents with a hash key.
+
+        The index maps the binary SHA256 digest to the file name of the
+        first document with this hash key. Pending write-behind updates
+        are flushed first, so that no hash key is missing.
+
+        Returns:
+            dict[bytes, str]:
+                    The file names found, keyed by the binary digest.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        dcr.cfg.glob.db_core.flush_dbt_updates()
+
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_DOCUMENT)
+
+        sha256_index: dict[bytes, str] = {}
+
+        with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+            rows = conn.execute(
+                sqlalchemy.select(dbt.c.sha256, dbt.c.file_name)
+                .where(
+                    sqlalchemy.and_(
+                        dbt.c.sha256.is_not(None),
+                        dbt.c.sha256 != "",
+                    )
+                )
+                .order_by(dbt.c.id)
+            )
+
+            for row in rows:
+                sha256_index.setdefault(bytes.fromhex(row[0]), row[1])
+
+            conn.close()
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+        return sha256_index
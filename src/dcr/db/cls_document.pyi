@@ -83,6 +83,10 @@ class Document:
     def get_full_name(self) -> str: ...
     def get_stem_name(self) -> str: ...
     def get_stem_name_next(self) -> str: ...
-    def persist_2_db(self) -> None: ...
+    def persist_2_db(self, is_write_behind: bool = ...) -> None: ...
+    @classmethod
+    def select_document_by_ids(cls, ids_document: set[int]) -> dict[int, Document]: ...
     @classmethod
     def select_duplicate_file_name_by_sha256(cls, id_document: int, sha256: str) -> str: ...
+    @classmethod
+    def select_sha256_index(cls) -> dict[bytes, str]: ...
@@ -192,11 +192,7 @@ class Language:
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
         # dcr_core.core_glob.logger.debug("param id_language=%i", id_language)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_LANGUAGE,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_LANGUAGE)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             row = conn.execute(
@@ -272,11 +268,7 @@ class Language:
         """Load the data from the database table 'language'."""
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_LANGUAGE,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_LANGUAGE)
 
         Language.LANGUAGES_PANDOC = {}
         Language.LANGUAGES_SPACY = {}
@@ -340,11 +332,7 @@ class Language:
         """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_LANGUAGE,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_LANGUAGE)
 
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
@@ -232,8 +232,12 @@ class Run:
 
         self.run_status = dcr.db.cls_document.Document.DOCUMENT_STATUS_END
 
+        dcr.cfg.glob.db_core.flush_dbt_updates()
+
         self.persist_2_db()
 
+        dcr.db.cls_action.Action.release_leases()
+
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
     # -----------------------------------------------------------------------------
@@ -253,11 +257,7 @@ class Run:
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
         # dcr_core.core_glob.logger.debug("param id_run=%i", id_run)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_RUN,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_RUN)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             row = conn.execute(
@@ -395,11 +395,7 @@ class Run:
         """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_RUN,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_RUN)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             row = conn.execute(sqlalchemy.select(sqlalchemy.func.max(dbt.c.id_run))).fetchone()
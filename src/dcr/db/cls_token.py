@@ -223,6 +223,11 @@ class Token:
                 sqlalchemy.JSON,
                 nullable=False,
             ),
+            sqlalchemy.Index(
+                dcr.db.cls_db_core.DBCore.DBI_TOKEN_ID_DOCUMENT_PAGE_NO,
+                dcr.db.cls_db_core.DBCore.DBC_ID_DOCUMENT,
+                dcr.db.cls_db_core.DBCore.DBC_PAGE_NO,
+            ),
         )
 
         dcr.utils.progress_msg(f"The database table '{dcr.db.cls_db_core.DBCore.DBT_TOKEN}' has now been created")
@@ -267,11 +272,7 @@ class Token:
         """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_TOKEN,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_TOKEN)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             row = conn.execute(
@@ -143,11 +143,7 @@ class Version:
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
         # dcr_core.core_glob.logger.debug("param id_version=%i", id_version)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_VERSION,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_VERSION)
 
         with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
             row = conn.execute(
@@ -236,11 +232,7 @@ class Version:
         """
         # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        dbt = sqlalchemy.Table(
-            dcr.db.cls_db_core.DBCore.DBT_VERSION,
-            dcr.cfg.glob.db_core.db_orm_metadata,
-            autoload_with=dcr.cfg.glob.db_core.db_orm_engine,
-        )
+        dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_VERSION)
 
         current_version = ""
 
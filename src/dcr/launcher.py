@@ -7,6 +7,7 @@
 This is the entry point to the application DCR.
 """
 import locale
+import signal
 import sys
 import time
 
@@ -18,13 +19,16 @@ import sqlalchemy
 
 import dcr.cfg.cls_setup
 import dcr.cfg.glob
+import dcr.db.cls_action
 import dcr.db.cls_db_core
+import dcr.db.cls_document
 import dcr.db.cls_language
 import dcr.db.cls_run
 import dcr.db.cls_version
 import dcr.nlp.parser
 import dcr.nlp.pdflib
 import dcr.nlp.tokenizer
+import dcr.pp.cls_inbox_watcher
 import dcr.pp.inbox
 import dcr.pp.pandoc
 import dcr.pp.pdf2image
@@ -34,6 +38,8 @@ import dcr.utils
 # -----------------------------------------------------------------------------
 # Class variables.
 # -----------------------------------------------------------------------------
+DCR_ARG_STREAM = "--stream"
+DCR_ARG_WATCH = "--watch"
 DCR_ARGV_0 = "src/dcr/launcher.py"
 
 LOCALE = "en_US.UTF-8"
@@ -70,6 +76,39 @@ def check_db_up_to_date() -> None:
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Process the current action based on the action code.
+# -----------------------------------------------------------------------------
+def dispatch_action(action_code: str) -> None:
+    """Process the current action based on the action code.
+
+    Args:
+        action_code (str): The action code of the current action.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param action_code=%s", action_code)
+
+    match action_code:
+        case dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE:
+            dcr.pp.pdf2image.convert_pdf_2_image_file()
+        case dcr.db.cls_run.Run.ACTION_CODE_TESSERACT:
+            dcr.pp.tesseract.convert_image_2_pdf_file()
+        case dcr.db.cls_run.Run.ACTION_CODE_PANDOC:
+            dcr.pp.pandoc.convert_non_pdf_2_pdf_file()
+        case dcr.db.cls_run.Run.ACTION_CODE_PDFLIB:
+            dcr.nlp.pdflib.extract_text_from_pdf_action()
+        case (
+            dcr.db.cls_run.Run.ACTION_CODE_PARSER_LINE
+            | dcr.db.cls_run.Run.ACTION_CODE_PARSER_PAGE
+            | dcr.db.cls_run.Run.ACTION_CODE_PARSER_WORD
+        ):
+            dcr.nlp.parser.parse_tetml_file_by_action_code(action_code)
+        case dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE:
+            dcr.nlp.tokenizer.tokenize_file()
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Load the command line arguments into memory.
 # -----------------------------------------------------------------------------
@@ -95,6 +134,13 @@ def get_args(argv: list[str]) -> dict[str, bool]:
         tet   - Extract text and metadata from pdf documents:       PDFlib TET.
         tkn   - Create document tokens:                             spaCy.
 
+    The following options can be combined with the process steps:
+
+        --stream - Process the documents one after the other through
+                   all selected process steps (streaming mode).
+        --watch  - Repeat the selected process steps whenever new files
+                   arrive in the inbox file directories (watch mode).
+
     With the option all, the following process steps are executed
     in this order:
 
@@ -106,6 +152,16 @@ def get_args(argv: list[str]) -> dict[str, bool]:
         6. s_p_j
         7. tkn
 
+    In streaming mode, step 1 is executed first and afterwards each
+    document passes through steps 2 to 7 before the next document is
+    started. The streaming mode runs in a single process, i.e. the
+    max_workers parameters are ignored, and is not possible with
+    leasing (lease_duration > 0).
+
+    In watch mode, the database connection, the language data and the
+    spaCy tokenizer are kept between the passes. The watch mode ends
+    after the current pass with the signal SIGINT or SIGTERM.
+
     Args:
         argv (list[str]): Command line arguments.
 
@@ -124,6 +180,8 @@ def get_args(argv: list[str]) -> dict[str, bool]:
         dcr_core.core_utils.terminate_fatal("The specific command line arguments are missing")
 
     args = {
+        DCR_ARG_STREAM: False,
+        DCR_ARG_WATCH: False,
         dcr.db.cls_run.Run.ACTION_CODE_CREATE_DB: False,
         dcr.db.cls_run.Run.ACTION_CODE_EXPORT_LT_RULES: False,
         dcr.db.cls_run.Run.ACTION_CODE_INBOX: False,
@@ -147,6 +205,8 @@ def get_args(argv: list[str]) -> dict[str, bool]:
             args[dcr.db.cls_run.Run.ACTION_CODE_TESSERACT] = True
             args[dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE] = True
         elif arg in (
+            DCR_ARG_STREAM,
+            DCR_ARG_WATCH,
             dcr.db.cls_run.Run.ACTION_CODE_CREATE_DB,
             dcr.db.cls_run.Run.ACTION_CODE_EXPORT_LT_RULES,
             dcr.db.cls_run.Run.ACTION_CODE_INBOX,
@@ -162,6 +222,12 @@ def get_args(argv: list[str]) -> dict[str, bool]:
         else:
             dcr_core.core_utils.terminate_fatal(f"Unknown command line argument='{argv[i]}'")
 
+    # The streaming mode processes the actions of a document without claiming them.
+    if args[DCR_ARG_STREAM] and dcr_core.core_glob.setup.lease_duration > 0:
+        dcr_core.core_utils.terminate_fatal(
+            f"The command line argument '{DCR_ARG_STREAM}' is not possible with leasing (lease_duration > 0)"
+        )
+
     dcr.utils.progress_msg("The command line arguments are validated and loaded")
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
@@ -308,6 +374,81 @@ def process_documents(args: dict[str, bool]) -> None:
     # Load the data from the database table 'language'.
     dcr.db.cls_language.Language.load_data_from_dbt_language()
 
+    if args[DCR_ARG_WATCH]:
+        # Repeat the process steps whenever new files arrive.
+        process_documents_watch(args)
+    else:
+        process_documents_steps(args)
+
+    # Disconnect from the database.
+    dcr.cfg.glob.db_core.disconnect_db()
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Process a single document through all selected process steps.
+# -----------------------------------------------------------------------------
+def process_document_stream(id_document: int, stages: list[tuple[str, list[str]]], runs: dict[str, dcr.db.cls_run.Run]) -> None:
+    """Process a single document through all selected process steps.
+
+    The process steps are executed in the order of the batch mode, so
+    that the actions created by one step are picked up by the following
+    steps within the same pass.
+
+    Args:
+        id_document (int): The row id of the document.
+        stages (list[tuple[str, list[str]]]): The action code of the run and
+            the related action codes of each selected process step.
+        runs (dict[str, dcr.db.cls_run.Run]): The runs of the selected process steps.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param id_document=%i", id_document)
+
+    for (run_action_code, action_codes) in stages:
+        dcr.cfg.glob.run = runs[run_action_code]
+
+        for action_code in action_codes:
+            # The actions written behind by the previous process step are read.
+            dcr.cfg.glob.db_core.flush_dbt_updates()
+
+            with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
+                rows = dcr.db.cls_action.Action.select_action_by_action_code_id_document(
+                    conn=conn, action_code=action_code, id_document=id_document
+                ).fetchall()
+                conn.close()
+
+            for row in rows:
+                dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+
+                dcr.cfg.glob.run.run_total_processed_to_be += 1
+
+                dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_row(row)
+
+                if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
+                    dcr.cfg.glob.run.total_status_error += 1
+                else:
+                    dcr.cfg.glob.run.total_status_ready += 1
+
+                dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=id_document)
+
+                dispatch_action(action_code)
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Process the documents through the selected process steps.
+# -----------------------------------------------------------------------------
+def process_documents_steps(args: dict[str, bool]) -> None:
+    """Process the documents through the selected process steps.
+
+    Args:
+        args (dict[str, bool]): The processing steps based on CLI arguments.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param args=%s", args)
+
     # Export the line type rules.
     if args[dcr.db.cls_run.Run.ACTION_CODE_EXPORT_LT_RULES]:
         start_time_process = time.perf_counter_ns()
@@ -320,44 +461,175 @@ def process_documents(args: dict[str, bool]) -> None:
         process_inbox_directory()
         dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
 
-    # Convert the scanned image pdf documents to image files.
-    if args[dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE]:
+    if args[DCR_ARG_STREAM]:
+        # Process the documents one after the other through all process steps.
         start_time_process = time.perf_counter_ns()
-        process_convert_pdf_2_image()
+        process_documents_stream(args)
         dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+    else:
+        # Convert the scanned image pdf documents to image files.
+        if args[dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE]:
+            start_time_process = time.perf_counter_ns()
+            process_convert_pdf_2_image()
+            dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+
+        # Convert the image files to pdf documents.
+        if args[dcr.db.cls_run.Run.ACTION_CODE_TESSERACT]:
+            start_time_process = time.perf_counter_ns()
+            process_convert_image_2_pdf()
+            dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+
+        # Convert the non-pdf documents to pdf documents.
+        if args[dcr.db.cls_run.Run.ACTION_CODE_PANDOC]:
+            start_time_process = time.perf_counter_ns()
+            process_convert_non_pdf_2_pdf()
+            dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+
+        # Extract text and metadata from pdf documents.
+        if args[dcr.db.cls_run.Run.ACTION_CODE_PDFLIB]:
+            start_time_process = time.perf_counter_ns()
+            process_extract_text_from_pdf()
+            dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+
+        # Store the document structure from the parser result.
+        if args[dcr.db.cls_run.Run.ACTION_CODE_PARSER]:
+            start_time_process = time.perf_counter_ns()
+            process_store_parse_result_in_json()
+            dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+
+        # Create document token.
+        if args[dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE]:
+            start_time_process = time.perf_counter_ns()
+            process_tokenize()
+            dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+
+    # The pdf inspections are only valid within a pass - in watch mode, the memory would grow with each new file.
+    dcr.cfg.glob.pdf_inspection.clear()
 
-    # Convert the image files to pdf documents.
-    if args[dcr.db.cls_run.Run.ACTION_CODE_TESSERACT]:
-        start_time_process = time.perf_counter_ns()
-        process_convert_image_2_pdf()
-        dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
-    # Convert the non-pdf documents to pdf documents.
-    if args[dcr.db.cls_run.Run.ACTION_CODE_PANDOC]:
-        start_time_process = time.perf_counter_ns()
-        process_convert_non_pdf_2_pdf()
-        dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
 
-    # Extract text and metadata from pdf documents.
-    if args[dcr.db.cls_run.Run.ACTION_CODE_PDFLIB]:
-        start_time_process = time.perf_counter_ns()
-        process_extract_text_from_pdf()
-        dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+# -----------------------------------------------------------------------------
+# Process the documents in streaming mode.
+# -----------------------------------------------------------------------------
+def process_documents_stream(args: dict[str, bool]) -> None:
+    """Process the documents in streaming mode.
 
-    # Store the document structure from the parser result.
-    if args[dcr.db.cls_run.Run.ACTION_CODE_PARSER]:
-        start_time_process = time.perf_counter_ns()
-        process_store_parse_result_in_json()
-        dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+    Each document passes through all selected process steps before
+    the next document is started. This way, the first results are
+    available immediately and at most one document per process step
+    is in progress. The actions are neither processed in worker
+    processes nor claimed - several nodes must not process the same
+    database in streaming mode.
 
-    # Create document token.
-    if args[dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE]:
-        start_time_process = time.perf_counter_ns()
-        process_tokenize()
-        dcr.utils.progress_msg(f"Time : {round((time.perf_counter_ns() - start_time_process) / 1000000000, 2) :10.2f} s")
+    Args:
+        args (dict[str, bool]): The processing steps based on CLI arguments.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param args=%s", args)
 
-    # Disconnect from the database.
-    dcr.cfg.glob.db_core.disconnect_db()
+    stages = [
+        (run_action_code, action_codes)
+        for (run_action_code, action_codes) in (
+            (dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE, [dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE]),
+            (dcr.db.cls_run.Run.ACTION_CODE_TESSERACT, [dcr.db.cls_run.Run.ACTION_CODE_TESSERACT]),
+            (dcr.db.cls_run.Run.ACTION_CODE_PANDOC, [dcr.db.cls_run.Run.ACTION_CODE_PANDOC]),
+            (dcr.db.cls_run.Run.ACTION_CODE_PDFLIB, [dcr.db.cls_run.Run.ACTION_CODE_PDFLIB]),
+            (
+                dcr.db.cls_run.Run.ACTION_CODE_PARSER,
+                [
+                    dcr.db.cls_run.Run.ACTION_CODE_PARSER_LINE,
+                    dcr.db.cls_run.Run.ACTION_CODE_PARSER_PAGE,
+                    dcr.db.cls_run.Run.ACTION_CODE_PARSER_WORD,
+                ],
+            ),
+            (dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE, [dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE]),
+        )
+        if args[run_action_code]
+    ]
+
+    if not stages:
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
+    dcr.utils.progress_msg_empty_before("Start: Process the documents in streaming mode ...")
+
+    runs = {run_action_code: dcr.db.cls_run.Run(action_code=run_action_code) for (run_action_code, _) in stages}
+
+    if dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE in runs:
+        dcr.nlp.tokenizer.initialise_tokenizer_spacy()
+
+    with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
+        ids_document = [
+            row[0]
+            for row in dcr.db.cls_action.Action.select_id_document_by_action_codes(
+                conn=conn, action_codes=[action_code for (_, action_codes) in stages for action_code in action_codes]
+            )
+        ]
+        conn.close()
+
+    for id_document in ids_document:
+        process_document_stream(id_document=id_document, stages=stages, runs=runs)
+
+    for (run_action_code, _) in stages:
+        dcr.cfg.glob.run = runs[run_action_code]
+
+        dcr.utils.progress_msg(f"Process step: {dcr.db.cls_run.Run.get_action_text(run_action_code)}")
+        dcr.utils.show_statistics_total()
+
+        dcr.cfg.glob.run.finalise()
+
+    dcr.utils.progress_msg("End  : Process the documents in streaming mode ...")
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Process the documents in watch mode.
+# -----------------------------------------------------------------------------
+def process_documents_watch(args: dict[str, bool]) -> None:
+    """Process the documents in watch mode.
+
+    The selected process steps are repeated whenever new files arrive in
+    the inbox file directories, but at least every 'watch_interval'
+    seconds. The signals SIGINT and SIGTERM end the watch mode after the
+    current pass.
+
+    Args:
+        args (dict[str, bool]): The processing steps based on CLI arguments.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param args=%s", args)
+
+    dcr.utils.progress_msg_empty_before("Start: Process the documents in watch mode ...")
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        directory_names = [
+            str(dcr.db.cls_language.Language.from_row(row).language_directory_name_inbox)
+            for row in dcr.db.cls_language.Language.select_active_languages(conn)
+        ]
+        conn.close()
+
+    watcher = dcr.pp.cls_inbox_watcher.InboxWatcher(directory_names)
+
+    signal_handlers = {signum: signal.signal(signum, watcher.request_shutdown) for signum in (signal.SIGINT, signal.SIGTERM)}
+
+    dcr.cfg.glob.is_keep_warm = True
+
+    try:
+        while not watcher.is_shutdown_requested:
+            process_documents_steps(args)
+
+            watcher.wait(dcr_core.core_glob.setup.watch_interval)
+    finally:
+        dcr.cfg.glob.is_keep_warm = False
+
+        for (signum, handler) in signal_handlers.items():
+            signal.signal(signum, handler)
+
+        watcher.close()
+
+    dcr.utils.progress_msg("End  : Process the documents in watch mode ...")
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
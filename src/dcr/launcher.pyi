@@ -3,16 +3,25 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module stub file."""
+import dcr.db.cls_run
+
+DCR_ARG_STREAM: str
+DCR_ARG_WATCH: str
 DCR_ARGV_0: str
 
 def check_db_up_to_date() -> None: ...
+def dispatch_action(action_code: str) -> None: ...
 def get_args(argv: list[str]) -> dict[str, bool]: ...
 def load_data_from_dbt_language() -> None: ...
 def main(argv: list[str]) -> None: ...
 def process_convert_image_2_pdf() -> None: ...
 def process_convert_non_pdf_2_pdf() -> None: ...
 def process_convert_pdf_2_image() -> None: ...
+def process_document_stream(id_document: int, stages: list[tuple[str, list[str]]], runs: dict[str, dcr.db.cls_run.Run]) -> None: ...
 def process_documents(args: dict[str, bool]) -> None: ...
+def process_documents_steps(args: dict[str, bool]) -> None: ...
+def process_documents_stream(args: dict[str, bool]) -> None: ...
+def process_documents_watch(args: dict[str, bool]) -> None: ...
 def process_export_lt_rules() -> None: ...
 def process_extract_text_from_pdf() -> None: ...
 def process_inbox_directory() -> None: ...
@@ -3,6 +3,7 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module nlp.parser: Store the document structure from the parser result."""
+import functools
 import os
 import time
 
@@ -17,6 +18,7 @@ import dcr.db.cls_action
 import dcr.db.cls_document
 import dcr.db.cls_run
 import dcr.utils
+import dcr.worker
 
 
 # -----------------------------------------------------------------------------
@@ -58,10 +60,14 @@ def parse_tetml() -> None:
         dcr_core.core_glob.setup.is_parsing_page = is_parsing_page
         dcr_core.core_glob.setup.is_parsing_word = is_parsing_word
 
-        with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
-            rows = dcr.db.cls_action.Action.select_action_by_action_code(conn=conn, action_code=action_code)
-
-            for row in rows:
+        if dcr_core.core_glob.setup.max_workers_parser > 1:
+            dcr.worker.process_actions(
+                action_code=action_code,
+                process_file=functools.partial(parse_tetml_file_by_action_code, action_code),
+                max_workers=dcr_core.core_glob.setup.max_workers_parser,
+            )
+        else:
+            for (action, document) in dcr.db.cls_action.Action.select_action_document_by_action_code(action_code=action_code):
                 # ------------------------------------------------------------------
                 # Processing a single document
                 # ------------------------------------------------------------------
@@ -69,18 +75,16 @@ def parse_tetml() -> None:
 
                 dcr.cfg.glob.run.run_total_processed_to_be += 1
 
-                dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_row(row)
+                dcr.cfg.glob.action_curr = action
 
                 if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
                     dcr.cfg.glob.run.total_status_error += 1
                 else:
                     dcr.cfg.glob.run.total_status_ready += 1
 
-                dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=dcr.cfg.glob.action_curr.action_id_document)
+                dcr.cfg.glob.document = document
 
                 parse_tetml_file()
-
-            conn.close()
         dcr.utils.progress_msg(f"End   of processing for tetml type '{tetml_type}'")
 
     dcr.utils.show_statistics_total()
@@ -88,6 +92,27 @@ def parse_tetml() -> None:
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Parse the TETML file of the current action based on the action code.
+# -----------------------------------------------------------------------------
+def parse_tetml_file_by_action_code(action_code: str) -> None:
+    """Parse the TETML file of the current action based on the action code.
+
+    Args:
+        action_code (str): One of the action codes s_p_j_line, s_p_j_page or s_p_j_word.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param action_code=%s", action_code)
+
+    dcr_core.core_glob.setup.is_parsing_line = action_code == dcr.db.cls_run.Run.ACTION_CODE_PARSER_LINE
+    dcr_core.core_glob.setup.is_parsing_page = action_code == dcr.db.cls_run.Run.ACTION_CODE_PARSER_PAGE
+    dcr_core.core_glob.setup.is_parsing_word = action_code == dcr.db.cls_run.Run.ACTION_CODE_PARSER_WORD
+
+    parse_tetml_file()
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Parse the TETML file (step: s_p_j).
 # -----------------------------------------------------------------------------
@@ -5,5 +5,6 @@
 """Module stub file."""
 
 def parse_tetml() -> None: ...
+def parse_tetml_file_by_action_code(action_code: str) -> None: ...
 def parse_tetml_file_line() -> None: ...
 def parse_tetml_file_word() -> None: ...
@@ -4,6 +4,7 @@
 
 """Module nlp.pdflib: Extract text from pdf documents."""
 import os
+import pathlib
 import time
 
 import dcr_core.cls_nlp_core
@@ -11,11 +12,13 @@ import dcr_core.cls_process
 import dcr_core.core_glob
 import dcr_core.core_utils
 
+import dcr.artifact_cache
 import dcr.cfg.glob
 import dcr.db.cls_action
 import dcr.db.cls_document
 import dcr.db.cls_run
 import dcr.utils
+import dcr.worker
 
 # -----------------------------------------------------------------------------
 # Global variables.
@@ -33,55 +36,78 @@ def extract_text_from_pdf() -> None:
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-    with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
-        rows = dcr.db.cls_action.Action.select_action_by_action_code(conn=conn, action_code=dcr.db.cls_run.Run.ACTION_CODE_PDFLIB)
+    if dcr_core.core_glob.setup.max_workers_pdflib > 1:
+        dcr.worker.process_actions(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_PDFLIB,
+            process_file=extract_text_from_pdf_action,
+            max_workers=dcr_core.core_glob.setup.max_workers_pdflib,
+        )
+        dcr.utils.show_statistics_total()
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
 
-        for row in rows:
-            dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+    for (action, document) in dcr.db.cls_action.Action.select_action_document_by_action_code(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_PDFLIB
+    ):
+        dcr.cfg.glob.start_time_document = time.perf_counter_ns()
 
-            dcr.cfg.glob.run.run_total_processed_to_be += 1
+        dcr.cfg.glob.run.run_total_processed_to_be += 1
 
-            dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_row(row)
+        dcr.cfg.glob.action_curr = action
 
-            if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
-                dcr.cfg.glob.run.total_status_error += 1
-            else:
-                dcr.cfg.glob.run.total_status_ready += 1
+        if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
+            dcr.cfg.glob.run.total_status_error += 1
+        else:
+            dcr.cfg.glob.run.total_status_ready += 1
 
-            dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=dcr.cfg.glob.action_curr.action_id_document)
+        dcr.cfg.glob.document = document
 
-            is_no_error = extract_text_from_pdf_file(
-                document_opt_list=dcr_core.cls_nlp_core.NLPCore.LINE_TET_DOCUMENT_OPT_LIST,
-                page_opt_list=dcr_core.cls_nlp_core.NLPCore.LINE_TET_PAGE_OPT_LIST,
-                xml_variation=dcr_core.cls_nlp_core.NLPCore.LINE_XML_VARIATION,
-            )
+        extract_text_from_pdf_action()
 
-            if dcr_core.core_glob.setup.is_tetml_page:
-                if is_no_error:
-                    is_no_error = extract_text_from_pdf_file(
-                        document_opt_list=dcr_core.cls_nlp_core.NLPCore.PAGE_TET_DOCUMENT_OPT_LIST,
-                        page_opt_list=dcr_core.cls_nlp_core.NLPCore.PAGE_TET_PAGE_OPT_LIST,
-                        xml_variation=dcr_core.cls_nlp_core.NLPCore.PAGE_XML_VARIATION,
-                    )
+    dcr.utils.show_statistics_total()
 
-            if dcr_core.core_glob.setup.is_tetml_word:
-                if is_no_error:
-                    is_no_error = extract_text_from_pdf_file(
-                        document_opt_list=dcr_core.cls_nlp_core.NLPCore.WORD_TET_DOCUMENT_OPT_LIST,
-                        page_opt_list=dcr_core.cls_nlp_core.NLPCore.WORD_TET_PAGE_OPT_LIST,
-                        xml_variation=dcr_core.cls_nlp_core.NLPCore.WORD_XML_VARIATION,
-                    )
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
-            if is_no_error:
-                dcr.utils.delete_auxiliary_file(dcr.cfg.glob.action_curr.get_full_name())
 
-                dcr.cfg.glob.action_curr.finalise()
+# -----------------------------------------------------------------------------
+# Extract text from the pdf document of the current action (step: tet).
+# -----------------------------------------------------------------------------
+def extract_text_from_pdf_action() -> None:
+    """Extract text from the pdf document of the current action.
 
-                dcr.cfg.glob.run.run_total_processed_ok += 1
+    Depending on the configuration, the line, page and word
+    variations are created one after the other.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-        conn.close()
+    is_no_error = extract_text_from_pdf_file(
+        document_opt_list=dcr_core.cls_nlp_core.NLPCore.LINE_TET_DOCUMENT_OPT_LIST,
+        page_opt_list=dcr_core.cls_nlp_core.NLPCore.LINE_TET_PAGE_OPT_LIST,
+        xml_variation=dcr_core.cls_nlp_core.NLPCore.LINE_XML_VARIATION,
+    )
 
-    dcr.utils.show_statistics_total()
+    if dcr_core.core_glob.setup.is_tetml_page:
+        if is_no_error:
+            is_no_error = extract_text_from_pdf_file(
+                document_opt_list=dcr_core.cls_nlp_core.NLPCore.PAGE_TET_DOCUMENT_OPT_LIST,
+                page_opt_list=dcr_core.cls_nlp_core.NLPCore.PAGE_TET_PAGE_OPT_LIST,
+                xml_variation=dcr_core.cls_nlp_core.NLPCore.PAGE_XML_VARIATION,
+            )
+
+    if dcr_core.core_glob.setup.is_tetml_word:
+        if is_no_error:
+            is_no_error = extract_text_from_pdf_file(
+                document_opt_list=dcr_core.cls_nlp_core.NLPCore.WORD_TET_DOCUMENT_OPT_LIST,
+                page_opt_list=dcr_core.cls_nlp_core.NLPCore.WORD_TET_PAGE_OPT_LIST,
+                xml_variation=dcr_core.cls_nlp_core.NLPCore.WORD_XML_VARIATION,
+            )
+
+    if is_no_error:
+        dcr.utils.delete_auxiliary_file(dcr.cfg.glob.action_curr.get_full_name())
+
+        dcr.cfg.glob.action_curr.finalise()
+
+        dcr.cfg.glob.run.run_total_processed_ok += 1
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
@@ -91,7 +117,16 @@ def extract_text_from_pdf() -> None:
 # -----------------------------------------------------------------------------
 # noinspection PyArgumentList
 def extract_text_from_pdf_file(document_opt_list: str, page_opt_list: str, xml_variation: str) -> bool:
-    """Extract text from a pdf document (step: tet) - method line."""
+    """Extract text from a pdf document (step: tet) - method line.
+
+    Args:
+        document_opt_list (str): The document options of PDFlib TET.
+        page_opt_list (str): The page options of PDFlib TET.
+        xml_variation (str): The granularity of the xml file: line, page or word.
+
+    Returns:
+        bool: False if the current action has been finalised with an error.
+    """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
     dcr_core.core_glob.logger.debug("param document_opt_list=%s", document_opt_list)
     dcr_core.core_glob.logger.debug("param page_opt_list    =%s", page_opt_list)
@@ -113,16 +148,28 @@ def extract_text_from_pdf_file(document_opt_list: str, page_opt_list: str, xml_v
         dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
         return False
 
-    (error_code, error_msg) = dcr_core.cls_process.Process.pdflib(
-        full_name_in=full_name_curr,
-        full_name_out=full_name_next,
-        document_opt_list=document_opt_list,
-        page_opt_list=page_opt_list,
+    # The input file can be the result of Tesseract OCR and thus depend on its configuration.
+    artifact_key = dcr.artifact_cache.get_artifact_key(
+        dcr.artifact_cache.STAGE_TET,
+        dcr.utils.compute_sha256(pathlib.Path(full_name_curr)) if dcr_core.core_glob.setup.artifact_cache_directory else "",
+        xml_variation,
+        document_opt_list,
+        page_opt_list,
     )
-    if (error_code, error_msg) != dcr_core.core_glob.RETURN_OK:
-        dcr.cfg.glob.action_curr.finalise_error(error_code, error_msg)
-        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
-        return False
+
+    if not dcr.artifact_cache.restore_artifact(artifact_key, full_name_next):
+        (error_code, error_msg) = dcr_core.cls_process.Process.pdflib(
+            full_name_in=full_name_curr,
+            full_name_out=full_name_next,
+            document_opt_list=document_opt_list,
+            page_opt_list=page_opt_list,
+        )
+        if (error_code, error_msg) != dcr_core.core_glob.RETURN_OK:
+            dcr.cfg.glob.action_curr.finalise_error(error_code, error_msg)
+            dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+            return False
+
+        dcr.artifact_cache.store_artifact(artifact_key, full_name_next)
 
     if xml_variation == dcr_core.cls_nlp_core.NLPCore.LINE_XML_VARIATION:
         action_code = dcr.db.cls_run.Run.ACTION_CODE_PARSER_LINE
@@ -14,4 +14,5 @@ WORD_TET_PAGE_OPT_LIST: str
 WORD_XML_VARIATION: str
 
 def extract_text_from_pdf() -> None: ...
+def extract_text_from_pdf_action() -> None: ...
 def extract_text_from_pdf_file(document_opt_list: str, page_opt_list: str, xml_variation: str) -> bool: ...
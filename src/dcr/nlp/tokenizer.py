@@ -6,6 +6,7 @@
 database."""
 
 import time
+from collections.abc import Iterator
 
 import dcr_core.cls_nlp_core
 import dcr_core.cls_process
@@ -20,19 +21,20 @@ import dcr.db.cls_db_core
 import dcr.db.cls_document
 import dcr.db.cls_language
 import dcr.db.cls_run
-import dcr.db.cls_token
 import dcr.utils
+import dcr.worker
 
 
 # -----------------------------------------------------------------------------
-# Save the tokens sentence by sentence in the database.
+# Get the database columns of the tokens sentence by sentence.
 # -----------------------------------------------------------------------------
-def store_tokens_in_database() -> None:
-    """Save the tokens sentence by sentence in the database."""
-    # not testable
-    if not dcr_core.core_glob.setup.is_tokenize_2_database:
-        return
+def get_token_columns() -> Iterator[dcr.db.cls_db_core.Columns]:
+    """Get the database columns of the tokens sentence by sentence.
 
+    Yields:
+        Iterator[dcr.db.cls_db_core.Columns]:
+                The database columns of a sentence.
+    """
     for page in dcr_core.core_glob.tokenizer_spacy.token_pages:
         page_no = page[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_PAGE_NO]
         paras = page[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_PARAS]
@@ -52,21 +54,55 @@ def store_tokens_in_database() -> None:
                 else:
                     column_span = 0
 
-                dcr.db.cls_token.Token(
-                    id_document=dcr.cfg.glob.document.document_id,
-                    column_no=column_no,
-                    column_span=column_span,
-                    coord_llx=sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_COORD_LLX],
-                    coord_urx=sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_COORD_URX],
-                    line_type=sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_LINE_TYPE],
-                    no_tokens_in_sent=sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_NO_TOKENS_IN_SENT],
-                    page_no=page_no,
-                    para_no=para_no,
-                    row_no=row_no,
-                    sent_no=sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_SENT_NO],
-                    text=sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_TEXT],
-                    tokens=sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_TOKENS],  # type: ignore
-                )
+                yield {
+                    dcr.db.cls_db_core.DBCore.DBC_ID_DOCUMENT: dcr.cfg.glob.document.document_id,
+                    dcr.db.cls_db_core.DBCore.DBC_COLUMN_NO: column_no,
+                    dcr.db.cls_db_core.DBCore.DBC_COLUMN_SPAN: column_span,
+                    dcr.db.cls_db_core.DBCore.DBC_COORD_LLX: sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_COORD_LLX],
+                    dcr.db.cls_db_core.DBCore.DBC_COORD_URX: sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_COORD_URX],
+                    dcr.db.cls_db_core.DBCore.DBC_LINE_TYPE: sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_LINE_TYPE],
+                    dcr.db.cls_db_core.DBCore.DBC_NO_TOKENS_IN_SENT: sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_NO_TOKENS_IN_SENT],
+                    dcr.db.cls_db_core.DBCore.DBC_PAGE_NO: page_no,
+                    dcr.db.cls_db_core.DBCore.DBC_PARA_NO: para_no,
+                    dcr.db.cls_db_core.DBCore.DBC_ROW_NO: row_no,
+                    dcr.db.cls_db_core.DBCore.DBC_SENT_NO: sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_SENT_NO],
+                    dcr.db.cls_db_core.DBCore.DBC_TEXT: sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_TEXT],
+                    dcr.db.cls_db_core.DBCore.DBC_TOKENS: sent[dcr_core.cls_nlp_core.NLPCore.JSON_NAME_TOKENS],
+                }
+
+
+# -----------------------------------------------------------------------------
+# Initialise the spaCy tokenizer.
+# -----------------------------------------------------------------------------
+def initialise_tokenizer_spacy() -> None:
+    """Initialise the spaCy tokenizer.
+
+    In watch mode, the spaCy tokenizer of the previous pass is reused.
+    """
+    if dcr.cfg.glob.is_keep_warm and getattr(dcr_core.core_glob, "tokenizer_spacy", None) is not None:
+        return
+
+    dcr_core.core_glob.tokenizer_spacy = dcr_core.cls_tokenizer_spacy.TokenizerSpacy()
+
+
+# -----------------------------------------------------------------------------
+# Save the tokens sentence by sentence in the database.
+# -----------------------------------------------------------------------------
+def store_tokens_in_database() -> None:
+    """Save the tokens sentence by sentence in the database.
+
+    The sentences of the current document are inserted within a single
+    transaction in chunks of 'tokenize_2_database_chunk_size' rows.
+    """
+    # not testable
+    if not dcr_core.core_glob.setup.is_tokenize_2_database:
+        return
+
+    dcr.cfg.glob.db_core.insert_dbt_rows(
+        table_name=dcr.db.cls_db_core.DBCore.DBT_TOKEN,
+        rows=get_token_columns(),
+        chunk_size=dcr_core.core_glob.setup.tokenize_2_database_chunk_size,
+    )
 
 
 # -----------------------------------------------------------------------------
@@ -79,29 +115,38 @@ def tokenize() -> None:
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-    dcr_core.core_glob.tokenizer_spacy = dcr_core.cls_tokenizer_spacy.TokenizerSpacy()
+    if dcr_core.core_glob.setup.max_workers_tokenizer > 1:
+        dcr.worker.process_actions(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE,
+            process_file=tokenize_file,
+            max_workers=dcr_core.core_glob.setup.max_workers_tokenizer,
+        )
+        dcr.utils.show_statistics_total()
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
 
-    with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
-        rows = dcr.db.cls_action.Action.select_action_by_action_code(conn=conn, action_code=dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE)
+    initialise_tokenizer_spacy()
 
-        for row in rows:
-            # ------------------------------------------------------------------
-            # Processing a single document
-            # ------------------------------------------------------------------
-            dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+    for (action, document) in dcr.db.cls_action.Action.select_action_document_by_action_code(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE
+    ):
+        # ------------------------------------------------------------------
+        # Processing a single document
+        # ------------------------------------------------------------------
+        dcr.cfg.glob.start_time_document = time.perf_counter_ns()
 
-            dcr.cfg.glob.run.run_total_processed_to_be += 1
+        dcr.cfg.glob.run.run_total_processed_to_be += 1
 
-            dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_row(row)
+        dcr.cfg.glob.action_curr = action
 
-            if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
-                dcr.cfg.glob.run.total_status_error += 1
-            else:
-                dcr.cfg.glob.run.total_status_ready += 1
+        if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
+            dcr.cfg.glob.run.total_status_error += 1
+        else:
+            dcr.cfg.glob.run.total_status_ready += 1
 
-            tokenize_file()
+        dcr.cfg.glob.document = document
 
-        conn.close()
+        tokenize_file()
 
     dcr.utils.show_statistics_total()
 
@@ -119,8 +164,6 @@ def tokenize_file() -> None:
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-    dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=dcr.cfg.glob.action_curr.action_id_document)
-
     pipeline_name = dcr.db.cls_language.Language.LANGUAGES_SPACY[dcr.cfg.glob.document.document_id_language]
 
     full_name_curr = dcr.cfg.glob.action_curr.get_full_name()
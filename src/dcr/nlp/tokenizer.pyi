@@ -3,6 +3,12 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module stub file."""
+from collections.abc import Iterator
 
+import dcr.db.cls_db_core
+
+def get_token_columns() -> Iterator[dcr.db.cls_db_core.Columns]: ...
+def initialise_tokenizer_spacy() -> None: ...
+def store_tokens_in_database() -> None: ...
 def tokenize() -> None: ...
 def tokenize_file() -> None: ...
@@ -0,0 +1,190 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module dcr.pp.cls_inbox_watcher: Watching the inbox file directories."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from typing import ClassVar
+
+import dcr_core.core_glob
+
+import dcr.utils
+
+
+class InboxWatcher:
+    """Watching the inbox file directories.
+
+    On Linux the inbox file directories are watched with inotify,
+    otherwise their modification times are polled.
+
+    Returns:
+        _type_: InboxWatcher instance.
+    """
+
+    # -----------------------------------------------------------------------------
+    # Class variables.
+    # -----------------------------------------------------------------------------
+    _IN_CLOSE_WRITE: ClassVar[int] = 0x00000008
+    _IN_MOVED_TO: ClassVar[int] = 0x00000080
+
+    _POLL_INTERVAL: ClassVar[float] = 1.0
+
+    # -----------------------------------------------------------------------------
+    # Initialise the instance.
+    # -----------------------------------------------------------------------------
+    def __init__(self, directory_names: list[str]) -> None:
+        """Initialise the instance.
+
+        Args:
+            directory_names (list[str]):
+                    The inbox file directories to be watched.
+        """
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        self.watcher_directory_names = [directory_name for directory_name in directory_names if os.path.isdir(directory_name)]
+        self.watcher_fd = -1
+        self.watcher_mtimes = self._get_mtimes()
+
+        self.is_shutdown_requested = False
+
+        if sys.platform.startswith("linux"):
+            self._initialise_inotify()
+
+        if self.watcher_fd == -1:
+            dcr.utils.progress_msg("The inbox file directories are polled for new files")
+        else:
+            dcr.utils.progress_msg("The inbox file directories are watched with inotify for new files")
+
+        self._exist = True
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    # -----------------------------------------------------------------------------
+    # Determine the modification times of the watched file directories.
+    # -----------------------------------------------------------------------------
+    def _get_mtimes(self) -> dict[str, int]:
+        """Determine the modification times of the watched file directories.
+
+        Returns:
+            dict[str, int]: The modification times, keyed by file directory.
+        """
+        mtimes = {}
+
+        for directory_name in self.watcher_directory_names:
+            try:
+                mtimes[directory_name] = os.stat(directory_name).st_mtime_ns
+            except OSError:
+                mtimes[directory_name] = 0
+
+        return mtimes
+
+    # -----------------------------------------------------------------------------
+    # Initialise the watching with inotify.
+    # -----------------------------------------------------------------------------
+    def _initialise_inotify(self) -> None:
+        """Initialise the watching with inotify.
+
+        If inotify is not available, the polling fallback remains active.
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+
+            watcher_fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if watcher_fd == -1:
+                return
+
+            event_mask = InboxWatcher._IN_CLOSE_WRITE | InboxWatcher._IN_MOVED_TO
+
+            for directory_name in self.watcher_directory_names:
+                if libc.inotify_add_watch(watcher_fd, os.fsencode(directory_name), event_mask) == -1:
+                    os.close(watcher_fd)
+                    return
+        except (AttributeError, OSError) as err:
+            dcr_core.core_glob.logger.debug("inotify is not available - error: '%s'", str(err))
+            return
+
+        self.watcher_fd = watcher_fd
+
+    # -----------------------------------------------------------------------------
+    # Release the operating system resources.
+    # -----------------------------------------------------------------------------
+    def close(self) -> None:
+        """Release the operating system resources."""
+        if self.watcher_fd != -1:
+            os.close(self.watcher_fd)
+            self.watcher_fd = -1
+
+    # -----------------------------------------------------------------------------
+    # Check the object existence.
+    # -----------------------------------------------------------------------------
+    def exists(self) -> bool:
+        """Check the object existence.
+
+        Returns:
+            bool: Always true
+        """
+        return self._exist
+
+    # -----------------------------------------------------------------------------
+    # Request the shutdown of the watching - signal handler.
+    # -----------------------------------------------------------------------------
+    # noinspection PyUnusedLocal
+    def request_shutdown(self, signum: int, frame: object) -> None:  # pylint: disable=unused-argument
+        """Request the shutdown of the watching - signal handler.
+
+        The current pass is completed before the watching ends.
+
+        Args:
+            signum (int): The signal number.
+            frame (object): The current stack frame.
+        """
+        self.is_shutdown_requested = True
+
+        dcr.utils.progress_msg(f"Shutdown requested by signal {signum} - the current pass is completed first")
+
+    # -----------------------------------------------------------------------------
+    # Wait for new files in the watched file directories.
+    # -----------------------------------------------------------------------------
+    def wait(self, timeout: float) -> bool:
+        """Wait for new files in the watched file directories.
+
+        Args:
+            timeout (float): The maximum waiting time in seconds.
+
+        Returns:
+            bool: True if new files have arrived.
+        """
+        time_end = time.monotonic() + timeout
+
+        while not self.is_shutdown_requested:
+            time_slice = min(InboxWatcher._POLL_INTERVAL, time_end - time.monotonic())
+            if time_slice <= 0:
+                return False
+
+            if self.watcher_fd != -1:
+                (readable, _, _) = select.select([self.watcher_fd], [], [], time_slice)
+                if readable:
+                    # Drain the pending events, one pass processes all new files.
+                    while True:
+                        try:
+                            if not os.read(self.watcher_fd, 65536):
+                                break
+                        except BlockingIOError:
+                            break
+                    return True
+            else:
+                time.sleep(time_slice)
+
+                mtimes = self._get_mtimes()
+                if mtimes != self.watcher_mtimes:
+                    self.watcher_mtimes = mtimes
+                    return True
+
+        return False
@@ -0,0 +1,24 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module stub file."""
+from typing import ClassVar
+
+class InboxWatcher:
+    _IN_CLOSE_WRITE: ClassVar[int]
+    _IN_MOVED_TO: ClassVar[int]
+    _POLL_INTERVAL: ClassVar[float]
+
+    def __init__(self, directory_names: list[str]) -> None:
+        self._exist = None
+        self.is_shutdown_requested = None
+        self.watcher_directory_names = None
+        self.watcher_fd = None
+        self.watcher_mtimes = None
+    def _get_mtimes(self) -> dict[str, int]: ...
+    def _initialise_inotify(self) -> None: ...
+    def close(self) -> None: ...
+    def exists(self) -> bool: ...
+    def request_shutdown(self, signum: int, frame: object) -> None: ...
+    def wait(self, timeout: float) -> bool: ...
@@ -0,0 +1,150 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module dcr.pp.cls_ocr_engine_pool: Pool of long-lived Tesseract OCR engines."""
+from __future__ import annotations
+
+import os
+import queue
+import tempfile
+import threading
+
+import dcr_core.core_glob
+import PIL.Image
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+class OCREnginePool:
+    """Pool of long-lived Tesseract OCR engines.
+
+    With tesserocr, the engines run in the current process. Each engine
+    loads the traineddata of its language only once and is then reused
+    for all subsequent pages. The engines are pooled per Tesseract
+    language, so that concurrent threads each use an engine of their own.
+    Without tesserocr, or with 'ocr_engine_pool' set to false, the pool
+    holds no engines and pytesseract starts the tesseract program for
+    each image.
+
+    Returns:
+        _type_: OCREnginePool instance.
+    """
+
+    # -----------------------------------------------------------------------------
+    # Initialise the instance.
+    # -----------------------------------------------------------------------------
+    def __init__(self) -> None:
+        """Initialise the instance."""
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+        self.is_tesserocr = tesserocr is not None and dcr_core.core_glob.setup.is_ocr_engine_pool
+
+        self._engines: list[tesserocr.PyTessBaseAPI] = []
+        self._engines_idle: dict[str, queue.SimpleQueue[tesserocr.PyTessBaseAPI]] = {}
+        self._lock = threading.Lock()
+
+        self._exist = True
+
+        # dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    # -----------------------------------------------------------------------------
+    # Acquire an idle engine of a language or start a new one.
+    # -----------------------------------------------------------------------------
+    def _acquire_engine(self, language_tesseract: str) -> tesserocr.PyTessBaseAPI:
+        """Acquire an idle engine of a language or start a new one.
+
+        Args:
+            language_tesseract (str): The Tesseract name of the language.
+
+        Returns:
+            tesserocr.PyTessBaseAPI: The engine.
+        """
+        with self._lock:
+            engines_idle = self._engines_idle.setdefault(language_tesseract, queue.SimpleQueue())
+
+        try:
+            return engines_idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        engine = tesserocr.PyTessBaseAPI(lang=language_tesseract)
+        engine.SetVariable("tessedit_create_pdf", "true")
+
+        with self._lock:
+            self._engines.append(engine)
+
+        dcr_core.core_glob.logger.debug("OCR engine no. %i started for language '%s'", len(self._engines), language_tesseract)
+
+        return engine
+
+    # -----------------------------------------------------------------------------
+    # Release the operating system resources.
+    # -----------------------------------------------------------------------------
+    def close(self) -> None:
+        """Release the operating system resources."""
+        with self._lock:
+            for engine in self._engines:
+                engine.End()
+
+            self._engines = []
+            self._engines_idle = {}
+
+    # -----------------------------------------------------------------------------
+    # Check the object existence.
+    # -----------------------------------------------------------------------------
+    def exists(self) -> bool:
+        """Check the object existence.
+
+        Returns:
+            bool: Always true
+        """
+        return self._exist
+
+    # -----------------------------------------------------------------------------
+    # Convert an image to a pdf document via Tesseract OCR.
+    # -----------------------------------------------------------------------------
+    def image_to_pdf(self, image: PIL.Image.Image, language_tesseract: str) -> bytes:
+        """Convert an image to a pdf document via Tesseract OCR.
+
+        Args:
+            image (PIL.Image.Image): The image.
+            language_tesseract (str): The Tesseract name of the language.
+
+        Raises:
+            RuntimeError: If Tesseract OCR fails or exceeds the timeout.
+
+        Returns:
+            bytes: The pdf document.
+        """
+        if not self.is_tesserocr:
+            return pytesseract.image_to_pdf_or_hocr(
+                image=image,
+                extension="pdf",
+                lang=language_tesseract,
+                timeout=dcr_core.core_glob.setup.tesseract_timeout,
+            )
+
+        engine = self._acquire_engine(language_tesseract)
+
+        try:
+            with tempfile.TemporaryDirectory() as directory_name:
+                output_base = os.path.join(directory_name, "ocr")
+
+                if not engine.ProcessPage(
+                    output_base,
+                    image,
+                    0,
+                    "",
+                    timeout=dcr_core.core_glob.setup.tesseract_timeout * 1000,
+                ):
+                    raise RuntimeError(f"Tesseract OCR failed or exceeded the timeout of {dcr_core.core_glob.setup.tesseract_timeout} s")
+
+                with open(output_base + ".pdf", "rb") as file_handle:
+                    return file_handle.read()
+        finally:
+            self._engines_idle[language_tesseract].put(engine)
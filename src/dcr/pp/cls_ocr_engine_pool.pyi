@@ -0,0 +1,22 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module stub file."""
+import queue
+import threading
+
+import PIL.Image
+import tesserocr
+
+class OCREnginePool:
+    def __init__(self) -> None:
+        self._engines: list[tesserocr.PyTessBaseAPI] = []
+        self._engines_idle: dict[str, queue.SimpleQueue[tesserocr.PyTessBaseAPI]] = {}
+        self._exist = None
+        self._lock: threading.Lock = threading.Lock()
+        self.is_tesserocr = None
+    def _acquire_engine(self, language_tesseract: str) -> tesserocr.PyTessBaseAPI: ...
+    def close(self) -> None: ...
+    def exists(self) -> bool: ...
+    def image_to_pdf(self, image: PIL.Image.Image, language_tesseract: str) -> bytes: ...
@@ -10,10 +10,12 @@ depending on the result of the check. Depending on the file format, the
 accepted documents are then converted into the pdf file format either
 with the help of Pandoc and TeX Live or with the help of Tesseract OCR.
 """
+import concurrent.futures
+import itertools
 import os
 import pathlib
-import shutil
 import time
+from collections.abc import Iterator
 
 import dcr_core.core_glob
 import dcr_core.core_utils
@@ -27,6 +29,7 @@ import dcr.db.cls_document
 import dcr.db.cls_language
 import dcr.db.cls_run
 import dcr.utils
+import dcr.worker
 
 # -----------------------------------------------------------------------------
 # Class variables.
@@ -56,6 +59,79 @@ def check_and_create_directories() -> None:
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Check the text layer of a pdf document.
+# -----------------------------------------------------------------------------
+def check_text_layer(file_path: pathlib.Path) -> tuple[bool, bool]:
+    """Check the text layer of a pdf document.
+
+    The pages are checked one after the other and the check stops as soon
+    as both a page with non-whitespace text and an image-only page have
+    been found. A page without fonts in its resources has no text, so the
+    text is only extracted from pages with fonts - and from pages without
+    images only until the first page with text. With the parameter
+    'inbox_text_layer_sample_pages' only that many pages evenly spread
+    over the document are checked. In debug mode, the result of each
+    checked page is logged.
+
+    Args:
+        file_path (pathlib.Path): Inbox file.
+
+    Returns:
+        tuple[bool, bool]: Pages with text found, image-only pages found.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param file_path=%s", file_path)
+
+    is_text = False
+    is_image_only = False
+
+    file_key = dcr.utils.get_file_key(file_path)
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open(file_path) as pdf:
+        # The page count is kept, so that the file is not opened again for it.
+        dcr.cfg.glob.pdf_inspection.setdefault(file_key, (pdf.page_count, file_key[2], None))
+
+        sample_pages = dcr_core.core_glob.setup.inbox_text_layer_sample_pages
+
+        if 0 < sample_pages < pdf.page_count:
+            if sample_pages == 1:
+                page_nos: list[int] | range = [0]
+            else:
+                page_nos = sorted({round(i * (pdf.page_count - 1) / (sample_pages - 1)) for i in range(sample_pages)})
+        else:
+            page_nos = range(pdf.page_count)
+
+        for page_no in page_nos:
+            page = pdf[page_no]
+
+            is_images = bool(page.get_images())
+
+            if is_text and not is_images:
+                continue
+
+            # Both lists are read from the page resources without parsing the page content.
+            if page.get_fonts():
+                text_chars = len(page.get_text().strip())
+            else:
+                text_chars = 0
+
+            dcr_core.core_glob.logger.debug("page %i: images=%s, text characters=%i", page_no + 1, is_images, text_chars)
+
+            if text_chars:
+                is_text = True
+            elif is_images:
+                is_image_only = True
+
+            if is_text and is_image_only:
+                break
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    return is_text, is_image_only
+
+
 # -----------------------------------------------------------------------------
 # Create a new file directory if it does not already exist..
 # -----------------------------------------------------------------------------
@@ -79,6 +155,32 @@ def create_directory(directory_type: str, directory_name: str) -> None:
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Get the file name of a duplicate from the hash key index.
+# -----------------------------------------------------------------------------
+def get_duplicate_file_name(sha256: str, file_name: str) -> str:
+    """Get the file name of a duplicate from the hash key index.
+
+    A file without a duplicate is added to the index, so that duplicates
+    within the inbox are found too.
+
+    Args:
+        sha256 (str): SHA256 hash string of the file.
+        file_name (str): File name.
+
+    Returns:
+        str: The file name of the duplicate or an empty string.
+    """
+    digest = bytes.fromhex(sha256)
+
+    if digest in dcr.cfg.glob.document_sha256_index:
+        return dcr.cfg.glob.document_sha256_index[digest]
+
+    dcr.cfg.glob.document_sha256_index[digest] = file_name
+
+    return ""
+
+
 # -----------------------------------------------------------------------------
 # Initialise the next action in the database.
 # -----------------------------------------------------------------------------
@@ -130,14 +232,16 @@ def initialise_action(
 # -----------------------------------------------------------------------------
 # Initialise the base document in the database.
 # -----------------------------------------------------------------------------
-def initialise_base(file_path: pathlib.Path) -> None:
+def initialise_base(file_path: pathlib.Path, sha256: str = "") -> None:
     """Initialise the base document in the database.
 
     Args:
         file_path (pathlib.Path): File.
+        sha256 (str, optional): SHA256 hash string, if already computed. Defaults to "".
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
     dcr_core.core_glob.logger.debug("param file_path=%s", file_path)
+    dcr_core.core_glob.logger.debug("param sha256   =%s", sha256)
 
     dcr.cfg.glob.document = dcr.db.cls_document.Document(
         action_code_last=dcr.cfg.glob.run.run_action_code,
@@ -147,12 +251,26 @@ def initialise_base(file_path: pathlib.Path) -> None:
         id_run_last=dcr.cfg.glob.run.run_id,
     )
 
-    if not dcr_core.core_glob.setup.is_ignore_duplicates:
-        dcr.cfg.glob.document.document_sha256 = dcr.utils.compute_sha256(file_path)
+    if is_sha256_required():
+        dcr.cfg.glob.document.document_sha256 = sha256 if sha256 else dcr.utils.compute_sha256_cached(file_path)
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Check whether the SHA256 hash of the inbox files is required.
+# -----------------------------------------------------------------------------
+def is_sha256_required() -> bool:
+    """Check whether the SHA256 hash of the inbox files is required.
+
+    The hash is the key of both the duplicate check and the artifact cache.
+
+    Returns:
+        bool: True if duplicates are not allowed or the artifact cache is active.
+    """
+    return not dcr_core.core_glob.setup.is_ignore_duplicates or bool(dcr_core.core_glob.setup.artifact_cache_directory)
+
+
 # -----------------------------------------------------------------------------
 # Prepare a new pdf document for further processing..
 # -----------------------------------------------------------------------------
@@ -166,10 +284,10 @@ def prepare_pdf(file_path: pathlib.Path) -> None:
     dcr_core.core_glob.logger.debug("param file_path=%s", file_path)
 
     try:
-        # noinspection PyUnresolvedReferences
-        extracted_text = "".join([page.get_text() for page in fitz.open(file_path)])
+        (is_text, is_image_only) = check_text_layer(file_path)
 
-        if bool(extracted_text):
+        # Mixed documents are routed to pdf2image, where only the pages without text are converted.
+        if is_text and not is_image_only:
             action_code = dcr.db.cls_run.Run.ACTION_CODE_PDFLIB
             dcr.cfg.glob.language.total_processed_pdflib += 1
             dcr.cfg.glob.run.total_processed_pdflib += 1
@@ -212,15 +330,49 @@ def process_inbox() -> None:
     # Check the inbox file directories and create the missing ones.
     check_and_create_directories()
 
+    # Complete or roll back the file moves of an interrupted run.
+    dcr.utils.reconcile_move_journal(dcr.db.cls_action.Action.is_finalised)
+
     dcr.utils.reset_statistics_total()
 
+    if is_sha256_required():
+        dcr.utils.load_sha256_cache()
+
+    if not dcr_core.core_glob.setup.is_ignore_duplicates:
+        dcr.cfg.glob.document_sha256_index = dcr.db.cls_document.Document.select_sha256_index()
+
     with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
-        for row in dcr.db.cls_language.Language.select_active_languages(conn):
+        rows = dcr.db.cls_language.Language.select_active_languages(conn).fetchall()
+        conn.close()
+
+    if dcr_core.core_glob.setup.max_workers_inbox > 1:
+        # The pending updates and the pooled connections of the main process must not be shared with the worker processes.
+        dcr.cfg.glob.db_core.flush_dbt_updates()
+        dcr.cfg.glob.db_core.db_orm_engine.dispose()
+
+        executor: concurrent.futures.ProcessPoolExecutor | None = concurrent.futures.ProcessPoolExecutor(
+            max_workers=dcr_core.core_glob.setup.max_workers_inbox,
+            initializer=dcr.worker.initialise_worker,
+            initargs=(dcr.cfg.glob.run.run_id, False, dcr_core.core_glob.setup),
+        )
+    else:
+        executor = None
+
+    try:
+        for row in rows:
             dcr.cfg.glob.language = dcr.db.cls_language.Language.from_row(row)
             if os.path.isdir(dcr.cfg.glob.language.language_directory_name_inbox):
-                process_inbox_language()
+                process_inbox_language(executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-        conn.close()
+    # The file moves are only completed once the database records the processing of the files.
+    dcr.cfg.glob.db_core.flush_dbt_updates()
+    dcr.utils.truncate_move_journal()
+
+    if is_sha256_required():
+        dcr.utils.save_sha256_cache()
 
     dcr.utils.show_statistics_total()
 
@@ -252,13 +404,12 @@ def process_inbox_accepted(action_code: str) -> None:
         file_name=dcr.cfg.glob.document.document_file_name,
     )
 
-    if os.path.exists(full_name_next):
+    if not dcr.utils.move_file(full_name_curr, full_name_next):
         dcr.cfg.glob.action_curr.finalise_error(
             error_code=dcr.db.cls_document.Document.DOCUMENT_ERROR_CODE_REJ_FILE_DUPL,
             error_msg=ERROR_01_906.replace("{full_name}", full_name_next),
         )
     else:
-        shutil.move(full_name_curr, full_name_next)
 
         dcr.cfg.glob.action_next = initialise_action(
             action_code=action_code,
@@ -280,26 +431,30 @@ def process_inbox_accepted(action_code: str) -> None:
 # Process the next inbox file.
 # -----------------------------------------------------------------------------
 # noinspection PyArgumentList
-def process_inbox_file(file_path: pathlib.Path) -> None:
+def process_inbox_file(file_path: pathlib.Path, sha256: str = "", file_name_duplicate: str | None = None) -> None:
     """Process the next inbox file.
 
     Args:
         file_path (pathlib.Path):
                 Inbox file.
+        sha256 (str, optional):
+                SHA256 hash string, if already computed. Defaults to "".
+        file_name_duplicate (str | None, optional):
+                File name of the duplicate, if already determined. Defaults to None.
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
     dcr_core.core_glob.logger.debug("param file_path=%s", file_path)
 
     dcr.cfg.glob.session = sqlalchemy.orm.Session(dcr.cfg.glob.db_core.db_orm_engine)
 
-    initialise_base(file_path)
+    initialise_base(file_path, sha256)
 
-    if not dcr_core.core_glob.setup.is_ignore_duplicates:
-        file_name = dcr.db.cls_document.Document.select_duplicate_file_name_by_sha256(
-            dcr.cfg.glob.document.document_id, dcr.cfg.glob.document.document_sha256
-        )
-    else:
+    if dcr_core.core_glob.setup.is_ignore_duplicates:
         file_name = None
+    elif file_name_duplicate is not None:
+        file_name = file_name_duplicate
+    else:
+        file_name = get_duplicate_file_name(dcr.cfg.glob.document.document_sha256, dcr.cfg.glob.document.document_file_name)
 
     if not (file_name is None or file_name == ""):
         process_inbox_rejected(
@@ -325,10 +480,62 @@ def process_inbox_file(file_path: pathlib.Path) -> None:
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Process a chunk of inbox files in worker processes.
+# -----------------------------------------------------------------------------
+def process_inbox_files(executor: concurrent.futures.ProcessPoolExecutor, files: list[pathlib.Path]) -> None:
+    """Process a chunk of inbox files in worker processes.
+
+    The files are hashed concurrently in threads of the main process and
+    checked against the hash key index there, so that duplicates are
+    detected in the order of the files. Classifying and moving the files
+    is done in the worker processes, whose counters are then added to the
+    current language and the current run. A failed inbox file is counted
+    as erroneous.
+
+    Args:
+        executor (concurrent.futures.ProcessPoolExecutor): The worker processes.
+        files (list[pathlib.Path]): The inbox files.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param files=%i", len(files))
+
+    tasks: list[tuple[pathlib.Path, str, str | None]]
+
+    if not is_sha256_required():
+        tasks = [(file, "", None) for file in files]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=dcr_core.core_glob.setup.max_workers_inbox) as hasher:
+            tasks = [
+                (file, sha256, None if dcr_core.core_glob.setup.is_ignore_duplicates else get_duplicate_file_name(sha256, file.name))
+                for (file, sha256) in zip(files, hasher.map(dcr.utils.compute_sha256_cached, files))
+            ]
+
+    futures = [
+        executor.submit(
+            dcr.worker.process_inbox_file,
+            process_inbox_file,
+            dcr.cfg.glob.language.language_id,
+            str(file),
+            sha256,
+            file_name_duplicate,
+        )
+        for (file, sha256, file_name_duplicate) in tasks
+    ]
+
+    for future in concurrent.futures.as_completed(futures):
+        (counters_language, counters_run) = dcr.worker.get_counters(future, dcr.worker.INBOX_COUNTERS_ERROR)
+
+        dcr.worker.add_counters(dcr.cfg.glob.language, counters_language)
+        dcr.worker.add_counters(dcr.cfg.glob.run, counters_run)
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Process the inbox directory (step: p_i).
 # -----------------------------------------------------------------------------
-def process_inbox_language() -> None:
+def process_inbox_language(executor: concurrent.futures.ProcessPoolExecutor | None = None) -> None:
     """Process the files found in the inbox file directory.
 
     1. Documents of type docx are converted to pdf format
@@ -338,23 +545,46 @@ def process_inbox_language() -> None:
     3. Documents of type pdf consisting only of a scanned image are copied
        unchanged to the inbox_ocr directory.
     4. All other documents are copied to the inbox_rejected directory.
+
+    Args:
+        executor (concurrent.futures.ProcessPoolExecutor | None, optional):
+                The worker processes, None if the files are processed in
+                the main process. Defaults to None.
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
     dcr.utils.progress_msg(f"Start of processing for language '{dcr.cfg.glob.language.language_iso_language_name}'")
 
-    for file in sorted(dcr.utils.get_path_name(dcr.cfg.glob.language.language_directory_name_inbox).iterdir()):
-        if file.is_file():
-            dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+    files: list[pathlib.Path] = []
 
-            if file.name == "README.md":
-                dcr.utils.progress_msg("Attention: All files with the file name 'README.md' are ignored")
-                continue
+    for file in scan_inbox_directory(dcr.cfg.glob.language.language_directory_name_inbox):
+        dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+
+        if file.name == "README.md":
+            dcr.utils.progress_msg("Attention: All files with the file name 'README.md' are ignored")
+            continue
 
-            dcr.cfg.glob.language.total_processed_to_be += 1
-            dcr.cfg.glob.run.run_total_processed_to_be += 1
+        if 0 < dcr_core.core_glob.setup.inbox_files_max <= dcr.cfg.glob.run.run_total_processed_to_be:
+            dcr.utils.progress_msg(
+                f"Attention: The maximum number of inbox files per run ({dcr_core.core_glob.setup.inbox_files_max}) is reached"
+            )
+            break
 
+        dcr.cfg.glob.language.total_processed_to_be += 1
+        dcr.cfg.glob.run.run_total_processed_to_be += 1
+
+        if executor is None:
             process_inbox_file(file_path=file)
+            continue
+
+        files.append(file)
+
+        if len(files) >= dcr_core.core_glob.setup.inbox_scan_chunk_size:
+            process_inbox_files(executor, files)
+            files = []
+
+    if files and executor is not None:
+        process_inbox_files(executor, files)
 
     dcr.utils.show_statistics_language()
 
@@ -394,13 +624,12 @@ def process_inbox_rejected(error_code: str, error_msg: str) -> None:
     )
 
     # Move the document file from directory inbox to directory inbox_rejected - if not yet existing
-    if os.path.exists(full_name_next):
+    if not dcr.utils.move_file(full_name_curr, full_name_next):
         dcr.cfg.glob.action_curr.finalise_error(
             error_code=dcr.db.cls_document.Document.DOCUMENT_ERROR_CODE_REJ_FILE_DUPL,
             error_msg=ERROR_01_906.replace("{full_name}", full_name_next),
         )
     else:
-        shutil.move(full_name_curr, full_name_next)
 
         dcr.cfg.glob.action_curr.finalise_error(
             error_code=error_code,
@@ -411,3 +640,38 @@ def process_inbox_rejected(error_code: str, error_msg: str) -> None:
     dcr.cfg.glob.run.run_total_erroneous += 1
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Scan an inbox file directory.
+# -----------------------------------------------------------------------------
+def scan_inbox_directory(directory_name: str) -> Iterator[pathlib.Path]:
+    """Scan an inbox file directory.
+
+    The directory entries are read with os.scandir in chunks of
+    'inbox_scan_chunk_size' entries, and each chunk is sorted by file name
+    before its files are yielded. The files are thus processed in file
+    system order within bounded chunks - there is no order across the
+    chunks, unless the directory has at most 'inbox_scan_chunk_size'
+    entries. The file type is taken from the cached directory entry, so
+    that the processing starts immediately and the memory consumption
+    does not depend on the number of files.
+
+    Args:
+        directory_name (str): Inbox file directory.
+
+    Yields:
+        Iterator[pathlib.Path]: The files found.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param directory_name=%s", directory_name)
+
+    chunk_size = max(1, dcr_core.core_glob.setup.inbox_scan_chunk_size)
+
+    with os.scandir(directory_name) as entries:
+        while chunk := list(itertools.islice(entries, chunk_size)):
+            for entry in sorted(chunk, key=lambda entry: entry.name):
+                if entry.is_file():
+                    yield pathlib.Path(entry.path)
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
@@ -3,12 +3,16 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module stub file."""
+import concurrent.futures
 import pathlib
+from collections.abc import Iterator
 
 import dcr.db.cls_action
 
 def check_and_create_directories() -> None: ...
+def check_text_layer(file_path: pathlib.Path) -> tuple[bool, bool]: ...
 def create_directory(directory_type: str, directory_name: str) -> None: ...
+def get_duplicate_file_name(sha256: str, file_name: str) -> str: ...
 def initialise_action(
     action_code: str = ...,
     directory_name: str = ...,
@@ -16,10 +20,13 @@ def initialise_action(
     file_name: str = ...,
     id_parent: int = ...,
 ) -> dcr.db.cls_action.Action: ...
-def initialise_base(file_path: pathlib.Path) -> None: ...
+def initialise_base(file_path: pathlib.Path, sha256: str = ...) -> None: ...
+def is_sha256_required() -> bool: ...
 def prepare_pdf(file: pathlib.Path) -> None: ...
 def process_inbox() -> None: ...
 def process_inbox_accepted(next_step: str) -> None: ...
-def process_inbox_file(file_path: pathlib.Path) -> None: ...
-def process_inbox_language() -> None: ...
+def process_inbox_file(file_path: pathlib.Path, sha256: str = ..., file_name_duplicate: str | None = ...) -> None: ...
+def process_inbox_files(executor: concurrent.futures.ProcessPoolExecutor, files: list[pathlib.Path]) -> None: ...
+def process_inbox_language(executor: concurrent.futures.ProcessPoolExecutor | None = ...) -> None: ...
 def process_inbox_rejected(error_code: str, error: str) -> None: ...
+def scan_inbox_directory(directory_name: str) -> Iterator[pathlib.Path]: ...
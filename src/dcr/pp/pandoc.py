@@ -16,6 +16,7 @@ import dcr.db.cls_document
 import dcr.db.cls_language
 import dcr.db.cls_run
 import dcr.utils
+import dcr.worker
 
 # -----------------------------------------------------------------------------
 # Global variables.
@@ -33,26 +34,33 @@ def convert_non_pdf_2_pdf() -> None:
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-    with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
-        rows = dcr.db.cls_action.Action.select_action_by_action_code(conn=conn, action_code=dcr.db.cls_run.Run.ACTION_CODE_PANDOC)
-
-        for row in rows:
-            dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+    if dcr_core.core_glob.setup.max_workers_pandoc > 1:
+        dcr.worker.process_actions(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_PANDOC,
+            process_file=convert_non_pdf_2_pdf_file,
+            max_workers=dcr_core.core_glob.setup.max_workers_pandoc,
+        )
+        dcr.utils.show_statistics_total()
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
 
-            dcr.cfg.glob.run.run_total_processed_to_be += 1
+    for (action, document) in dcr.db.cls_action.Action.select_action_document_by_action_code(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_PANDOC
+    ):
+        dcr.cfg.glob.start_time_document = time.perf_counter_ns()
 
-            dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_row(row)
+        dcr.cfg.glob.run.run_total_processed_to_be += 1
 
-            if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
-                dcr.cfg.glob.run.total_status_error += 1
-            else:
-                dcr.cfg.glob.run.total_status_ready += 1
+        dcr.cfg.glob.action_curr = action
 
-            dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=dcr.cfg.glob.action_curr.action_id_document)
+        if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
+            dcr.cfg.glob.run.total_status_error += 1
+        else:
+            dcr.cfg.glob.run.total_status_ready += 1
 
-            convert_non_pdf_2_pdf_file()
+        dcr.cfg.glob.document = document
 
-        conn.close()
+        convert_non_pdf_2_pdf_file()
 
     dcr.utils.show_statistics_total()
 
@@ -3,6 +3,8 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module pp.pdf2image: Convert scanned image pdf documents to image files."""
+import concurrent.futures
+import itertools
 import os
 import time
 
@@ -10,13 +12,41 @@ import dcr_core.cls_process
 import dcr_core.cls_setup
 import dcr_core.core_glob
 import dcr_core.core_utils
+import fitz
+import numpy
+import pdf2image
+import PIL.Image
+from pdf2image.exceptions import PDFInfoNotInstalledError
+from pdf2image.exceptions import PDFPageCountError
+from pdf2image.exceptions import PDFPopplerTimeoutError
+from pdf2image.exceptions import PDFSyntaxError
 
+import dcr.artifact_cache
 import dcr.cfg.cls_setup
 import dcr.cfg.glob
 import dcr.db.cls_action
 import dcr.db.cls_document
+import dcr.db.cls_language
 import dcr.db.cls_run
+import dcr.pp.preprocessing
+import dcr.pp.tesseract
 import dcr.utils
+import dcr.worker
+
+# -----------------------------------------------------------------------------
+# Global variables.
+# -----------------------------------------------------------------------------
+ERROR_21_903 = "21.903 Issue (p_2_i): The target file '{full_name}' already exists."
+
+# Blank page detection: grey level of a dark pixel, dark pixels of an inked
+# block of 8 x 8 pixels and the ignored page margins in percent.
+BLANK_PAGE_BLOCK_SIZE = 8
+BLANK_PAGE_DARK_PIXELS_MIN = 6
+BLANK_PAGE_GREY_LEVEL_MAX = 127
+BLANK_PAGE_MARGIN_PERCENT = 5
+
+# The errors of pdf2image and poppler that reject the current document.
+PDF2IMAGE_ERRORS = (OSError, PDFInfoNotInstalledError, PDFPageCountError, PDFPopplerTimeoutError, PDFSyntaxError)
 
 
 # -----------------------------------------------------------------------------
@@ -29,32 +59,84 @@ def convert_pdf_2_image() -> None:
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-    with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
-        rows = dcr.db.cls_action.Action.select_action_by_action_code(conn=conn, action_code=dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE)
+    if dcr_core.core_glob.setup.max_workers_pdf2image > 1:
+        dcr.worker.process_actions(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE,
+            process_file=convert_pdf_2_image_file,
+            max_workers=dcr_core.core_glob.setup.max_workers_pdf2image,
+        )
+        dcr.utils.show_statistics_total()
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
 
-        for row in rows:
-            dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+    for (action, document) in dcr.db.cls_action.Action.select_action_document_by_action_code(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE
+    ):
+        dcr.cfg.glob.start_time_document = time.perf_counter_ns()
 
-            dcr.cfg.glob.run.run_total_processed_to_be += 1
+        dcr.cfg.glob.run.run_total_processed_to_be += 1
 
-            dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_row(row)
+        dcr.cfg.glob.action_curr = action
 
-            if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
-                dcr.cfg.glob.run.total_status_error += 1
-            else:
-                dcr.cfg.glob.run.total_status_ready += 1
+        if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
+            dcr.cfg.glob.run.total_status_error += 1
+        else:
+            dcr.cfg.glob.run.total_status_ready += 1
 
-            dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=dcr.cfg.glob.action_curr.action_id_document)
+        dcr.cfg.glob.document = document
 
-            convert_pdf_2_image_file()
+        convert_pdf_2_image_file()
 
-        conn.close()
+    dcr.pp.tesseract.close_ocr_engine_pool()
 
     dcr.utils.show_statistics_total()
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Convert a page range of a scanned image pdf document to image files.
+# -----------------------------------------------------------------------------
+def convert_pdf_2_image_chunk(full_name_in: str, first_page: int, last_page: int) -> list[tuple[str, str]]:
+    """Convert a page range of a scanned image pdf document to image files.
+
+    The image files are named like those of
+    dcr_core.cls_process.Process.pdf2image(), i.e. with the page number
+    as suffix.
+
+    Args:
+        full_name_in (str): The scanned image pdf document.
+        first_page (int): The first page of the page range.
+        last_page (int): The last page of the page range.
+
+    Returns:
+        list[tuple[str, str]]: File name and full file name of the image files.
+    """
+    directory_name = os.path.dirname(full_name_in)
+    stem_name = os.path.splitext(os.path.basename(full_name_in))[0]
+
+    file_type = (
+        dcr_core.core_glob.FILE_TYPE_PNG
+        if dcr_core.core_glob.setup.pdf2image_type == dcr_core.cls_setup.Setup.PDF2IMAGE_TYPE_PNG
+        else dcr_core.core_glob.FILE_TYPE_JPEG
+    )
+
+    children: list[tuple[str, str]] = []
+
+    for (page_no, img) in enumerate(
+        pdf2image.convert_from_path(full_name_in, first_page=first_page, last_page=last_page),
+        start=first_page,
+    ):
+        file_name_next = stem_name + "_" + str(page_no) + "." + file_type
+        full_name_next = dcr_core.core_utils.get_full_name_from_components(directory_name, file_name_next)
+
+        img.save(full_name_next, dcr_core.core_glob.setup.pdf2image_type)
+
+        children.append((file_name_next, full_name_next))
+
+    return children
+
+
 # -----------------------------------------------------------------------------
 # Convert a scanned image pdf document to an image file (step: p_2_i).
 # -----------------------------------------------------------------------------
@@ -78,14 +160,111 @@ def convert_pdf_2_image_file() -> None:
         )
     )
 
-    (error_code, error_msg, children) = dcr_core.cls_process.Process.pdf2image(
-        full_name_in=full_name_curr,
+    # An identical document has already been converted by Tesseract OCR.
+    file_name_ocr = dcr.cfg.glob.action_curr.get_stem_name() + "_0." + dcr_core.core_glob.FILE_TYPE_PDF
+    full_name_ocr = dcr_core.core_utils.get_full_name_from_components(
+        dcr.cfg.glob.action_curr.action_directory_name,
+        file_name_ocr,
     )
+
+    if not os.path.exists(full_name_ocr) and dcr.artifact_cache.restore_artifact(dcr.pp.tesseract.get_artifact_key_ocr(), full_name_ocr):
+        text_pages = dcr.utils.get_pdf_text_pages(full_name_curr)
+
+        # The pages converted by Tesseract OCR are the image-only pages that are not blank.
+        # noinspection PyUnresolvedReferences
+        with fitz.open(full_name_ocr) as pdf_ocr:
+            dcr.cfg.glob.action_curr.action_no_children = len(
+                [page for (page, is_text) in zip(pdf_ocr, text_pages) if not is_text and page.get_images()]
+            )
+
+        # As with the conversion in memory, the ocr action is recorded as finished.
+        action_ocr = dcr.db.cls_action.Action(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_TESSERACT,
+            id_run_last=dcr.cfg.glob.run.run_id,
+            directory_name=dcr.cfg.glob.action_curr.action_directory_name,
+            directory_type=dcr.cfg.glob.action_curr.action_directory_type,
+            file_name=file_name_next,
+            id_document=dcr.cfg.glob.action_curr.action_id_document,
+            id_parent=dcr.cfg.glob.action_curr.action_id,
+            no_children=dcr.cfg.glob.action_curr.action_no_children,
+            no_pdf_pages=dcr.cfg.glob.action_curr.action_no_children,
+            status=dcr.db.cls_document.Document.DOCUMENT_STATUS_END,
+        )
+
+        dcr.cfg.glob.action_next = dcr.db.cls_action.Action(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_PDFLIB,
+            id_run_last=dcr.cfg.glob.run.run_id,
+            directory_name=dcr.cfg.glob.action_curr.action_directory_name,
+            directory_type=dcr.cfg.glob.action_curr.action_directory_type,
+            file_name=file_name_ocr,
+            file_size_bytes=os.path.getsize(full_name_ocr),
+            id_document=dcr.cfg.glob.action_curr.action_id_document,
+            id_parent=action_ocr.action_id,
+            no_pdf_pages=len(text_pages),
+        )
+
+        dcr.cfg.glob.run.total_generated += dcr.cfg.glob.action_curr.action_no_children
+
+        dcr.utils.delete_auxiliary_file(full_name_curr)
+
+        dcr.cfg.glob.action_curr.finalise()
+
+        dcr.cfg.glob.run.run_total_processed_ok += 1
+
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
+    # The pages with text are not converted by Tesseract OCR, but taken over unchanged from the pdf document.
+    text_pages = dcr.utils.get_pdf_text_pages(full_name_curr)
+
+    if dcr_core.core_glob.setup.is_pdf2image_in_memory and not all(text_pages):
+        convert_pdf_2_pdf_in_memory(full_name_curr, file_name_next, text_pages)
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
+    pages_no = dcr.utils.get_pdf_pages_no(full_name_curr)
+
+    if 0 < dcr_core.core_glob.setup.pdf2image_chunk_size < pages_no:
+        (error_code, error_msg, children) = convert_pdf_2_image_pages(full_name_curr, pages_no)
+    else:
+        (error_code, error_msg, children) = dcr_core.cls_process.Process.pdf2image(
+            full_name_in=full_name_curr,
+        )
     if error_code != dcr_core.core_glob.RETURN_OK[0]:
         dcr.cfg.glob.action_curr.finalise_error(error_code, error_msg)
         dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
         return
 
+    if any(text_pages) and len(text_pages) == len(children):
+        for ((_, full_name_next), is_text) in zip(children, text_pages):
+            if is_text:
+                os.remove(full_name_next)
+
+        children = [child for (child, is_text) in zip(children, text_pages) if not is_text]
+
+    # Blank pages are not converted by Tesseract OCR either.
+    children = remove_blank_pages(children)
+
+    if not children:
+        dcr.cfg.glob.action_next = dcr.db.cls_action.Action(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_PDFLIB,
+            id_run_last=dcr.cfg.glob.run.run_id,
+            directory_name=dcr.cfg.glob.action_curr.action_directory_name,
+            directory_type=dcr.cfg.glob.action_curr.action_directory_type,
+            file_name=dcr.cfg.glob.action_curr.action_file_name,
+            file_size_bytes=dcr.cfg.glob.action_curr.action_file_size_bytes,
+            id_document=dcr.cfg.glob.action_curr.action_id_document,
+            id_parent=dcr.cfg.glob.action_curr.action_id,
+            no_pdf_pages=len(text_pages),
+        )
+
+        dcr.cfg.glob.action_curr.finalise()
+
+        dcr.cfg.glob.run.run_total_processed_ok += 1
+
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
     file_size_bytes = 0
 
     for (_, full_name_next) in children:
@@ -115,3 +294,306 @@ def convert_pdf_2_image_file() -> None:
     dcr.cfg.glob.run.run_total_processed_ok += 1
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Convert a scanned image pdf document to image files in parallel page ranges.
+# -----------------------------------------------------------------------------
+def convert_pdf_2_image_pages(full_name_in: str, pages_no: int) -> tuple[str, str, list[tuple[str, str]]]:
+    """Convert a scanned image pdf document to image files in parallel page ranges.
+
+    The document is split into page ranges of 'pdf2image_chunk_size'
+    pages, which are rendered by pdf2image in parallel threads. The
+    rendering itself takes place in separate poppler processes, so that
+    the threads use all CPUs. The image files are returned in page order.
+
+    Args:
+        full_name_in (str): The scanned image pdf document.
+        pages_no (int): The number of pages of the pdf document.
+
+    Returns:
+        tuple[str, str, list[tuple[str, str]]]:
+                ("ok", "", [...]) if the processing has been completed successfully,
+                                  otherwise a corresponding error code and error message.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param full_name_in=%s", full_name_in)
+    dcr_core.core_glob.logger.debug("param pages_no    =%i", pages_no)
+
+    first_pages = range(1, pages_no + 1, dcr_core.core_glob.setup.pdf2image_chunk_size)
+    last_pages = [min(first_page + dcr_core.core_glob.setup.pdf2image_chunk_size - 1, pages_no) for first_page in first_pages]
+
+    children: list[tuple[str, str]] = []
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(get_max_workers_pages(), len(first_pages))) as executor:
+            for chunk_children in executor.map(convert_pdf_2_image_chunk, itertools.repeat(full_name_in), first_pages, last_pages):
+                children.extend(chunk_children)
+    except PDF2IMAGE_ERRORS as err:
+        error_msg = (
+            dcr_core.cls_process.Process.ERROR_21_901.replace("{full_name}", full_name_in)
+            .replace("{error_type}", str(type(err)))
+            .replace("{error_msg}", str(err))
+        )
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return error_msg[:6], error_msg, []
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    return dcr_core.core_glob.RETURN_OK[0], dcr_core.core_glob.RETURN_OK[1], children
+
+
+# -----------------------------------------------------------------------------
+# Convert a scanned image pdf document via Tesseract OCR in memory (step: p_2_i).
+# -----------------------------------------------------------------------------
+# noinspection PyArgumentList
+def convert_pdf_2_pdf_in_memory(full_name_curr: str, file_name_images: str, text_pages: list[bool]) -> None:
+    """Convert a scanned image pdf document via Tesseract OCR in memory.
+
+    The pages without text are rendered by pdf2image and passed as
+    bitmaps straight to Tesseract OCR, i.e. without image files in the
+    document directory. The pages with text are taken over unchanged.
+    For traceability, the action of the process step ocr is recorded
+    as completed, together with the processing times of the image
+    preprocessing.
+
+    Args:
+        full_name_curr (str): The scanned image pdf document.
+        file_name_images (str): The file name pattern of the image files of the process step ocr.
+        text_pages (list[bool]): Per page, whether the page has a text layer.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param full_name_curr  =%s", full_name_curr)
+    dcr_core.core_glob.logger.debug("param file_name_images=%s", file_name_images)
+
+    file_name_next = dcr.cfg.glob.action_curr.get_stem_name() + "_0." + dcr_core.core_glob.FILE_TYPE_PDF
+    full_name_next = dcr_core.core_utils.get_full_name_from_components(
+        dcr.cfg.glob.action_curr.action_directory_name,
+        file_name_next,
+    )
+
+    if os.path.exists(full_name_next):
+        dcr.cfg.glob.action_curr.finalise_error(
+            error_code=dcr.db.cls_document.Document.DOCUMENT_ERROR_CODE_REJ_FILE_DUPL,
+            error_msg=ERROR_21_903.replace("{full_name}", full_name_next),
+        )
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
+    page_nos = [page_no for (page_no, is_text) in enumerate(text_pages, start=1) if not is_text]
+
+    # The pool is created before the threads share it.
+    dcr.pp.tesseract.get_ocr_engine_pool()
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(get_max_workers_pages(), len(page_nos))) as executor:
+            pages_ocr = list(
+                executor.map(
+                    convert_pdf_page_2_pdf,
+                    itertools.repeat(full_name_curr),
+                    page_nos,
+                    itertools.repeat(dcr.db.cls_language.Language.LANGUAGES_TESSERACT[dcr.cfg.glob.document.document_id_language]),
+                )
+            )
+    except PDF2IMAGE_ERRORS as err:
+        error_msg = (
+            dcr_core.cls_process.Process.ERROR_21_901.replace("{full_name}", full_name_curr)
+            .replace("{error_type}", str(type(err)))
+            .replace("{error_msg}", str(err))
+        )
+        dcr.cfg.glob.action_curr.finalise_error(error_msg[:6], error_msg)
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+    except RuntimeError as err:
+        error_msg = dcr_core.cls_process.Process.ERROR_41_901.replace("{full_name}", full_name_curr).replace("{error_msg}", str(err))
+        dcr.cfg.glob.action_curr.finalise_error(error_msg[:6], error_msg)
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
+    pdfs_ocr = [pdf_bytes for (pdf_bytes, _) in pages_ocr]
+
+    preprocessing_ns: dict[str, int] = {}
+
+    for (_, preprocessing_ns_page) in pages_ocr:
+        dcr.pp.preprocessing.add_preprocessing_ns(preprocessing_ns, preprocessing_ns_page)
+
+    pdfs_ocr_iter = iter(pdfs_ocr)
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open(full_name_curr) as pdf_base, fitz.open() as pdf_merged:
+        for (page_no, is_text) in enumerate(text_pages):
+            if is_text:
+                pdf_merged.insert_pdf(pdf_base, from_page=page_no, to_page=page_no)
+            else:
+                pdf_bytes = next(pdfs_ocr_iter)
+
+                if pdf_bytes:
+                    # noinspection PyUnresolvedReferences
+                    with fitz.open("pdf", pdf_bytes) as pdf_ocr:
+                        pdf_merged.insert_pdf(pdf_ocr)
+                else:
+                    # A blank page is recorded as an empty page.
+                    pdf_merged.new_page(width=pdf_base[page_no].rect.width, height=pdf_base[page_no].rect.height)
+
+        pdf_merged.save(full_name_next)
+
+    dcr.artifact_cache.store_artifact(dcr.pp.tesseract.get_artifact_key_ocr(), full_name_next)
+
+    dcr.cfg.glob.action_curr.action_no_children = len([pdf_bytes for pdf_bytes in pdfs_ocr if pdf_bytes])
+
+    action_ocr = dcr.db.cls_action.Action(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_TESSERACT,
+        id_run_last=dcr.cfg.glob.run.run_id,
+        directory_name=dcr.cfg.glob.action_curr.action_directory_name,
+        directory_type=dcr.cfg.glob.action_curr.action_directory_type,
+        file_name=file_name_images,
+        id_document=dcr.cfg.glob.action_curr.action_id_document,
+        id_parent=dcr.cfg.glob.action_curr.action_id,
+        no_children=dcr.cfg.glob.action_curr.action_no_children,
+        no_pdf_pages=dcr.cfg.glob.action_curr.action_no_children,
+        preprocessing_ns=preprocessing_ns,
+        status=dcr.db.cls_document.Document.DOCUMENT_STATUS_END,
+    )
+
+    dcr.cfg.glob.action_next = dcr.db.cls_action.Action(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_PDFLIB,
+        id_run_last=dcr.cfg.glob.run.run_id,
+        directory_name=dcr.cfg.glob.action_curr.action_directory_name,
+        directory_type=dcr.cfg.glob.action_curr.action_directory_type,
+        file_name=file_name_next,
+        file_size_bytes=os.path.getsize(full_name_next),
+        id_document=dcr.cfg.glob.action_curr.action_id_document,
+        id_parent=action_ocr.action_id,
+        no_pdf_pages=len(text_pages),
+    )
+
+    dcr.cfg.glob.run.total_generated += dcr.cfg.glob.action_curr.action_no_children
+
+    dcr.utils.delete_auxiliary_file(full_name_curr)
+
+    dcr.cfg.glob.action_curr.finalise()
+
+    dcr.cfg.glob.run.run_total_processed_ok += 1
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Convert a page of a scanned image pdf document via Tesseract OCR in memory.
+# -----------------------------------------------------------------------------
+def convert_pdf_page_2_pdf(full_name_in: str, page_no: int, language_tesseract: str) -> tuple[bytes, dict[str, int]]:
+    """Convert a page of a scanned image pdf document via Tesseract OCR in memory.
+
+    pdf2image receives the rendered page from poppler through a pipe and
+    the bitmap is handed over, after the configured image preprocessing,
+    to a pooled Tesseract OCR engine. Only a single page bitmap per
+    thread is kept in memory.
+
+    Args:
+        full_name_in (str): The scanned image pdf document.
+        page_no (int): The page number, starting with 1.
+        language_tesseract (str): The Tesseract name of the document language.
+
+    Returns:
+        tuple[bytes, dict[str, int]]:
+                The pdf document created by Tesseract OCR, empty for a blank page,
+                and the processing time per preprocessing step in nanoseconds.
+    """
+    (img,) = pdf2image.convert_from_path(full_name_in, first_page=page_no, last_page=page_no)
+
+    if is_blank_page(img):
+        dcr_core.core_glob.logger.debug("Blank page %i of '%s' skipped by OCR", page_no, full_name_in)
+        return b"", {}
+
+    (img, preprocessing_ns) = dcr.pp.preprocessing.preprocess_image(img)
+
+    return dcr.pp.tesseract.get_ocr_engine_pool().image_to_pdf(img, language_tesseract), preprocessing_ns
+
+
+# -----------------------------------------------------------------------------
+# Determine the maximum number of threads rendering the pages of a document.
+# -----------------------------------------------------------------------------
+def get_max_workers_pages() -> int:
+    """Determine the maximum number of threads rendering the pages of a document.
+
+    Returns:
+        int: The maximum number of threads.
+    """
+    if dcr_core.core_glob.setup.pdf2image_chunk_workers > 0:
+        return dcr_core.core_glob.setup.pdf2image_chunk_workers
+
+    # The worker processes of the process step share the CPUs.
+    return max(1, (os.cpu_count() or 1) // max(1, dcr_core.core_glob.setup.max_workers_pdf2image))
+
+
+# -----------------------------------------------------------------------------
+# Check whether a rendered page has a negligible ink coverage.
+# -----------------------------------------------------------------------------
+def is_blank_page(image: PIL.Image.Image) -> bool:
+    """Check whether a rendered page has a negligible ink coverage.
+
+    The page margins, where scanners often leave shadows, are ignored.
+    The remaining area is divided into blocks of 8 x 8 pixels, and a
+    block counts as inked if it contains several dark pixels, so that
+    isolated specks of dust do not count. A page is blank if the inked
+    blocks cover at most 'ocr_blank_page_ink_limit' / 10000 of the area.
+
+    Args:
+        image (PIL.Image.Image): The rendered page.
+
+    Returns:
+        bool: True if the page is blank.
+    """
+    if dcr_core.core_glob.setup.ocr_blank_page_ink_limit <= 0:
+        return False
+
+    pixels = numpy.asarray(image.convert("L"))
+
+    (height, width) = pixels.shape
+    margin_y = height * BLANK_PAGE_MARGIN_PERCENT // 100
+    margin_x = width * BLANK_PAGE_MARGIN_PERCENT // 100
+
+    pixels = pixels[margin_y : height - margin_y, margin_x : width - margin_x]
+
+    blocks_y = pixels.shape[0] // BLANK_PAGE_BLOCK_SIZE
+    blocks_x = pixels.shape[1] // BLANK_PAGE_BLOCK_SIZE
+    if blocks_y == 0 or blocks_x == 0:
+        return False
+
+    dark_pixels = pixels[: blocks_y * BLANK_PAGE_BLOCK_SIZE, : blocks_x * BLANK_PAGE_BLOCK_SIZE] <= BLANK_PAGE_GREY_LEVEL_MAX
+
+    dark_pixels_per_block = dark_pixels.reshape(blocks_y, BLANK_PAGE_BLOCK_SIZE, blocks_x, BLANK_PAGE_BLOCK_SIZE).sum(axis=(1, 3))
+
+    inked_blocks = dark_pixels_per_block >= BLANK_PAGE_DARK_PIXELS_MIN
+
+    return int(numpy.count_nonzero(inked_blocks)) * 10000 <= dcr_core.core_glob.setup.ocr_blank_page_ink_limit * inked_blocks.size
+
+
+# -----------------------------------------------------------------------------
+# Remove the image files of blank pages.
+# -----------------------------------------------------------------------------
+def remove_blank_pages(children: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Remove the image files of blank pages.
+
+    Args:
+        children (list[tuple[str, str]]): File name and full file name of the image files.
+
+    Returns:
+        list[tuple[str, str]]: The image files of the pages that are not blank.
+    """
+    if dcr_core.core_glob.setup.ocr_blank_page_ink_limit <= 0:
+        return children
+
+    children_inked: list[tuple[str, str]] = []
+
+    for (file_name, full_name) in children:
+        with PIL.Image.open(full_name) as image:
+            is_blank = is_blank_page(image)
+
+        if is_blank:
+            os.remove(full_name)
+            dcr_core.core_glob.logger.debug("Blank page '%s' skipped by OCR", file_name)
+        else:
+            children_inked.append((file_name, full_name))
+
+    return children_inked
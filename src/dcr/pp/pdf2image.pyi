@@ -3,6 +3,14 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module stub file."""
+import PIL.Image
 
 def convert_pdf_2_image() -> None: ...
+def convert_pdf_2_image_chunk(full_name_in: str, first_page: int, last_page: int) -> list[tuple[str, str]]: ...
 def convert_pdf_2_image_file() -> None: ...
+def convert_pdf_2_image_pages(full_name_in: str, pages_no: int) -> tuple[str, str, list[tuple[str, str]]]: ...
+def convert_pdf_2_pdf_in_memory(full_name_curr: str, file_name_images: str, text_pages: list[bool]) -> None: ...
+def convert_pdf_page_2_pdf(full_name_in: str, page_no: int, language_tesseract: str) -> tuple[bytes, dict[str, int]]: ...
+def get_max_workers_pages() -> int: ...
+def is_blank_page(image: PIL.Image.Image) -> bool: ...
+def remove_blank_pages(children: list[tuple[str, str]]) -> list[tuple[str, str]]: ...
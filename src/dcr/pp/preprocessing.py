@@ -0,0 +1,247 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module pp.preprocessing: Prepare the page images for Tesseract OCR.
+
+The configured steps of 'ocr_preprocessing' are always executed in the
+order grayscale, downscale, deskew and binarise, so that each step
+processes as few bytes as possible. Smaller and cleaner bitmaps make
+Tesseract OCR faster and more accurate.
+"""
+import time
+
+import dcr_core.core_glob
+import numpy
+import PIL.Image
+
+import dcr.cfg.cls_setup
+
+# -----------------------------------------------------------------------------
+# Global variables.
+# -----------------------------------------------------------------------------
+# Deskew: searched skew angles in degrees and the image width used for the search.
+DESKEW_ANGLE_MAX = 5.0
+DESKEW_ANGLE_STEP = 0.25
+DESKEW_WIDTH = 1000
+
+# The resolution of pdf2image if the image contains no dpi information.
+DPI_DEFAULT = 200
+
+STEPS = (
+    dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_GRAYSCALE,
+    dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_DOWNSCALE,
+    dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_DESKEW,
+    dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_BINARISE,
+)
+
+
+# -----------------------------------------------------------------------------
+# Add the processing times of the preprocessing steps.
+# -----------------------------------------------------------------------------
+def add_preprocessing_ns(preprocessing_ns: dict[str, int], preprocessing_ns_page: dict[str, int]) -> None:
+    """Add the processing times of the preprocessing steps.
+
+    Args:
+        preprocessing_ns (dict[str, int]): The total processing time per step in nanoseconds.
+        preprocessing_ns_page (dict[str, int]): The processing time per step of a page in nanoseconds.
+    """
+    for (step, duration_ns) in preprocessing_ns_page.items():
+        preprocessing_ns[step] = preprocessing_ns.get(step, 0) + duration_ns
+
+
+# -----------------------------------------------------------------------------
+# Binarise an image with the threshold of Otsu's method.
+# -----------------------------------------------------------------------------
+def binarise_image(image: PIL.Image.Image) -> PIL.Image.Image:
+    """Binarise an image with the threshold of Otsu's method.
+
+    Args:
+        image (PIL.Image.Image): The image.
+
+    Returns:
+        PIL.Image.Image: The black and white image.
+    """
+    pixels = numpy.asarray(image if image.mode == "L" else image.convert("L"))
+
+    return PIL.Image.fromarray(numpy.where(pixels > get_otsu_threshold(pixels), 255, 0).astype(numpy.uint8))
+
+
+# -----------------------------------------------------------------------------
+# Straighten a skewed image.
+# -----------------------------------------------------------------------------
+def deskew_image(image: PIL.Image.Image) -> PIL.Image.Image:
+    """Straighten a skewed image.
+
+    The dark pixels of a reduced copy of the image are projected onto
+    the vertical axis for each candidate angle. The text lines are
+    horizontal at the angle where the row histogram varies the most,
+    i.e. where the dark pixels are concentrated in the fewest rows.
+
+    Args:
+        image (PIL.Image.Image): The image.
+
+    Returns:
+        PIL.Image.Image: The straightened image.
+    """
+    image_gray = image if image.mode == "L" else image.convert("L")
+
+    if image_gray.width > DESKEW_WIDTH:
+        image_gray = image_gray.reduce(image_gray.width // DESKEW_WIDTH)
+
+    pixels = numpy.asarray(image_gray)
+
+    (pixels_y, pixels_x) = numpy.nonzero(pixels <= get_otsu_threshold(pixels))
+    if pixels_y.size == 0:
+        return image
+
+    angles = numpy.arange(-DESKEW_ANGLE_MAX, DESKEW_ANGLE_MAX + DESKEW_ANGLE_STEP / 2, DESKEW_ANGLE_STEP)
+
+    # Rows of the dark pixels after a rotation by each angle: one row per angle.
+    rows = numpy.rint(
+        numpy.outer(numpy.cos(numpy.radians(angles)), pixels_y) - numpy.outer(numpy.sin(numpy.radians(angles)), pixels_x)
+    ).astype(numpy.int64)
+    rows -= rows.min(axis=1, keepdims=True)
+
+    scores = [numpy.square(numpy.diff(numpy.bincount(rows_angle))).sum() for rows_angle in rows]
+
+    angle = float(angles[int(numpy.argmax(scores))])
+    if angle == 0:
+        return image
+
+    dcr_core.core_glob.logger.debug("Image rotated by %.2f degrees for deskewing", angle)
+
+    return image.rotate(
+        angle,
+        resample=PIL.Image.Resampling.BILINEAR,
+        fillcolor=255 if image.mode in ("1", "L") else (255,) * len(image.getbands()),
+    )
+
+
+# -----------------------------------------------------------------------------
+# Reduce the resolution of an image to the target resolution.
+# -----------------------------------------------------------------------------
+def downscale_image(image: PIL.Image.Image) -> PIL.Image.Image:
+    """Reduce the resolution of an image to the target resolution.
+
+    Images with a resolution up to 'ocr_preprocessing_dpi' remain
+    unchanged.
+
+    Args:
+        image (PIL.Image.Image): The image.
+
+    Returns:
+        PIL.Image.Image: The downscaled image.
+    """
+    dpi = get_dpi(image)
+
+    if dcr_core.core_glob.setup.ocr_preprocessing_dpi <= 0 or dpi <= dcr_core.core_glob.setup.ocr_preprocessing_dpi:
+        return image
+
+    scale = dcr_core.core_glob.setup.ocr_preprocessing_dpi / dpi
+
+    # Area averaging is considerably faster than Lanczos and keeps thin strokes visible.
+    image_downscaled = image.resize(
+        (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+        resample=PIL.Image.Resampling.BOX,
+    )
+    image_downscaled.info["dpi"] = (dcr_core.core_glob.setup.ocr_preprocessing_dpi, dcr_core.core_glob.setup.ocr_preprocessing_dpi)
+
+    return image_downscaled
+
+
+# -----------------------------------------------------------------------------
+# Determine the resolution of an image.
+# -----------------------------------------------------------------------------
+def get_dpi(image: PIL.Image.Image) -> int:
+    """Determine the resolution of an image.
+
+    Args:
+        image (PIL.Image.Image): The image.
+
+    Returns:
+        int: The horizontal resolution in dpi.
+    """
+    try:
+        dpi = round(float(image.info["dpi"][0]))
+    except (KeyError, IndexError, TypeError, ValueError):
+        return DPI_DEFAULT
+
+    return dpi if dpi > 0 else DPI_DEFAULT
+
+
+# -----------------------------------------------------------------------------
+# Determine the threshold of Otsu's method.
+# -----------------------------------------------------------------------------
+def get_otsu_threshold(pixels: numpy.ndarray) -> int:
+    """Determine the threshold of Otsu's method.
+
+    The threshold maximises the variance between the grey levels of
+    the dark and the light pixels.
+
+    Args:
+        pixels (numpy.ndarray): The grey levels of the image.
+
+    Returns:
+        int: The highest grey level of the dark pixels.
+    """
+    histogram = numpy.bincount(pixels.ravel(), minlength=256).astype(numpy.float64)
+
+    weight_dark = numpy.cumsum(histogram)
+    weight_light = weight_dark[-1] - weight_dark
+
+    sum_dark = numpy.cumsum(histogram * numpy.arange(256))
+    sum_light = sum_dark[-1] - sum_dark
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        variance_between = weight_dark * weight_light * numpy.square(sum_dark / weight_dark - sum_light / weight_light)
+
+    return int(numpy.argmax(numpy.nan_to_num(variance_between)))
+
+
+# -----------------------------------------------------------------------------
+# Prepare an image for Tesseract OCR.
+# -----------------------------------------------------------------------------
+def preprocess_image(image: PIL.Image.Image) -> tuple[PIL.Image.Image, dict[str, int]]:
+    """Prepare an image for Tesseract OCR.
+
+    Args:
+        image (PIL.Image.Image): The image.
+
+    Returns:
+        tuple[PIL.Image.Image, dict[str, int]]:
+                The prepared image and the processing time per step in nanoseconds.
+    """
+    preprocessing_ns: dict[str, int] = {}
+
+    if not dcr_core.core_glob.setup.ocr_preprocessing:
+        return image, preprocessing_ns
+
+    # Some steps create a new image without the resolution of the original image.
+    dpi = image.info.get("dpi")
+
+    for step in STEPS:
+        if step not in dcr_core.core_glob.setup.ocr_preprocessing:
+            continue
+
+        start_time = time.perf_counter_ns()
+
+        match step:
+            case dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_GRAYSCALE:
+                if image.mode != "L":
+                    image = image.convert("L")
+            case dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_DOWNSCALE:
+                image = downscale_image(image)
+                dpi = image.info.get("dpi", dpi)
+            case dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_DESKEW:
+                image = deskew_image(image)
+            case dcr.cfg.cls_setup.Setup.OCR_PREPROCESSING_BINARISE:
+                image = binarise_image(image)
+
+        preprocessing_ns[step] = time.perf_counter_ns() - start_time
+
+    # Tesseract OCR derives the page size of the pdf document from the resolution.
+    if dpi:
+        image.info["dpi"] = dpi
+
+    return image, preprocessing_ns
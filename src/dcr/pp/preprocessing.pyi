@@ -0,0 +1,21 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module stub file."""
+import numpy
+import PIL.Image
+
+DESKEW_ANGLE_MAX: float
+DESKEW_ANGLE_STEP: float
+DESKEW_WIDTH: int
+DPI_DEFAULT: int
+STEPS: tuple[str, ...]
+
+def add_preprocessing_ns(preprocessing_ns: dict[str, int], preprocessing_ns_page: dict[str, int]) -> None: ...
+def binarise_image(image: PIL.Image.Image) -> PIL.Image.Image: ...
+def deskew_image(image: PIL.Image.Image) -> PIL.Image.Image: ...
+def downscale_image(image: PIL.Image.Image) -> PIL.Image.Image: ...
+def get_dpi(image: PIL.Image.Image) -> int: ...
+def get_otsu_threshold(pixels: numpy.ndarray) -> int: ...
+def preprocess_image(image: PIL.Image.Image) -> tuple[PIL.Image.Image, dict[str, int]]: ...
@@ -3,19 +3,27 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module pp.tesseract: Convert image files to pdf documents."""
+import glob
 import os
 import time
 
 import dcr_core.cls_process
 import dcr_core.core_glob
 import dcr_core.core_utils
+import fitz
+import PIL.Image
+import PIL.ImageSequence
 
+import dcr.artifact_cache
 import dcr.cfg.glob
 import dcr.db.cls_action
 import dcr.db.cls_document
 import dcr.db.cls_language
 import dcr.db.cls_run
+import dcr.pp.cls_ocr_engine_pool
+import dcr.pp.preprocessing
 import dcr.utils
+import dcr.worker
 
 # -----------------------------------------------------------------------------
 # Global variables.
@@ -24,6 +32,21 @@ ERROR_41_903 = "41.903 Issue (ocr): The target file '{full_name}' already exists
 ERROR_41_904 = "41.904 Issue (pypdf2): The target file '{full_name}' already exists."
 
 
+# -----------------------------------------------------------------------------
+# Close the pool of the Tesseract OCR engines.
+# -----------------------------------------------------------------------------
+def close_ocr_engine_pool() -> None:
+    """Close the pool of the Tesseract OCR engines.
+
+    In watch mode, the engines are kept for the next pass.
+    """
+    if dcr.cfg.glob.is_keep_warm or dcr.cfg.glob.ocr_engine_pool is None:
+        return
+
+    dcr.cfg.glob.ocr_engine_pool.close()
+    dcr.cfg.glob.ocr_engine_pool = None
+
+
 # -----------------------------------------------------------------------------
 # Convert image files to pdf documents (step: ocr).
 # -----------------------------------------------------------------------------
@@ -34,26 +57,35 @@ def convert_image_2_pdf() -> None:
     """
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
 
-    with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
-        rows = dcr.db.cls_action.Action.select_action_by_action_code(conn=conn, action_code=dcr.db.cls_run.Run.ACTION_CODE_TESSERACT)
+    if dcr_core.core_glob.setup.max_workers_tesseract > 1:
+        dcr.worker.process_actions(
+            action_code=dcr.db.cls_run.Run.ACTION_CODE_TESSERACT,
+            process_file=convert_image_2_pdf_file,
+            max_workers=dcr_core.core_glob.setup.max_workers_tesseract,
+        )
+        dcr.utils.show_statistics_total()
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
 
-        for row in rows:
-            dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+    for (action, document) in dcr.db.cls_action.Action.select_action_document_by_action_code(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_TESSERACT
+    ):
+        dcr.cfg.glob.start_time_document = time.perf_counter_ns()
 
-            dcr.cfg.glob.run.run_total_processed_to_be += 1
+        dcr.cfg.glob.run.run_total_processed_to_be += 1
 
-            dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_row(row)
+        dcr.cfg.glob.action_curr = action
 
-            if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
-                dcr.cfg.glob.run.total_status_error += 1
-            else:
-                dcr.cfg.glob.run.total_status_ready += 1
+        if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
+            dcr.cfg.glob.run.total_status_error += 1
+        else:
+            dcr.cfg.glob.run.total_status_ready += 1
 
-            dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=dcr.cfg.glob.action_curr.action_id_document)
+        dcr.cfg.glob.document = document
 
-            convert_image_2_pdf_file()
+        convert_image_2_pdf_file()
 
-        conn.close()
+    close_ocr_engine_pool()
 
     dcr.utils.show_statistics_total()
 
@@ -84,18 +116,46 @@ def convert_image_2_pdf_file() -> None:
         dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
         return
 
-    (error_code, error_msg, children) = dcr_core.cls_process.Process.tesseract(
-        full_name_in=full_name_curr,
-        full_name_out=full_name_next,
-        language_tesseract=dcr.db.cls_language.Language.LANGUAGES_TESSERACT[dcr.cfg.glob.document.document_id_language],
-    )
-    if error_code != dcr_core.core_glob.RETURN_OK[0]:
-        dcr.cfg.glob.action_curr.finalise_error(error_code, error_msg)
-        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
-        return
+    artifact_key = get_artifact_key_ocr()
+
+    if dcr.artifact_cache.restore_artifact(artifact_key, full_name_next):
+        children = glob.glob(full_name_curr)
+
+        for full_name in children:
+            dcr.utils.delete_auxiliary_file(full_name)
+    else:
+        # The image preprocessing requires the images in memory.
+        if get_ocr_engine_pool().is_tesserocr or dcr_core.core_glob.setup.ocr_preprocessing:
+            (error_code, error_msg, children) = convert_image_files_2_pdf(
+                full_name_in=full_name_curr,
+                full_name_out=full_name_next,
+                language_tesseract=dcr.db.cls_language.Language.LANGUAGES_TESSERACT[dcr.cfg.glob.document.document_id_language],
+            )
+        else:
+            (error_code, error_msg, children) = dcr_core.cls_process.Process.tesseract(
+                full_name_in=full_name_curr,
+                full_name_out=full_name_next,
+                language_tesseract=dcr.db.cls_language.Language.LANGUAGES_TESSERACT[dcr.cfg.glob.document.document_id_language],
+            )
+        if error_code != dcr_core.core_glob.RETURN_OK[0]:
+            dcr.cfg.glob.action_curr.finalise_error(error_code, error_msg)
+            dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+            return
+
+        for full_name in children:
+            dcr.utils.delete_auxiliary_file(full_name)
 
-    for full_name in children:
-        dcr.utils.delete_auxiliary_file(full_name)
+        if dcr.cfg.glob.document.get_file_type() == dcr_core.core_glob.FILE_TYPE_PDF:
+            merge_pages(
+                full_name_base=dcr_core.core_utils.get_full_name_from_components(
+                    dcr.cfg.glob.action_curr.action_directory_name,
+                    dcr.cfg.glob.document.get_file_name_next(),
+                ),
+                full_name_ocr=full_name_next,
+                page_nos_ocr=[get_page_no(full_name) for full_name in children],
+            )
+
+        dcr.artifact_cache.store_artifact(artifact_key, full_name_next)
 
     dcr.cfg.glob.action_curr.finalise()
 
@@ -114,3 +174,199 @@ def convert_image_2_pdf_file() -> None:
     dcr.cfg.glob.run.run_total_processed_ok += len(children)
 
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Convert image files to a pdf document with the pooled OCR engines.
+# -----------------------------------------------------------------------------
+def convert_image_files_2_pdf(full_name_in: str, full_name_out: str, language_tesseract: str) -> tuple[str, str, list[str]]:
+    """Convert image files to a pdf document with the pooled OCR engines.
+
+    Counterpart of dcr_core.cls_process.Process.tesseract(), but the
+    Tesseract OCR engine of the language is not started again for each
+    image. The image files are processed in page order. The configured
+    image preprocessing takes place before Tesseract OCR, and its
+    processing times are recorded in the current action.
+
+    Args:
+        full_name_in (str): File name or file name pattern of the image files.
+        full_name_out (str): The pdf document to be created.
+        language_tesseract (str): The Tesseract name of the document language.
+
+    Returns:
+        tuple[str, str, list[str]]:
+                ("ok", "", [...]) if the processing has been completed successfully,
+                                  otherwise a corresponding error code and error message.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param full_name_in      =%s", full_name_in)
+    dcr_core.core_glob.logger.debug("param full_name_out     =%s", full_name_out)
+    dcr_core.core_glob.logger.debug("param language_tesseract=%s", language_tesseract)
+
+    children: list[str] = []
+
+    ocr_engine_pool = get_ocr_engine_pool()
+
+    preprocessing_ns: dict[str, int] = {}
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open() as pdf_merged:
+        # The page number suffixes are sorted numerically: _2 before _10.
+        for full_name in sorted(glob.glob(full_name_in), key=lambda file_name: (len(file_name), file_name)):
+            try:
+                with PIL.Image.open(full_name) as image:
+                    # A tiff file can contain several pages.
+                    for frame in PIL.ImageSequence.Iterator(image):
+                        (image_ocr, preprocessing_ns_page) = dcr.pp.preprocessing.preprocess_image(frame)
+                        dcr.pp.preprocessing.add_preprocessing_ns(preprocessing_ns, preprocessing_ns_page)
+
+                        # noinspection PyUnresolvedReferences
+                        with fitz.open("pdf", ocr_engine_pool.image_to_pdf(image_ocr, language_tesseract)) as pdf_ocr:
+                            pdf_merged.insert_pdf(pdf_ocr)
+            except (OSError, RuntimeError) as err:
+                # OSError includes PIL.UnidentifiedImageError.
+                error_msg = dcr_core.cls_process.Process.ERROR_41_901.replace("{full_name}", full_name_in).replace("{error_msg}", str(err))
+                dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+                return error_msg[:6], error_msg, []
+
+            children.append(full_name)
+
+        if pdf_merged.page_count == 0:
+            error_msg = dcr_core.cls_process.Process.ERROR_41_911.replace("{full_name}", full_name_in)
+            dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+            return error_msg[:6], error_msg, []
+
+        pdf_merged.save(full_name_out)
+
+    dcr.cfg.glob.action_curr.action_preprocessing_ns = preprocessing_ns
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+    return dcr_core.core_glob.RETURN_OK[0], dcr_core.core_glob.RETURN_OK[1], children
+
+
+# -----------------------------------------------------------------------------
+# Determine the artifact cache key of the ocr result of the current document.
+# -----------------------------------------------------------------------------
+def get_artifact_key_ocr() -> str:
+    """Determine the artifact cache key of the ocr result of the current document.
+
+    The ocr result of a pdf document also depends on the routing of its
+    pages: the pages with text are taken over from the base document and
+    the blank pages are recorded as empty pages.
+
+    Returns:
+        str: The cache key, empty if the artifact cache is not active.
+    """
+    if not dcr_core.core_glob.setup.artifact_cache_directory:
+        return ""
+
+    text_pages = ""
+
+    if dcr.cfg.glob.document.get_file_type() == dcr_core.core_glob.FILE_TYPE_PDF:
+        full_name_base = dcr_core.core_utils.get_full_name_from_components(
+            dcr.cfg.glob.action_curr.action_directory_name,
+            dcr.cfg.glob.document.get_file_name_next(),
+        )
+        if os.path.isfile(full_name_base):
+            text_pages = "".join("1" if is_text else "0" for is_text in dcr.utils.get_pdf_text_pages(full_name_base))
+
+    return dcr.artifact_cache.get_artifact_key(
+        dcr.artifact_cache.STAGE_OCR,
+        dcr.db.cls_language.Language.LANGUAGES_TESSERACT[dcr.cfg.glob.document.document_id_language],
+        dcr_core.core_glob.setup.pdf2image_type,
+        ",".join(dcr_core.core_glob.setup.ocr_preprocessing),
+        str(dcr_core.core_glob.setup.ocr_preprocessing_dpi),
+        str(dcr_core.core_glob.setup.ocr_blank_page_ink_limit),
+        text_pages,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Get the pool of the Tesseract OCR engines of the current process.
+# -----------------------------------------------------------------------------
+def get_ocr_engine_pool() -> dcr.pp.cls_ocr_engine_pool.OCREnginePool:
+    """Get the pool of the Tesseract OCR engines of the current process.
+
+    Returns:
+        dcr.pp.cls_ocr_engine_pool.OCREnginePool: The pool, created on first use.
+    """
+    if dcr.cfg.glob.ocr_engine_pool is None:
+        dcr.cfg.glob.ocr_engine_pool = dcr.pp.cls_ocr_engine_pool.OCREnginePool()
+
+    return dcr.cfg.glob.ocr_engine_pool
+
+
+# -----------------------------------------------------------------------------
+# Determine the page number of an image file created by pdf2image.
+# -----------------------------------------------------------------------------
+def get_page_no(full_name: str) -> int:
+    """Determine the page number of an image file created by pdf2image.
+
+    Args:
+        full_name (str): The image file with the page number as suffix.
+
+    Returns:
+        int: The page number, starting with 1.
+    """
+    return int(os.path.splitext(full_name)[0].rsplit("_", 1)[1])
+
+
+# -----------------------------------------------------------------------------
+# Merge the pages of the base document and the ocr result.
+# -----------------------------------------------------------------------------
+def merge_pages(full_name_base: str, full_name_ocr: str, page_nos_ocr: list[int]) -> None:
+    """Merge the pages of the base document and the ocr result.
+
+    Only the pages without text of a pdf document are converted by
+    Tesseract OCR, and blank pages not even these. The pages with text
+    are taken over unchanged from the base document, and the blank pages
+    are recorded as empty pages. The merged pdf document has the original
+    page order.
+
+    Args:
+        full_name_base (str): The pdf document from the inbox.
+        full_name_ocr (str): The pdf document created by Tesseract OCR.
+        page_nos_ocr (list[int]): The page numbers of the pages in the ocr result.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param full_name_base=%s", full_name_base)
+    dcr_core.core_glob.logger.debug("param full_name_ocr =%s", full_name_ocr)
+    dcr_core.core_glob.logger.debug("param page_nos_ocr  =%s", page_nos_ocr)
+
+    if not os.path.isfile(full_name_base):
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
+    text_pages = dcr.utils.get_pdf_text_pages(full_name_base)
+
+    if page_nos_ocr == list(range(1, len(text_pages) + 1)):
+        dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+        return
+
+    page_indexes_ocr = {page_no - 1: page_index for (page_index, page_no) in enumerate(page_nos_ocr)}
+
+    full_name_merged = full_name_ocr + ".merged"
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open(full_name_base) as pdf_base, fitz.open(full_name_ocr) as pdf_ocr:
+        if pdf_ocr.page_count != len(page_nos_ocr):
+            dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+            return
+
+        # noinspection PyUnresolvedReferences
+        with fitz.open() as pdf_merged:
+            for (page_no, is_text) in enumerate(text_pages):
+                if page_no in page_indexes_ocr:
+                    pdf_merged.insert_pdf(pdf_ocr, from_page=page_indexes_ocr[page_no], to_page=page_indexes_ocr[page_no])
+                elif is_text:
+                    pdf_merged.insert_pdf(pdf_base, from_page=page_no, to_page=page_no)
+                else:
+                    # A blank page is recorded as an empty page.
+                    pdf_merged.new_page(width=pdf_base[page_no].rect.width, height=pdf_base[page_no].rect.height)
+
+            pdf_merged.save(full_name_merged)
+
+    os.replace(full_name_merged, full_name_ocr)
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
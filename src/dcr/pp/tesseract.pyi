@@ -3,6 +3,13 @@
 # Version 2020.05, that can be found in the LICENSE file.
 
 """Module stub file."""
+import dcr.pp.cls_ocr_engine_pool
 
+def close_ocr_engine_pool() -> None: ...
 def convert_image_2_pdf() -> None: ...
 def convert_image_2_pdf_file() -> None: ...
+def convert_image_files_2_pdf(full_name_in: str, full_name_out: str, language_tesseract: str) -> tuple[str, str, list[str]]: ...
+def get_artifact_key_ocr() -> str: ...
+def get_ocr_engine_pool() -> dcr.pp.cls_ocr_engine_pool.OCREnginePool: ...
+def get_page_no(full_name: str) -> int: ...
+def merge_pages(full_name_base: str, full_name_ocr: str, page_nos_ocr: list[int]) -> None: ...
@@ -4,19 +4,30 @@
 
 """Module utils: Helper functions."""
 import datetime
+import errno
 import hashlib
+import json
 import os
 import pathlib
+import shutil
+from collections.abc import Callable
 
 import dcr_core.core_glob
 import dcr_core.core_utils
-import PyPDF2
-import PyPDF2.errors
+import fitz
 
 import dcr
 import dcr.cfg.glob
 import dcr.db
 
+# -----------------------------------------------------------------------------
+# Global variables.
+# -----------------------------------------------------------------------------
+MOVE_JOURNAL_ABORT = "abort"
+MOVE_JOURNAL_START = "start"
+
+SHA256_BUFFER_SIZE = 1024 * 1024
+
 
 # -----------------------------------------------------------------------------
 # Check the existence of objects.
@@ -78,15 +89,49 @@ def check_exists_object(  # noqa: C901
 def compute_sha256(file: pathlib.Path) -> str:
     """Compute the SHA256 hash string of a file.
 
+    The file is read in chunks with a fixed buffer, so that the memory
+    consumption does not depend on the file size.
+
     Args:
         file (: pathlib.Path): File.
 
     Returns:
         str: SHA256 hash string.
     """
+    sha256 = hashlib.sha256()
+
     with open(file, "rb") as file_handle:
-        content = file_handle.read()
-        return hashlib.sha256(content).hexdigest()
+        for buffer in iter(lambda: file_handle.read(SHA256_BUFFER_SIZE), b""):
+            sha256.update(buffer)
+
+    return sha256.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# Compute the SHA256 hash string of a file - with caching.
+# -----------------------------------------------------------------------------
+def compute_sha256_cached(file: pathlib.Path) -> str:
+    """Compute the SHA256 hash string of a file - with caching.
+
+    The cache key consists of device, inode, file size and modification
+    time, so that an unchanged file is not hashed again.
+
+    Args:
+        file (: pathlib.Path): File.
+
+    Returns:
+        str: SHA256 hash string.
+    """
+    key = ":".join(str(value) for value in get_file_key(file))
+
+    if key in dcr.cfg.glob.sha256_cache:
+        sha256 = dcr.cfg.glob.sha256_cache[key]
+    else:
+        sha256 = compute_sha256(file)
+
+    dcr.cfg.glob.sha256_cache_used[key] = sha256
+
+    return sha256
 
 
 # -----------------------------------------------------------------------------
@@ -115,6 +160,27 @@ def delete_auxiliary_file(full_name: pathlib.Path | str) -> None:
         progress_msg(f"Auxiliary file '{full_name}' deleted")
 
 
+# -----------------------------------------------------------------------------
+# Determine the identity key of a file.
+# -----------------------------------------------------------------------------
+def get_file_key(file_name: pathlib.Path | str) -> tuple[int, int, int, int]:
+    """Determine the identity key of a file.
+
+    The key consists of device, inode, file size and modification time,
+    so that it survives a move within the file system, but changes with
+    the file content.
+
+    Args:
+        file_name (pathlib.Path | str): File name.
+
+    Returns:
+        tuple[int, int, int, int]: The identity key.
+    """
+    file_stat = os.stat(file_name)
+
+    return file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns
+
+
 # -----------------------------------------------------------------------------
 # Get the file type from a file name.
 # -----------------------------------------------------------------------------
@@ -171,11 +237,134 @@ def get_pdf_pages_no(
     if get_file_type(file_name) != dcr_core.core_glob.FILE_TYPE_PDF:
         return -1
 
+    return inspect_pdf(file_name)[0]
+
+
+# -----------------------------------------------------------------------------
+# Determine the pages with a text layer in a pdf document.
+# -----------------------------------------------------------------------------
+def get_pdf_text_pages(file_name: pathlib.Path | str) -> list[bool]:
+    """Determine the pages with a text layer in a pdf document.
+
+    Args:
+        file_name (pathlib.Path | str): File name.
+
+    Returns:
+        list[bool]: True for each page with non-whitespace text.
+    """
+    return inspect_pdf(file_name, is_text_pages=True)[2] or []
+
+
+# -----------------------------------------------------------------------------
+# Inspect a pdf document.
+# -----------------------------------------------------------------------------
+def inspect_pdf(file_name: pathlib.Path | str, is_text_pages: bool = False) -> tuple[int, int, list[bool] | None]:
+    """Inspect a pdf document.
+
+    The pdf document is opened only once per pass and the result is kept,
+    keyed by the identity of the file, until the end of the pass. The
+    text layer of the pages is only determined on request.
+
+    Args:
+        file_name (pathlib.Path | str): File name.
+        is_text_pages (bool, optional): Determine the pages with a text layer. Defaults to False.
+
+    Returns:
+        tuple[int, int, list[bool] | None]: Number of pages (-1 if not readable), file size in bytes
+                                            and the text layer flag of each page.
+    """
+    key = get_file_key(file_name)
+
+    pdf_info = dcr.cfg.glob.pdf_inspection.get(key)
+
+    if pdf_info is None or (is_text_pages and pdf_info[2] is None):
+        try:
+            # noinspection PyUnresolvedReferences
+            with fitz.open(file_name) as pdf:
+                pdf_info = (
+                    pdf.page_count,
+                    key[2],
+                    [bool(page.get_text().strip()) for page in pdf] if is_text_pages else None,
+                )
+        except RuntimeError:
+            pdf_info = (-1, key[2], [])
+
+        dcr.cfg.glob.pdf_inspection[key] = pdf_info
+
+    return pdf_info
+
+
+# -----------------------------------------------------------------------------
+# Load the cached SHA256 hash strings.
+# -----------------------------------------------------------------------------
+def load_sha256_cache() -> None:
+    """Load the cached SHA256 hash strings."""
+    dcr.cfg.glob.sha256_cache = {}
+    dcr.cfg.glob.sha256_cache_used = {}
+
+    if not dcr_core.core_glob.setup.sha256_cache_file or not os.path.isfile(dcr_core.core_glob.setup.sha256_cache_file):
+        return
+
     try:
-        # noinspection PyUnresolvedReferences
-        return len(PyPDF2.PdfReader(file_name).pages)
-    except PyPDF2.errors.PdfReadError:
-        return -1
+        with open(dcr_core.core_glob.setup.sha256_cache_file, "r", encoding=dcr_core.core_glob.FILE_ENCODING_DEFAULT) as file_handle:
+            dcr.cfg.glob.sha256_cache = json.load(file_handle)
+    except (OSError, ValueError) as err:
+        progress_msg(f"The SHA256 cache file '{dcr_core.core_glob.setup.sha256_cache_file}' is ignored - error: '{str(err)}'")
+
+
+# -----------------------------------------------------------------------------
+# Move a file without overwriting an existing target file.
+# -----------------------------------------------------------------------------
+def move_file(full_name_curr: pathlib.Path | str, full_name_next: pathlib.Path | str) -> bool:
+    """Move a file without overwriting an existing target file.
+
+    Within a file system, the file is moved atomically with a hard link.
+    Otherwise it is copied to a newly created target file and a warning
+    is issued. The start of each move is recorded in the move journal -
+    the move only counts as completed once the database records the
+    processing of the file, so that an interrupted run can be reconciled.
+
+    Args:
+        full_name_curr (pathlib.Path | str): The file to be moved.
+        full_name_next (pathlib.Path | str): The target file.
+
+    Returns:
+        bool: False if the target file already exists.
+
+    Raises:
+        OSError: The file could neither be linked nor copied to the target file.
+    """
+    if os.path.exists(full_name_next):
+        return False
+
+    write_move_journal(MOVE_JOURNAL_START, full_name_curr, full_name_next)
+
+    try:
+        os.link(full_name_curr, full_name_next)
+    except FileExistsError:
+        write_move_journal(MOVE_JOURNAL_ABORT, full_name_curr, full_name_next)
+        return False
+    except OSError as err:
+        # Hard links are not possible across file systems.
+        if err.errno not in (errno.EXDEV, errno.EPERM):
+            raise
+
+        progress_msg(f"Attention: The file '{full_name_curr}' must be copied to '{full_name_next}'")
+
+        try:
+            with open(full_name_curr, "rb") as file_curr, open(full_name_next, "xb") as file_next:
+                shutil.copyfileobj(file_curr, file_next)
+                file_next.flush()
+                os.fsync(file_next.fileno())
+        except FileExistsError:
+            write_move_journal(MOVE_JOURNAL_ABORT, full_name_curr, full_name_next)
+            return False
+
+        shutil.copystat(full_name_curr, full_name_next)
+
+    os.remove(full_name_curr)
+
+    return True
 
 
 # -----------------------------------------------------------------------------
@@ -282,6 +471,57 @@ def progress_msg_empty_before(msg: str) -> None:
         progress_msg(msg)
 
 
+# -----------------------------------------------------------------------------
+# Reconcile the file moves of an interrupted run.
+# -----------------------------------------------------------------------------
+def reconcile_move_journal(is_finalised: Callable[[str], bool]) -> None:
+    """Reconcile the file moves of an interrupted run.
+
+    A move that was started but not aborted is completed only if the
+    database already records the processing of the file. Otherwise the
+    move is rolled back, so that the file is processed again: if both
+    the file and the target file exist, the target file is removed, if
+    only the target file exists, it is moved back. Afterwards the move
+    journal is emptied.
+
+    Args:
+        is_finalised (Callable[[str], bool]): Checks whether the processing of a file is recorded in the database.
+    """
+    if not dcr_core.core_glob.setup.inbox_move_journal_file or not os.path.isfile(dcr_core.core_glob.setup.inbox_move_journal_file):
+        return
+
+    moves_open: dict[tuple[str, str], bool] = {}
+
+    with open(dcr_core.core_glob.setup.inbox_move_journal_file, "r", encoding=dcr_core.core_glob.FILE_ENCODING_DEFAULT) as file_handle:
+        for line in file_handle:
+            try:
+                (event, full_name_curr, full_name_next) = json.loads(line)
+            except ValueError:
+                # A line can be incomplete after a crash.
+                continue
+
+            if event == MOVE_JOURNAL_START:
+                moves_open[(full_name_curr, full_name_next)] = True
+            else:
+                moves_open.pop((full_name_curr, full_name_next), None)
+
+    for (full_name_curr, full_name_next) in moves_open:
+        if not os.path.isfile(full_name_next) or is_finalised(full_name_curr):
+            if os.path.isfile(full_name_curr) and os.path.isfile(full_name_next):
+                os.remove(full_name_curr)
+                progress_msg(f"Interrupted move of the file '{full_name_curr}' to '{full_name_next}' completed")
+            continue
+
+        if os.path.isfile(full_name_curr):
+            os.remove(full_name_next)
+        else:
+            os.rename(full_name_next, full_name_curr)
+
+        progress_msg(f"Interrupted move of the file '{full_name_curr}' to '{full_name_next}' rolled back")
+
+    truncate_move_journal()
+
+
 # -----------------------------------------------------------------------------
 # Reset the total statistic counters.
 # -----------------------------------------------------------------------------
@@ -300,6 +540,26 @@ def reset_statistics_total() -> None:
     dcr.cfg.glob.run.total_status_ready = 0
 
 
+# -----------------------------------------------------------------------------
+# Save the SHA256 hash strings used in the current run.
+# -----------------------------------------------------------------------------
+def save_sha256_cache() -> None:
+    """Save the SHA256 hash strings used in the current run.
+
+    Only the entries used in the current run are kept, so that the size
+    of the cache file is limited by the number of files in the inbox.
+    """
+    if not dcr_core.core_glob.setup.sha256_cache_file:
+        return
+
+    file_name_temp = str(dcr_core.core_glob.setup.sha256_cache_file) + ".tmp"
+
+    with open(file_name_temp, "w", encoding=dcr_core.core_glob.FILE_ENCODING_DEFAULT) as file_handle:
+        json.dump(dcr.cfg.glob.sha256_cache_used, file_handle)
+
+    os.replace(file_name_temp, dcr_core.core_glob.setup.sha256_cache_file)
+
+
 # -----------------------------------------------------------------------------
 # Show the language related statistics of the run.
 # -----------------------------------------------------------------------------
@@ -354,3 +614,37 @@ def show_statistics_total() -> None:
             progress_msg(f"Number documents rejected:                 {dcr.cfg.glob.run.run_total_erroneous:6d}")
         else:
             progress_msg(f"Number documents erroneous:                {dcr.cfg.glob.run.run_total_erroneous:6d}")
+
+
+# -----------------------------------------------------------------------------
+# Empty the move journal.
+# -----------------------------------------------------------------------------
+def truncate_move_journal() -> None:
+    """Empty the move journal.
+
+    The database must record the processing of all moved files, i.e.
+    the write-behind updates must have been flushed.
+    """
+    if dcr_core.core_glob.setup.inbox_move_journal_file and os.path.isfile(dcr_core.core_glob.setup.inbox_move_journal_file):
+        os.remove(dcr_core.core_glob.setup.inbox_move_journal_file)
+
+
+# -----------------------------------------------------------------------------
+# Write a record to the move journal.
+# -----------------------------------------------------------------------------
+def write_move_journal(event: str, full_name_curr: pathlib.Path | str, full_name_next: pathlib.Path | str) -> None:
+    """Write a record to the move journal.
+
+    Args:
+        event (str): The event: start or abort.
+        full_name_curr (pathlib.Path | str): The file to be moved.
+        full_name_next (pathlib.Path | str): The target file.
+    """
+    if not dcr_core.core_glob.setup.inbox_move_journal_file:
+        return
+
+    with open(dcr_core.core_glob.setup.inbox_move_journal_file, "a", encoding=dcr_core.core_glob.FILE_ENCODING_DEFAULT) as file_handle:
+        file_handle.write(json.dumps([event, str(full_name_curr), str(full_name_next)]) + "\n")
+        # The record must be on disk before the file system changes it describes.
+        file_handle.flush()
+        os.fsync(file_handle.fileno())
@@ -4,6 +4,11 @@
 
 """Module stub file."""
 import pathlib
+from collections.abc import Callable
+
+MOVE_JOURNAL_ABORT: str
+MOVE_JOURNAL_START: str
+SHA256_BUFFER_SIZE: int
 
 def check_exists_object(
     is_action_curr: bool = False,
@@ -13,12 +18,18 @@ def check_exists_object(
     is_run: bool = False,
 ) -> None: ...
 def compute_sha256(file: pathlib.Path) -> str: ...
+def compute_sha256_cached(file: pathlib.Path) -> str: ...
 def delete_auxiliary_file(full_name: pathlib.Path | str) -> None: ...
+def get_file_key(file_name: pathlib.Path | str) -> tuple[int, int, int, int]: ...
 def get_file_type(file_name: pathlib.Path | str | None) -> str: ...
 def get_path_name(name: pathlib.Path | str | None) -> pathlib.Path | str: ...
 def get_pdf_pages_no(
     file_name: pathlib.Path | str,
 ) -> int: ...
+def get_pdf_text_pages(file_name: pathlib.Path | str) -> list[bool]: ...
+def inspect_pdf(file_name: pathlib.Path | str, is_text_pages: bool = ...) -> tuple[int, int, list[bool] | None]: ...
+def load_sha256_cache() -> None: ...
+def move_file(full_name_curr: pathlib.Path | str, full_name_next: pathlib.Path | str) -> bool: ...
 def progress_msg(msg: str) -> None: ...
 def progress_msg_connected(database: str | None, user: str | None) -> None: ...
 def progress_msg_core(msg: str) -> None: ...
@@ -27,8 +38,12 @@ def progress_msg_empty_before(msg: str) -> None: ...
 def progress_msg_line_type_heading(msg: str) -> None: ...
 def progress_msg_line_type_list_bullet(msg: str) -> None: ...
 def progress_msg_line_type_list_number(msg: str) -> None: ...
+def reconcile_move_journal(is_finalised: Callable[[str], bool]) -> None: ...
 def reset_statistics_total() -> None: ...
+def save_sha256_cache() -> None: ...
 def show_statistics_language() -> None: ...
 def show_statistics_total() -> None: ...
 def terminate_fatal(error_msg: str) -> None: ...
 def terminate_fatal_setup(error_msg: str) -> None: ...
+def truncate_move_journal() -> None: ...
+def write_move_journal(event: str, full_name_curr: pathlib.Path | str, full_name_next: pathlib.Path | str) -> None: ...
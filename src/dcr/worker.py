@@ -0,0 +1,283 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module dcr.worker: Process the actions of a process step or the inbox files in worker processes.
+
+Each worker process has its own copies of the global data in dcr.cfg.glob,
+so that these form the context of the tasks executed in the worker process.
+The run counters of each task are returned to the main process and added
+to the current run there.
+
+The process step modules pass the function processing a single action or
+inbox file, so that this module does not depend on them.
+"""
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing
+import pathlib
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+import dcr_core.cls_tokenizer_spacy
+import dcr_core.core_glob
+
+import dcr.cfg.cls_setup
+import dcr.cfg.glob
+import dcr.db.cls_action
+import dcr.db.cls_db_core
+import dcr.db.cls_document
+import dcr.db.cls_language
+import dcr.db.cls_run
+import dcr.utils
+
+# -----------------------------------------------------------------------------
+# Global variables.
+# -----------------------------------------------------------------------------
+INBOX_LANGUAGE_COUNTERS = (
+    "total_erroneous",
+    "total_processed",
+    "total_processed_pandoc",
+    "total_processed_pdf2image",
+    "total_processed_pdflib",
+    "total_processed_tesseract",
+)
+
+# The language and the run counters of a failed inbox file.
+INBOX_COUNTERS_ERROR = (
+    {"total_erroneous": 1},
+    {"run_total_erroneous": 1},
+)
+
+INBOX_RUN_COUNTERS = (
+    "run_total_erroneous",
+    "run_total_processed_ok",
+    "total_processed_pandoc",
+    "total_processed_pdf2image",
+    "total_processed_pdflib",
+    "total_processed_tesseract",
+)
+
+RUN_COUNTERS = (
+    "run_total_erroneous",
+    "run_total_processed_ok",
+    "run_total_processed_to_be",
+    "total_generated",
+    "total_status_error",
+    "total_status_ready",
+)
+
+# The counters of a failed action.
+RUN_COUNTERS_ERROR = {
+    "run_total_erroneous": 1,
+    "run_total_processed_to_be": 1,
+}
+
+Counters = TypeVar("Counters", dict[str, int], tuple[dict[str, int], dict[str, int]])
+
+
+# -----------------------------------------------------------------------------
+# Add the counters of a task to the counters of the main process.
+# -----------------------------------------------------------------------------
+def add_counters(target: object, counters: dict[str, int]) -> None:
+    """Add the counters of a task to the counters of the main process.
+
+    Args:
+        target (object): The language or the run of the main process.
+        counters (dict[str, int]): The counters of the task.
+    """
+    for (counter, value) in counters.items():
+        setattr(target, counter, getattr(target, counter) + value)
+
+
+# -----------------------------------------------------------------------------
+# Get the counters of a completed task.
+# -----------------------------------------------------------------------------
+def get_counters(future: concurrent.futures.Future[Counters], counters_error: Counters) -> Counters:
+    """Get the counters of a completed task.
+
+    A failed task, also one whose worker process terminated abruptly
+    (BrokenProcessPool), is logged and counted as erroneous, so that the
+    remaining tasks are still processed.
+
+    Args:
+        future (concurrent.futures.Future[Counters]): The completed task.
+        counters_error (Counters): The counters of a failed task.
+
+    Returns:
+        Counters: The counters of the task.
+    """
+    try:
+        return future.result()
+    except Exception as err:  # pylint: disable=broad-except
+        dcr_core.core_glob.logger.error("The task of a worker process failed", exc_info=err)
+        dcr.utils.progress_msg(f"Attention: The task of a worker process failed - error: '{str(err)}'")
+        return counters_error
+
+
+# -----------------------------------------------------------------------------
+# Initialise a worker process.
+# -----------------------------------------------------------------------------
+def initialise_worker(id_run: int, is_tokenizer: bool, setup: dcr.cfg.cls_setup.Setup) -> None:
+    """Initialise a worker process.
+
+    Args:
+        id_run (int): The row id of the current run.
+        is_tokenizer (bool): The spaCy tokenizer is required.
+        setup (dcr.cfg.cls_setup.Setup): The configuration of the main process.
+    """
+    # With the start method 'spawn' neither the logger nor the configuration is inherited.
+    if not hasattr(dcr_core.core_glob, "logger"):
+        dcr_core.core_glob.initialise_logger("dcr")
+
+    dcr_core.core_glob.setup = setup
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dcr.db.cls_language.Language.load_data_from_dbt_language()
+
+    dcr.cfg.glob.run = dcr.db.cls_run.Run.from_id(id_run)
+
+    if is_tokenizer:
+        dcr_core.core_glob.tokenizer_spacy = dcr_core.cls_tokenizer_spacy.TokenizerSpacy()
+
+
+# -----------------------------------------------------------------------------
+# Process a single action in a worker process.
+# -----------------------------------------------------------------------------
+def process_action(process_file: Callable[[], None], id_action: int) -> dict[str, int]:
+    """Process a single action in a worker process.
+
+    Args:
+        process_file (Callable[[], None]): Processes the current action.
+        id_action (int): The row id of the action.
+
+    Returns:
+        dict[str, int]: The run counters of this action.
+    """
+    for counter in RUN_COUNTERS:
+        setattr(dcr.cfg.glob.run, counter, 0)
+
+    dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+
+    dcr.cfg.glob.run.run_total_processed_to_be += 1
+
+    dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_id(id_action)
+
+    if dcr.cfg.glob.action_curr.action_status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR:
+        dcr.cfg.glob.run.total_status_error += 1
+    else:
+        dcr.cfg.glob.run.total_status_ready += 1
+
+    dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(id_document=dcr.cfg.glob.action_curr.action_id_document)
+
+    process_file()
+
+    dcr.cfg.glob.db_core.flush_dbt_updates()
+
+    return {counter: getattr(dcr.cfg.glob.run, counter) for counter in RUN_COUNTERS}
+
+
+# -----------------------------------------------------------------------------
+# Process the unprocessed actions of an action code in worker processes.
+# -----------------------------------------------------------------------------
+def process_actions(action_code: str, process_file: Callable[[], None], max_workers: int) -> None:
+    """Process the unprocessed actions of an action code in worker processes.
+
+    The worker processes are started with the start method 'spawn', so
+    that they inherit neither the database connections nor the threads
+    of the main process. The actions are selected or claimed while the
+    worker processes are running and at most two tasks per worker
+    process are pending, so that claimed actions do not wait long. A
+    failed task is counted as erroneous.
+
+    Args:
+        action_code (str): The action code to be processed.
+        process_file (Callable[[], None]): Processes the current action, a module level function.
+        max_workers (int): The maximum number of worker processes.
+    """
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+    dcr_core.core_glob.logger.debug("param action_code=%s", action_code)
+    dcr_core.core_glob.logger.debug("param max_workers=%i", max_workers)
+
+    # The worker processes read the actions written behind by the main process.
+    dcr.cfg.glob.db_core.flush_dbt_updates()
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initialise_worker,
+        initargs=(
+            dcr.cfg.glob.run.run_id,
+            action_code == dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE,
+            dcr_core.core_glob.setup,
+        ),
+    ) as executor:
+        futures: set[concurrent.futures.Future[dict[str, int]]] = set()
+
+        for row in dcr.db.cls_action.Action.select_action_by_action_code(action_code=action_code):
+            if len(futures) >= 2 * max_workers:
+                (done, futures) = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    add_counters(dcr.cfg.glob.run, get_counters(future, RUN_COUNTERS_ERROR))
+
+            try:
+                futures.add(executor.submit(process_action, process_file, row[dcr.db.cls_db_core.DBCore.DBC_ID]))
+            except concurrent.futures.process.BrokenProcessPool as err:
+                # The remaining actions are processed in the next run.
+                dcr.utils.progress_msg(f"Attention: The worker processes are no longer usable - error: '{str(err)}'")
+                break
+
+        for future in concurrent.futures.as_completed(futures):
+            add_counters(dcr.cfg.glob.run, get_counters(future, RUN_COUNTERS_ERROR))
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Process a single inbox file in a worker process.
+# -----------------------------------------------------------------------------
+def process_inbox_file(
+    process_file: Callable[[pathlib.Path, str, str | None], None],
+    id_language: int,
+    file_name: str,
+    sha256: str,
+    file_name_duplicate: str | None,
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Process a single inbox file in a worker process.
+
+    Args:
+        process_file (Callable[[pathlib.Path, str, str | None], None]):
+                Processes the inbox file with its SHA256 hash string and the file name of its duplicate.
+        id_language (int):
+                The row id of the language of the inbox file.
+        file_name (str):
+                The inbox file.
+        sha256 (str):
+                SHA256 hash string of the inbox file, empty if not computed.
+        file_name_duplicate (str | None):
+                File name of the duplicate, None if not determined.
+
+    Returns:
+        tuple[dict[str, int], dict[str, int]]: The language and the run counters of this inbox file.
+    """
+    if not hasattr(dcr.cfg.glob, "language") or dcr.cfg.glob.language.language_id != id_language:
+        dcr.cfg.glob.language = dcr.db.cls_language.Language.from_id(id_language)
+
+    for counter in INBOX_LANGUAGE_COUNTERS:
+        setattr(dcr.cfg.glob.language, counter, 0)
+
+    for counter in INBOX_RUN_COUNTERS:
+        setattr(dcr.cfg.glob.run, counter, 0)
+
+    dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+
+    process_file(pathlib.Path(file_name), sha256, file_name_duplicate)
+
+    dcr.cfg.glob.db_core.flush_dbt_updates()
+
+    return (
+        {counter: getattr(dcr.cfg.glob.language, counter) for counter in INBOX_LANGUAGE_COUNTERS},
+        {counter: getattr(dcr.cfg.glob.run, counter) for counter in INBOX_RUN_COUNTERS},
+    )
@@ -0,0 +1,35 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+"""Module stub file."""
+import concurrent.futures
+import pathlib
+from collections.abc import Callable
+from typing import TypeVar
+
+import dcr.cfg.cls_setup
+
+INBOX_COUNTERS_ERROR: tuple[dict[str, int], dict[str, int]]
+INBOX_LANGUAGE_COUNTERS: tuple[str, ...]
+INBOX_RUN_COUNTERS: tuple[str, ...]
+RUN_COUNTERS_ERROR: dict[str, int]
+
+Counters = TypeVar("Counters", dict[str, int], tuple[dict[str, int], dict[str, int]])
+RUN_COUNTERS: tuple[str, ...]
+RUN_COUNTERS_ERROR: dict[str, int]
+
+Counters = TypeVar("Counters", dict[str, int], tuple[dict[str, int], dict[str, int]])
+
+def add_counters(target: object, counters: dict[str, int]) -> None: ...
+def get_counters(future: concurrent.futures.Future[Counters], counters_error: Counters) -> Counters: ...
+def initialise_worker(id_run: int, is_tokenizer: bool, setup: dcr.cfg.cls_setup.Setup) -> None: ...
+def process_action(process_file: Callable[[], None], id_action: int) -> dict[str, int]: ...
+def process_actions(action_code: str, process_file: Callable[[], None], max_workers: int) -> None: ...
+def process_inbox_file(
+    process_file: Callable[[pathlib.Path, str, str | None], None],
+    id_language: int,
+    file_name: str,
+    sha256: str,
+    file_name_duplicate: str | None,
+) -> tuple[dict[str, int], dict[str, int]]: ...
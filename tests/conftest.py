@@ -751,6 +751,39 @@ def fxtr_before_any_test():
         (dcr.cfg.cls_setup.Setup._DCR_CFG_DIRECTORY_INBOX_REJECTED, "data/inbox_test_rejected"),
         (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "none"),
         (dcr.cfg.cls_setup.Setup._DCR_CFG_IGNORE_DUPLICATES, "false"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_PANDOC, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_PARSER, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_PDF2IMAGE, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_PDFLIB, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_TESSERACT, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_TOKENIZER, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_LEASE_BATCH_SIZE, "10"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_LEASE_DURATION, "0"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_POOL_CLASS, "queue"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_POOL_MAX_OVERFLOW, "10"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_POOL_PRE_PING, "true"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_POOL_RECYCLE, "3600"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_POOL_SIZE, "5"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_STATEMENT_TIMEOUT, "0"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_TOKENIZE_2_DATABASE_CHUNK_SIZE, "1000"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_WRITE_BEHIND_DOCUMENTS, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_WRITE_BEHIND_INTERVAL, "0"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_ACTION_PAGE_SIZE, "100"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_SHA256_CACHE_FILE, "data/sha256_cache_test.json"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_INBOX_TEXT_LAYER_SAMPLE_PAGES, "0"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_INBOX_FILES_MAX, "0"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_INBOX_SCAN_CHUNK_SIZE, "1000"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_INBOX, "1"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_WATCH_INTERVAL, "60"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_INBOX_MOVE_JOURNAL_FILE, "data/inbox_move_journal_test.jsonl"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_ARTIFACT_CACHE_DIRECTORY, ""),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_PDF2IMAGE_CHUNK_SIZE, "50"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_PDF2IMAGE_CHUNK_WORKERS, "0"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_PDF2IMAGE_IN_MEMORY, "false"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_ENGINE_POOL, "true"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT, "10"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_PREPROCESSING, "none"),
+        (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_PREPROCESSING_DPI, "300"),
     ):
         CONFIG_PARSER[dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST][config_param] = config_value
 
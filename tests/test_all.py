@@ -8,6 +8,7 @@ import dcr_core.cls_setup
 import dcr_core.core_glob
 import dcr_core.core_utils
 import pytest
+import sqlalchemy
 
 import dcr.cfg.cls_setup
 import dcr.cfg.glob
@@ -1210,3 +1211,67 @@ def test_run_action_process_all_complete_auxiliary_status_error(fxtr_setup_empty
 
     # -------------------------------------------------------------------------
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PROCESS_ALL_COMPLETE - streaming mode.
+# -----------------------------------------------------------------------------
+def test_run_action_process_all_complete_stream(fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PROCESS_ALL_COMPLETE - streaming mode."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+        ],
+    )
+
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_mini", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    # -------------------------------------------------------------------------
+    # A single pass takes the document from the inbox to the tokenizer.
+    # -------------------------------------------------------------------------
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_ALL_COMPLETE, dcr.launcher.DCR_ARG_STREAM])
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_process_all_complete_stream <=========")
+
+    assert dcr.cfg.glob.run.run_action_code == dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE, "run: last process step tokenizer"
+    assert dcr.cfg.glob.run.run_total_processed_ok == 1, "run: document tokenized"
+    assert dcr.cfg.glob.run.run_total_erroneous == 0, "run: no erroneous document"
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dbt_action = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+    dbt_token = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_TOKEN)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        statuses = (
+            conn.execute(
+                sqlalchemy.select(dbt_action.c.status).where(
+                    sqlalchemy.and_(
+                        dbt_action.c.action_code == dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE,
+                        dbt_action.c.id_document == 1,
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        no_tokens = conn.execute(
+            sqlalchemy.select(sqlalchemy.func.count()).select_from(dbt_token).where(dbt_token.c.id_document == 1)
+        ).scalar()
+        conn.close()
+
+    assert statuses == [dcr.db.cls_document.Document.DOCUMENT_STATUS_END], "tokenizer action finished"
+    assert no_tokens > 0, "token stored in the database"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
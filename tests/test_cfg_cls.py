@@ -128,6 +128,43 @@ def test_get_config_coverage_true(fxtr_setup_logger_environment):
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test Function - get_config().
+# -----------------------------------------------------------------------------
+def test_get_config_db_pool_class(fxtr_setup_logger_environment):
+    """Test: get_config_db_pool_class()."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_POOL_CLASS, "nULL"),
+        ],
+    )
+
+    dcr_core.core_glob.setup = dcr.cfg.cls_setup.Setup()
+
+    assert dcr_core.core_glob.setup.db_pool_class == "null", "DCR_CFG_DB_POOL_CLASS: null"
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DB_POOL_CLASS, "static"),
+        ],
+    )
+
+    with pytest.raises(SystemExit) as expt:
+        dcr_core.core_glob.setup = dcr.cfg.cls_setup.Setup()
+
+    assert expt.type == SystemExit, "DCR_CFG_DB_POOL_CLASS: invalid"
+    assert expt.value.code == 1, "DCR_CFG_DB_POOL_CLASS: invalid"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test Function - get_config().
 # -----------------------------------------------------------------------------
@@ -291,6 +328,55 @@ def test_get_config_missing_07(fxtr_setup_logger_environment):
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test Function - get_config().
+# -----------------------------------------------------------------------------
+def test_get_config_ocr_preprocessing(fxtr_setup_logger_environment):
+    """Test: get_config_ocr_preprocessing()."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_PREPROCESSING, "bINARISE, grayscale,deskew, Binarise"),
+        ],
+    )
+
+    dcr_core.core_glob.setup = dcr.cfg.cls_setup.Setup()
+
+    assert dcr_core.core_glob.setup.ocr_preprocessing == ["binarise", "grayscale", "deskew"], "DCR_CFG_OCR_PREPROCESSING: 3 steps"
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_PREPROCESSING, "nONE"),
+        ],
+    )
+
+    dcr_core.core_glob.setup = dcr.cfg.cls_setup.Setup()
+
+    assert dcr_core.core_glob.setup.ocr_preprocessing == [], "DCR_CFG_OCR_PREPROCESSING: none"
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_PREPROCESSING, "grayscale,sharpen"),
+        ],
+    )
+
+    with pytest.raises(SystemExit) as expt:
+        dcr_core.core_glob.setup = dcr.cfg.cls_setup.Setup()
+
+    assert expt.type == SystemExit, "DCR_CFG_OCR_PREPROCESSING: invalid step"
+    assert expt.value.code == 1, "DCR_CFG_OCR_PREPROCESSING: invalid step"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test Function - get_config().
 # -----------------------------------------------------------------------------
@@ -4,12 +4,14 @@
 
 # pylint: disable=unused-argument
 """Testing Module dcr.db.cls_..."""
+import datetime
 import time
 
 import dcr_core.cls_setup
 import dcr_core.core_glob
 import dcr_core.core_utils
 import pytest
+import sqlalchemy
 
 import dcr.cfg.cls_setup
 import dcr.cfg.glob
@@ -775,6 +777,150 @@ def check_new_version():
         assert False, "issue with updated dbt version instance - see above"
 
 
+# -----------------------------------------------------------------------------
+# Get the leases of the actions.
+# -----------------------------------------------------------------------------
+def get_action_leases() -> dict[int, tuple[datetime.datetime | None, str | None]]:
+    """Get the leases of the actions.
+
+    Returns:
+        dict[int, tuple[datetime.datetime | None, str | None]]:
+                The expiry time and the owner of the lease per action id.
+    """
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        rows = conn.execute(sqlalchemy.select(dbt.c.id, dbt.c.lease_expires_at, dbt.c.lease_owner)).fetchall()
+        conn.close()
+
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+# -----------------------------------------------------------------------------
+# Get the status of the actions.
+# -----------------------------------------------------------------------------
+def get_action_statuses() -> dict[int, str]:
+    """Get the status of the actions.
+
+    Returns:
+        dict[int, str]: The status per action id.
+    """
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        rows = conn.execute(sqlalchemy.select(dbt.c.id, dbt.c.status)).fetchall()
+        conn.close()
+
+    return {row[0]: row[1] for row in rows}
+
+
+# -----------------------------------------------------------------------------
+# Test Function - action leases.
+# -----------------------------------------------------------------------------
+def test_action_leases(fxtr_setup_empty_db_and_inbox):
+    """Test Function - action leases."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_mini", "pdf"),
+            ("pdf_text_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dcr_core.core_glob.setup.lease_batch_size = 1
+    dcr_core.core_glob.setup.lease_duration = 600
+
+    # -------------------------------------------------------------------------
+    # Claim: each batch holds one action, leased by this process.
+    # -------------------------------------------------------------------------
+    batches = dcr.db.cls_action.Action.claim_action_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB)
+
+    rows = next(batches)
+    assert len(rows) == 1, "claim: batch size"
+
+    id_claimed = rows[0][dcr.db.cls_db_core.DBCore.DBC_ID]
+    assert rows[0][dcr.db.cls_db_core.DBCore.DBC_LEASE_OWNER] == dcr.db.cls_action.Action.LEASE_OWNER, "claim: lease owner"
+    assert rows[0][dcr.db.cls_db_core.DBCore.DBC_LEASE_EXPIRES_AT] is not None, "claim: lease expiry time"
+
+    # A leased action is not claimed a second time.
+    rows_other = dcr.db.cls_action.Action._claim_actions(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB, 0)
+    assert len(rows_other) == 1, "claim: the next action only"
+    assert rows_other[0][dcr.db.cls_db_core.DBCore.DBC_ID] > id_claimed, "claim: the leased action is skipped"
+
+    assert not dcr.db.cls_action.Action._claim_actions(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB, 0), "claim: all actions leased"
+
+    # -------------------------------------------------------------------------
+    # Renewal: the leases held are extended.
+    # -------------------------------------------------------------------------
+    expires_at = get_action_leases()[id_claimed][0]
+
+    dcr_core.core_glob.setup.lease_duration = 1200
+
+    dcr.db.cls_action.Action._renew_leases()
+
+    assert get_action_leases()[id_claimed][0] >= expires_at + datetime.timedelta(seconds=600), "renewal: lease extended"
+
+    # -------------------------------------------------------------------------
+    # Expiry: actions with an expired lease are claimed again.
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.setup.lease_duration = -60
+
+    dcr.db.cls_action.Action._renew_leases()
+
+    dcr_core.core_glob.setup.lease_batch_size = 10
+    dcr_core.core_glob.setup.lease_duration = 600
+
+    assert len(dcr.db.cls_action.Action._claim_actions(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB, 0)) == 2, "expiry: actions claimed again"
+
+    # -------------------------------------------------------------------------
+    # Release: the heartbeat stops and no lease remains.
+    # -------------------------------------------------------------------------
+    batches.close()
+
+    dcr.db.cls_action.Action.release_leases()
+
+    assert dcr.db.cls_action.Action._lease_heartbeat_stop is None, "release: heartbeat stopped"
+
+    for (action_id, (lease_expires_at, lease_owner)) in get_action_leases().items():
+        assert lease_expires_at is None, f"release: lease expiry time of action {action_id}"
+        assert lease_owner is None, f"release: lease owner of action {action_id}"
+
+    # -------------------------------------------------------------------------
+    # Re-scan: a lease that expires behind the claiming is claimed again.
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.setup.lease_batch_size = 1
+
+    batches = dcr.db.cls_action.Action.claim_action_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB)
+
+    id_claimed = next(batches)[0][dcr.db.cls_db_core.DBCore.DBC_ID]
+    assert next(batches)[0][dcr.db.cls_db_core.DBCore.DBC_ID] > id_claimed, "re-scan: the next action"
+
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.update(dbt)
+            .where(dbt.c.id == id_claimed)
+            .values({dcr.db.cls_db_core.DBCore.DBC_LEASE_EXPIRES_AT: sqlalchemy.func.now() - datetime.timedelta(seconds=60)})
+        )
+        conn.close()
+
+    assert next(batches)[0][dcr.db.cls_db_core.DBCore.DBC_ID] == id_claimed, "re-scan: the expired lease claimed again"
+    assert next(batches, None) is None, "re-scan: no further action"
+
+    dcr.db.cls_action.Action.release_leases()
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test Function - existing objects.
 # -----------------------------------------------------------------------------
@@ -1234,6 +1380,103 @@ def test_new_objects(fxtr_setup_empty_db_and_inbox):
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test Function - select_action_document_by_action_code().
+# -----------------------------------------------------------------------------
+def test_select_action_document_by_action_code(fxtr_setup_empty_db_and_inbox):
+    """Test: select_action_document_by_action_code()."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("p_1_h_0_f_0", "pdf"),
+            ("p_2_h_0_f_0", "pdf"),
+            ("p_3_h_0_f_4", "pdf"),
+            ("pdf_mini", "pdf"),
+            ("pdf_text_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dcr_core.core_glob.setup.action_page_size = 2
+
+    # -------------------------------------------------------------------------
+    # The documents are prefetched page by page - across the page boundaries
+    # each action gets its own document.
+    # -------------------------------------------------------------------------
+    actions_documents = list(dcr.db.cls_action.Action.select_action_document_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB))
+
+    assert [action.action_id for (action, _) in actions_documents] == [
+        row[dcr.db.cls_db_core.DBCore.DBC_ID]
+        for row in dcr.db.cls_action.Action.select_action_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB)
+    ], "the same actions row by row"
+
+    for (action, document) in actions_documents:
+        assert document.document_id == action.action_id_document, f"document of action {action.action_id}"
+
+    assert len({document.document_id for (_, document) in actions_documents}) == 5, "one document per action"
+
+    assert not list(dcr.db.cls_action.Action.select_action_document_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_TESSERACT)), "no actions"
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core.disconnect_db()
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test Function - select_action_pages_by_action_code().
+# -----------------------------------------------------------------------------
+def test_select_action_pages_by_action_code(fxtr_setup_empty_db_and_inbox):
+    """Test: select_action_pages_by_action_code()."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("p_1_h_0_f_0", "pdf"),
+            ("p_2_h_0_f_0", "pdf"),
+            ("p_3_h_0_f_4", "pdf"),
+            ("pdf_mini", "pdf"),
+            ("pdf_text_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dcr_core.core_glob.setup.action_page_size = 2
+
+    # -------------------------------------------------------------------------
+    pages = list(dcr.db.cls_action.Action.select_action_pages_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB))
+
+    assert [len(rows) for rows in pages] == [2, 2, 1], "pages limited by the page size"
+
+    ids = [row[dcr.db.cls_db_core.DBCore.DBC_ID] for rows in pages for row in rows]
+
+    assert ids == sorted(set(ids)), "each action once in ascending order"
+
+    # -------------------------------------------------------------------------
+    assert [
+        row[dcr.db.cls_db_core.DBCore.DBC_ID]
+        for row in dcr.db.cls_action.Action.select_action_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_PDFLIB)
+    ] == ids, "the same actions row by row"
+
+    assert not list(dcr.db.cls_action.Action.select_action_pages_by_action_code(dcr.db.cls_run.Run.ACTION_CODE_TESSERACT)), "no actions"
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core.disconnect_db()
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test Function - select_version_version_unique().
 # -----------------------------------------------------------------------------
@@ -1311,3 +1554,80 @@ def test_select_version_version_unique_orm(fxtr_setup_empty_db_and_inbox):
 
     # -------------------------------------------------------------------------
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test Function - unit of work - finalise and next action.
+# -----------------------------------------------------------------------------
+def test_unit_of_work_action_next(fxtr_setup_empty_db_and_inbox):
+    """Test Function - unit of work - finalise and next action."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_mini", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dcr_core.core_glob.setup.db_write_behind_documents = 10
+    dcr_core.core_glob.setup.db_write_behind_interval = 0
+
+    (id_action_curr,) = [
+        id_action for (id_action, status) in get_action_statuses().items() if status == dcr.db.cls_document.Document.DOCUMENT_STATUS_START
+    ]
+
+    dcr.cfg.glob.run = dcr.db.cls_run.Run(action_code=dcr.db.cls_run.Run.ACTION_CODE_PDFLIB)
+    dcr.cfg.glob.start_time_document = time.perf_counter_ns()
+
+    dcr.cfg.glob.action_curr = dcr.db.cls_action.Action.from_id(id_action_curr)
+    dcr.cfg.glob.document = dcr.db.cls_document.Document.from_id(dcr.cfg.glob.action_curr.action_id_document)
+
+    # -------------------------------------------------------------------------
+    # Neither the next action nor the finalised current action is written before the flush.
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.action_next = dcr.db.cls_action.Action(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_PARSER_LINE,
+        id_run_last=dcr.cfg.glob.run.run_id,
+        directory_name=dcr.cfg.glob.action_curr.action_directory_name,
+        directory_type=dcr.cfg.glob.action_curr.action_directory_type,
+        file_name=dcr.cfg.glob.action_curr.action_file_name,
+        id_document=dcr.cfg.glob.action_curr.action_id_document,
+        id_parent=dcr.cfg.glob.action_curr.action_id,
+    )
+
+    action_next_child = dcr.db.cls_action.Action(
+        action_code=dcr.db.cls_run.Run.ACTION_CODE_PARSER_LINE,
+        id_run_last=dcr.cfg.glob.run.run_id,
+        directory_name=dcr.cfg.glob.action_curr.action_directory_name,
+        directory_type=dcr.cfg.glob.action_curr.action_directory_type,
+        file_name=dcr.cfg.glob.action_curr.action_file_name,
+        id_document=dcr.cfg.glob.action_curr.action_id_document,
+        id_parent=dcr.cfg.glob.action_next.action_id,
+    )
+
+    dcr.cfg.glob.action_curr.finalise()
+
+    statuses = get_action_statuses()
+    assert dcr.cfg.glob.action_next.action_id > id_action_curr, "next action: row id reserved"
+    assert action_next_child.action_id == dcr.cfg.glob.action_next.action_id + 1, "next action: row ids reserved in a block"
+    assert dcr.cfg.glob.action_next.action_id not in statuses, "next action: not yet inserted"
+    assert statuses[id_action_curr] == dcr.db.cls_document.Document.DOCUMENT_STATUS_START, "current action: not yet finalised"
+
+    # -------------------------------------------------------------------------
+    # Both are written in the same transaction.
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core.flush_dbt_updates()
+
+    statuses = get_action_statuses()
+    assert statuses[dcr.cfg.glob.action_next.action_id] == dcr.db.cls_document.Document.DOCUMENT_STATUS_START, "next action: inserted"
+    assert statuses[action_next_child.action_id] == dcr.db.cls_document.Document.DOCUMENT_STATUS_START, "child of the next action: inserted"
+    assert statuses[id_action_curr] == dcr.db.cls_document.Document.DOCUMENT_STATUS_END, "current action: finalised"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
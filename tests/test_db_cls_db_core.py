@@ -26,6 +26,26 @@ import dcr.launcher
 # @pytest.mark.issue
 
 
+# -----------------------------------------------------------------------------
+# Get the names of the database indexes.
+# -----------------------------------------------------------------------------
+def get_index_names() -> set[str]:
+    """Get the names of the database indexes.
+
+    Returns:
+        set[str]: The index names of the database tables.
+    """
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        index_names = set(conn.execute(sqlalchemy.text("SELECT indexname FROM pg_indexes WHERE schemaname = 'public'")).scalars().all())
+        conn.close()
+
+    dcr.cfg.glob.db_core.disconnect_db()
+
+    return index_names
+
+
 # -----------------------------------------------------------------------------
 # Test Database Version - Wrong version number in configuration.
 # -----------------------------------------------------------------------------
@@ -239,6 +259,89 @@ def test_drop_database_03(fxtr_setup_empty_db_and_inbox):
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test Function - get_dbt().
+# -----------------------------------------------------------------------------
+def test_get_dbt(fxtr_setup_empty_db_and_inbox):
+    """Test: get_dbt()."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_VERSION)
+
+    assert dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_VERSION) is dbt, "table reflected only once"
+
+    # -------------------------------------------------------------------------
+    stmnt_key = (dcr.db.cls_db_core.DBCore.DBT_VERSION, dcr.db.cls_db_core.DBCore._STMNT_TYPE_UPDATE)
+
+    stmnts = []
+
+    for _ in range(2):
+        dcr.cfg.glob.db_core.update_dbt_id(
+            table_name=dcr.db.cls_db_core.DBCore.DBT_VERSION,
+            id_where=1,
+            columns={
+                dcr.db.cls_db_core.DBCore.DBC_VERSION: dcr_core.cls_setup.Setup.DCR_VERSION,
+            },
+        )
+
+        stmnts.append(dcr.cfg.glob.db_core._stmnt_cache[stmnt_key])
+
+    assert stmnts[0] is stmnts[1], "update statement created only once"
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core.invalidate_dbt_cache()
+
+    assert not dcr.cfg.glob.db_core._stmnt_cache, "statements invalidated"
+
+    dbt_new = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_VERSION)
+
+    assert dbt_new is not dbt, "table reflected again after the invalidation"
+    assert dbt_new.columns.keys() == dbt.columns.keys(), "same columns after the invalidation"
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core.disconnect_db()
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test Function - insert_dbt_rows().
+# -----------------------------------------------------------------------------
+def test_insert_dbt_rows(fxtr_setup_empty_db_and_inbox):
+    """Test: insert_dbt_rows()."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    rows_no = dcr.cfg.glob.db_core.insert_dbt_rows(
+        table_name=dcr.db.cls_db_core.DBCore.DBT_VERSION,
+        rows=({dcr.db.cls_db_core.DBCore.DBC_VERSION: f"0.0.{version_no}"} for version_no in range(1, 6)),
+        chunk_size=2,
+    )
+
+    assert rows_no == 5, "all rows inserted in three chunks"
+
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_VERSION)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        versions = conn.execute(sqlalchemy.select(dbt.c.version).order_by(dbt.c.id)).scalars().all()
+        conn.close()
+
+    assert versions[1:] == ["0.0.1", "0.0.2", "0.0.3", "0.0.4", "0.0.5"], "rows inserted in the given order"
+
+    # -------------------------------------------------------------------------
+    assert dcr.cfg.glob.db_core.insert_dbt_rows(table_name=dcr.db.cls_db_core.DBCore.DBT_VERSION, rows=[], chunk_size=2) == 0, "no rows"
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core.disconnect_db()
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test Load Database Data - disallowed database table.
 # -----------------------------------------------------------------------------
@@ -400,6 +503,41 @@ def test_upgrade_database(fxtr_setup_empty_db_and_inbox):
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test Function - upgrade_database() - indexes.
+# -----------------------------------------------------------------------------
+def test_upgrade_database_indexes(fxtr_setup_empty_db_and_inbox):
+    """Test: upgrade_database() - indexes."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    assert set(dcr.db.cls_db_core.DBCore.DB_INDEXES) <= get_index_names(), "indexes of a new database"
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect().execution_options(autocommit=True) as conn:
+        conn.execute(sqlalchemy.DDL(f"DROP INDEX {dcr.db.cls_db_core.DBCore.DBI_DOCUMENT_SHA256}"))
+        conn.close()
+
+    dcr.cfg.glob.db_core.disconnect_db()
+
+    assert dcr.db.cls_db_core.DBCore.DBI_DOCUMENT_SHA256 not in get_index_names(), "index dropped"
+
+    # -------------------------------------------------------------------------
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_UPGRADE_DB])
+
+    assert set(dcr.db.cls_db_core.DBCore.DB_INDEXES) <= get_index_names(), "missing index created by the upgrade"
+
+    # -------------------------------------------------------------------------
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_UPGRADE_DB])
+
+    assert set(dcr.db.cls_db_core.DBCore.DB_INDEXES) <= get_index_names(), "repeated upgrade"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Update the database version number.
 # -----------------------------------------------------------------------------
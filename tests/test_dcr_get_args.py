@@ -29,7 +29,7 @@ def test_dcr_get_args(fxtr_setup_logger_environment):
     # -------------------------------------------------------------------------
     args = dcr.launcher.get_args([dcr.launcher.DCR_ARGV_0, "AlL"])
 
-    assert len(args) == 10, "arg: all"
+    assert len(args) == 12, "arg: all"
     assert args[dcr.db.cls_run.Run.ACTION_CODE_TESSERACT], "arg: all"
     assert args[dcr.db.cls_run.Run.ACTION_CODE_PANDOC], "arg: all"
     assert args[dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE], "arg: all"
@@ -39,6 +39,33 @@ def test_dcr_get_args(fxtr_setup_logger_environment):
     assert args[dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE], "arg: all"
     assert not args[dcr.db.cls_run.Run.ACTION_CODE_CREATE_DB], "arg: all"
     assert not args[dcr.db.cls_run.Run.ACTION_CODE_UPGRADE_DB], "arg: all"
+    assert not args[dcr.launcher.DCR_ARG_STREAM], "arg: all"
+    assert not args[dcr.launcher.DCR_ARG_WATCH], "arg: all"
+
+    # -------------------------------------------------------------------------
+    args = dcr.launcher.get_args([dcr.launcher.DCR_ARGV_0, "all", "--Stream"])
+
+    assert args[dcr.launcher.DCR_ARG_STREAM], "arg: all --stream"
+    assert args[dcr.db.cls_run.Run.ACTION_CODE_INBOX], "arg: all --stream"
+    assert args[dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE], "arg: all --stream"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.setup.lease_duration = 60
+
+    with pytest.raises(SystemExit) as expt:
+        dcr.launcher.get_args([dcr.launcher.DCR_ARGV_0, "all", "--stream"])
+
+    assert expt.type == SystemExit, "arg: all --stream with leasing"
+    assert expt.value.code == 1, "arg: all --stream with leasing"
+
+    dcr_core.core_glob.setup.lease_duration = 0
+
+    # -------------------------------------------------------------------------
+    args = dcr.launcher.get_args([dcr.launcher.DCR_ARGV_0, "all", "--Watch"])
+
+    assert args[dcr.launcher.DCR_ARG_WATCH], "arg: all --watch"
+    assert not args[dcr.launcher.DCR_ARG_STREAM], "arg: all --watch"
+    assert args[dcr.db.cls_run.Run.ACTION_CODE_INBOX], "arg: all --watch"
 
     # -------------------------------------------------------------------------
     args = dcr.launcher.get_args([dcr.launcher.DCR_ARGV_0, "Db_C"])
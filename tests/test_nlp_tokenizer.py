@@ -12,6 +12,7 @@ import dcr_core.cls_setup
 import dcr_core.core_glob
 import dcr_core.core_utils
 import pytest
+import sqlalchemy
 
 import dcr.cfg.cls_setup
 import dcr.cfg.glob
@@ -130,6 +131,59 @@ def test_run_action_tokenize_attributes_false_true_coverage(spacy_ignore: str, f
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_TOKENIZE - chunks.
+# -----------------------------------------------------------------------------
+def test_run_action_tokenize_chunks(fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_TOKENIZE - chunks."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_text_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_TOKENIZE_2_DATABASE_CHUNK_SIZE, "2"),
+        ],
+    )
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PDFLIB])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PARSER])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_TOKENIZE])
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_tokenize_chunks <=========")
+
+    assert dcr.cfg.glob.run.run_total_processed_ok == 1, "document tokenized"
+    assert dcr.cfg.glob.run.run_total_erroneous == 0, "no erroneous document"
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_TOKEN)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        page_nos = conn.execute(sqlalchemy.select(dbt.c.page_no).where(dbt.c.id_document == 1).order_by(dbt.c.id)).scalars().all()
+        conn.close()
+
+    assert len(page_nos) > 2, "token stored in more than one chunk"
+    assert page_nos == sorted(page_nos), "token stored in page order"
+    assert set(page_nos) == {1, 2, 3}, "token of all pages stored"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test RUN_ACTION_TOKENIZE - coverage.
 # -----------------------------------------------------------------------------
@@ -0,0 +1,86 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+# pylint: disable=unused-argument
+"""Testing Module dcr.pp.cls_inbox_watcher."""
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+import dcr.pp.cls_inbox_watcher
+
+# -----------------------------------------------------------------------------
+# Constants & Globals.
+# -----------------------------------------------------------------------------
+# @pytest.mark.issue
+
+
+# -----------------------------------------------------------------------------
+# Test Function - InboxWatcher - inotify.
+# -----------------------------------------------------------------------------
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+def test_inbox_watcher_inotify(fxtr_setup_logger_environment, tmp_path):
+    """Test Function - InboxWatcher - inotify."""
+    watcher = dcr.pp.cls_inbox_watcher.InboxWatcher([str(tmp_path), str(tmp_path / "missing")])
+
+    assert watcher.exists(), "watcher created"
+    assert watcher.watcher_directory_names == [str(tmp_path)], "missing file directories are not watched"
+    assert watcher.watcher_fd != -1, "watched with inotify"
+
+    assert not watcher.wait(0.1), "no new files"
+
+    # -------------------------------------------------------------------------
+    (tmp_path / "new.pdf").write_bytes(b"%PDF-1.4")
+
+    assert watcher.wait(5), "new file arrived"
+    assert not watcher.wait(0.1), "all events of the new file drained"
+
+    # -------------------------------------------------------------------------
+    watcher.close()
+
+    assert watcher.watcher_fd == -1, "inotify released"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - InboxWatcher - polling.
+# -----------------------------------------------------------------------------
+def test_inbox_watcher_polling(fxtr_setup_logger_environment, tmp_path):
+    """Test Function - InboxWatcher - polling."""
+    watcher = dcr.pp.cls_inbox_watcher.InboxWatcher([str(tmp_path)])
+
+    # Without inotify, the modification times of the file directories are polled.
+    watcher.close()
+
+    assert not watcher.wait(0.1), "no new files"
+
+    # -------------------------------------------------------------------------
+    (tmp_path / "new.pdf").write_bytes(b"%PDF-1.4")
+
+    mtime_ns = watcher.watcher_mtimes[str(tmp_path)] + 1_000_000_000
+    os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+
+    assert watcher.wait(5), "new file arrived"
+    assert not watcher.wait(0.1), "no further new files"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - InboxWatcher - shutdown.
+# -----------------------------------------------------------------------------
+def test_inbox_watcher_shutdown(fxtr_setup_logger_environment, tmp_path):
+    """Test Function - InboxWatcher - shutdown."""
+    watcher = dcr.pp.cls_inbox_watcher.InboxWatcher([str(tmp_path)])
+
+    watcher.request_shutdown(signal.SIGTERM, None)
+
+    assert watcher.is_shutdown_requested, "shutdown requested"
+
+    time_start = time.monotonic()
+
+    assert not watcher.wait(60), "no waiting after the shutdown request"
+    assert time.monotonic() - time_start < 1, "wait returns immediately"
+
+    watcher.close()
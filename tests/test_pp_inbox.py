@@ -4,12 +4,19 @@
 
 # pylint: disable=unused-argument
 """Testing Module pp.inbox."""
+import io
+import logging
 import os.path
 import pathlib
 import shutil
+import signal
+import threading
+import time
 
 import dcr_core.core_glob
 import dcr_core.core_utils
+import fitz
+import PIL.Image
 import pytest
 
 import dcr.cfg.cls_setup
@@ -17,6 +24,7 @@ import dcr.cfg.glob
 import dcr.db.cls_db_core
 import dcr.db.cls_run
 import dcr.launcher
+import dcr.pp.inbox
 
 # -----------------------------------------------------------------------------
 # Constants & Globals.
@@ -24,6 +32,104 @@ import dcr.launcher
 # @pytest.mark.issue
 
 
+# -----------------------------------------------------------------------------
+# Create a pdf document from page descriptions.
+# -----------------------------------------------------------------------------
+def create_pdf(full_name: str, pages: str) -> None:
+    """Create a pdf document from page descriptions.
+
+    Args:
+        full_name (str): File name of the new pdf document.
+        pages (str): One character per page: 'b' blank page, 'i' image-only
+                page and 't' text page.
+    """
+    image = io.BytesIO()
+    PIL.Image.new("L", (100, 100), 128).save(image, format="PNG")
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open() as pdf:
+        for page_type in pages:
+            page = pdf.new_page(width=595, height=842)
+
+            if page_type == "i":
+                page.insert_image(fitz.Rect(0, 0, 595, 842), stream=image.getvalue())
+            elif page_type == "t":
+                page.insert_text((72, 72), "text layer")
+
+        pdf.save(full_name)
+
+
+# -----------------------------------------------------------------------------
+# Test Function - check_text_layer().
+# -----------------------------------------------------------------------------
+def test_check_text_layer(fxtr_setup_logger_environment, monkeypatch, tmp_path):
+    """Test: check_text_layer()."""
+    dcr_core.core_glob.setup.inbox_text_layer_sample_pages = 0
+
+    for (pages, expected, message) in (
+        ("tt", (True, False), "text pages only"),
+        ("ii", (False, True), "image-only pages only"),
+        ("tbit", (True, True), "mixed document"),
+        ("bb", (False, False), "blank pages only"),
+    ):
+        full_name = tmp_path / (pages + ".pdf")
+        create_pdf(str(full_name), pages)
+
+        assert dcr.pp.inbox.check_text_layer(full_name) == expected, message
+
+    # -------------------------------------------------------------------------
+    # The text is only extracted from pages with fonts, also in debug mode.
+    # -------------------------------------------------------------------------
+    get_text = fitz.Page.get_text
+    pages_get_text = []
+
+    def get_text_counted(page, *args, **kwargs):
+        pages_get_text.append(page.number)
+        return get_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_text", get_text_counted)
+
+    level = dcr_core.core_glob.logger.level
+
+    for level_check in (logging.INFO, logging.DEBUG):
+        dcr_core.core_glob.logger.setLevel(level_check)
+
+        pages_get_text.clear()
+
+        assert dcr.pp.inbox.check_text_layer(tmp_path / "ii.pdf") == (False, True), "image-only pages only"
+        assert not pages_get_text, "no text extracted from image-only pages"
+
+        pages_get_text.clear()
+
+        assert dcr.pp.inbox.check_text_layer(tmp_path / "tt.pdf") == (True, False), "text pages only"
+        assert pages_get_text == [0], "text extracted up to the first page with text"
+
+    dcr_core.core_glob.logger.setLevel(level)
+
+    monkeypatch.undo()
+
+    # -------------------------------------------------------------------------
+    # Only the first, the middle and the last page are checked.
+    # -------------------------------------------------------------------------
+    full_name = tmp_path / "sample.pdf"
+    create_pdf(str(full_name), "btbtitb")
+
+    dcr_core.core_glob.setup.inbox_text_layer_sample_pages = 2
+
+    assert dcr.pp.inbox.check_text_layer(full_name) == (False, False), "sample: first and last page"
+
+    dcr_core.core_glob.setup.inbox_text_layer_sample_pages = 3
+
+    assert dcr.pp.inbox.check_text_layer(full_name) == (True, False), "sample: first, middle and last page"
+
+    dcr_core.core_glob.setup.inbox_text_layer_sample_pages = 7
+
+    assert dcr.pp.inbox.check_text_layer(full_name) == (True, True), "sample: all pages"
+
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.pdf_inspection.clear()
+
+
 # -----------------------------------------------------------------------------
 # Test RUN_ACTION_PROCESS_INBOX - accepted - duplicate.
 # -----------------------------------------------------------------------------
@@ -86,6 +192,159 @@ def test_run_action_process_inbox_accepted_duplicate(fxtr_setup_empty_db_and_inb
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PROCESS_INBOX - duplicate - same inbox.
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize("max_workers", ["1", "2"])
+def test_run_action_process_inbox_duplicate_same_inbox(max_workers: str, fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PROCESS_INBOX - duplicate - same inbox."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    stem_name_1 = "pdf_text_ok"
+    stem_name_2 = "pdf_text_ok_copy"
+    stem_name_3 = "pdf_text_ok_later"
+    file_ext = "pdf"
+
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_INBOX, max_workers),
+        ],
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_process_inbox_duplicate_same_inbox 1/2 <=========")
+
+    for stem_name in (stem_name_2, stem_name_1):
+        pytest.helpers.copy_files_4_pytest_2_dir(
+            source_files=[(stem_name_1, file_ext)], target_path=dcr_core.core_glob.setup.directory_inbox
+        )
+
+        if stem_name != stem_name_1:
+            os.rename(
+                dcr_core.core_utils.get_full_name_from_components(dcr_core.core_glob.setup.directory_inbox, stem_name_1 + "." + file_ext),
+                dcr_core.core_utils.get_full_name_from_components(dcr_core.core_glob.setup.directory_inbox, stem_name + "." + file_ext),
+            )
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    # The second file of the same inbox is recognised as a duplicate of the first one.
+    pytest.helpers.verify_content_of_inboxes(
+        inbox=(
+            [],
+            [
+                stem_name_2 + "." + file_ext,
+            ],
+        ),
+        inbox_accepted=(
+            [],
+            [
+                stem_name_1 + "_1." + file_ext,
+            ],
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_process_inbox_duplicate_same_inbox 2/2 <=========")
+
+    os.rename(
+        dcr_core.core_utils.get_full_name_from_components(dcr_core.core_glob.setup.directory_inbox, stem_name_2 + "." + file_ext),
+        dcr_core.core_utils.get_full_name_from_components(dcr_core.core_glob.setup.directory_inbox, stem_name_3 + "." + file_ext),
+    )
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    # The documents of previous runs are found as well.
+    pytest.helpers.verify_content_of_inboxes(
+        inbox=(
+            [],
+            [
+                stem_name_3 + "." + file_ext,
+            ],
+        ),
+        inbox_accepted=(
+            [],
+            [
+                stem_name_1 + "_1." + file_ext,
+            ],
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PROCESS_INBOX - maximum number of files per run.
+# -----------------------------------------------------------------------------
+def test_run_action_process_inbox_files_max(fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PROCESS_INBOX - maximum number of files per run."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("p_1_h_0_f_0", "pdf"),
+            ("pdf_mini", "pdf"),
+            ("pdf_text_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_INBOX_FILES_MAX, "2"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_INBOX_SCAN_CHUNK_SIZE, "2"),
+        ],
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_process_inbox_files_max 1/2 <=========")
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    assert dcr.cfg.glob.run.run_total_processed_to_be == 2, "run: limited to the maximum number of files"
+
+    pytest.helpers.verify_content_of_inboxes(
+        inbox=(
+            [],
+            [
+                "pdf_text_ok.pdf",
+            ],
+        ),
+        inbox_accepted=(
+            [],
+            [
+                "p_1_h_0_f_0_1.pdf",
+                "pdf_mini_2.pdf",
+            ],
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_process_inbox_files_max 2/2 <=========")
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    pytest.helpers.verify_content_of_inboxes(
+        inbox_accepted=(
+            [],
+            [
+                "p_1_h_0_f_0_1.pdf",
+                "pdf_mini_2.pdf",
+                "pdf_text_ok_3.pdf",
+            ],
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test RUN_ACTION_PROCESS_INBOX - french.
 # -----------------------------------------------------------------------------
@@ -216,6 +475,36 @@ def test_run_action_process_inbox_ignore_duplicates(fxtr_setup_empty_db_and_inbo
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PROCESS_INBOX - pdf inspections.
+# -----------------------------------------------------------------------------
+def test_run_action_process_inbox_pdf_inspection(fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PROCESS_INBOX - pdf inspections."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_mini", "pdf"),
+            ("pdf_scanned_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    dcr.cfg.glob.pdf_inspection.clear()
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_process_inbox_pdf_inspection <=========")
+
+    assert dcr.cfg.glob.run.run_total_processed_ok == 2, "pdf documents inspected"
+    assert not dcr.cfg.glob.pdf_inspection, "pdf inspections released at the end of the pass"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test RUN_ACTION_PROCESS_INBOX - rejected.
 # -----------------------------------------------------------------------------
@@ -386,3 +675,107 @@ def test_run_action_process_inbox_rejected_901(fxtr_rmdir_opt, fxtr_setup_empty_
             ],
         ),
     )
+
+
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PROCESS_INBOX - watch mode.
+# -----------------------------------------------------------------------------
+def test_run_action_process_inbox_watch(fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PROCESS_INBOX - watch mode."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_mini", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_WATCH_INTERVAL, "60"),
+        ],
+    )
+
+    directory_inbox = dcr_core.core_glob.setup.directory_inbox
+    directory_inbox_accepted = dcr_core.core_glob.setup.directory_inbox_accepted
+
+    def wait_for_file(full_name: str) -> None:
+        time_end = time.monotonic() + 120
+
+        while not os.path.isfile(full_name) and time.monotonic() < time_end:
+            time.sleep(0.1)
+
+    # A new file arrives after the first pass, and the watch mode is ended after the second pass.
+    def feed_inbox() -> None:
+        wait_for_file(os.path.join(directory_inbox_accepted, "pdf_mini_1.pdf"))
+
+        pytest.helpers.copy_files_4_pytest_2_dir(source_files=[("pdf_text_ok", "pdf")], target_path=directory_inbox)
+
+        wait_for_file(os.path.join(directory_inbox_accepted, "pdf_text_ok_2.pdf"))
+
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    feeder = threading.Thread(target=feed_inbox, daemon=True)
+    feeder.start()
+
+    # -------------------------------------------------------------------------
+    time_start = time.monotonic()
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX, dcr.launcher.DCR_ARG_WATCH])
+
+    feeder.join()
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_process_inbox_watch <=========")
+
+    assert time.monotonic() - time_start < 60, "new file processed without waiting for the watch interval"
+
+    pytest.helpers.verify_content_of_inboxes(
+        inbox_accepted=(
+            [],
+            [
+                "pdf_mini_1.pdf",
+                "pdf_text_ok_2.pdf",
+            ],
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test Function - scan_inbox_directory().
+# -----------------------------------------------------------------------------
+def test_scan_inbox_directory(fxtr_setup_logger_environment, tmp_path):
+    """Test: scan_inbox_directory()."""
+    file_names = ["a.pdf", "b.pdf", "c.pdf", "d.pdf", "e.pdf"]
+
+    for file_name in reversed(file_names):
+        (tmp_path / file_name).touch()
+
+    (tmp_path / "directory").mkdir()
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.setup.inbox_scan_chunk_size = 1000
+
+    files = list(dcr.pp.inbox.scan_inbox_directory(str(tmp_path)))
+
+    assert [file.name for file in files] == file_names, "files only, sorted by file name"
+    assert all(isinstance(file, pathlib.Path) for file in files), "pathlib.Path objects"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.setup.inbox_scan_chunk_size = 2
+
+    assert sorted(file.name for file in dcr.pp.inbox.scan_inbox_directory(str(tmp_path))) == file_names, "chunks: each file once"
+
+    # -------------------------------------------------------------------------
+    scanner = dcr.pp.inbox.scan_inbox_directory(str(tmp_path))
+
+    assert next(scanner).name in file_names, "chunks: the first file before the end of the scan"
+
+    scanner.close()
@@ -9,12 +9,16 @@ import os
 import dcr_core.cls_setup
 import dcr_core.core_glob
 import dcr_core.core_utils
+import fitz
+import PIL.Image
+import PIL.ImageDraw
 import pytest
 
 import dcr.cfg.cls_setup
 import dcr.cfg.glob
 import dcr.db.cls_run
 import dcr.launcher
+import dcr.pp.pdf2image
 
 # -----------------------------------------------------------------------------
 # Constants & Globals.
@@ -22,6 +26,40 @@ import dcr.launcher
 # @pytest.mark.issue
 
 
+# -----------------------------------------------------------------------------
+# Test Function - is_blank_page().
+# -----------------------------------------------------------------------------
+def test_is_blank_page(fxtr_setup_logger_environment):
+    """Test: is_blank_page()."""
+    dcr_core.core_glob.setup.ocr_blank_page_ink_limit = 10
+
+    # -------------------------------------------------------------------------
+    # A white page with a speck of dust and a shadow in the margin.
+    # -------------------------------------------------------------------------
+    image = PIL.Image.new("L", (800, 1000), 255)
+
+    draw = PIL.ImageDraw.Draw(image)
+    draw.point((400, 500), fill=0)
+    draw.rectangle((0, 0, 799, 20), fill=0)
+
+    assert dcr.pp.pdf2image.is_blank_page(image), "white page"
+
+    # -------------------------------------------------------------------------
+    # A page with some lines of text.
+    # -------------------------------------------------------------------------
+    for line_no in range(10):
+        draw.rectangle((100, 100 + line_no * 30, 700, 110 + line_no * 30), fill=0)
+
+    assert not dcr.pp.pdf2image.is_blank_page(image), "page with ink"
+
+    # -------------------------------------------------------------------------
+    # The detection of blank pages is switched off.
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.setup.ocr_blank_page_ink_limit = 0
+
+    assert not dcr.pp.pdf2image.is_blank_page(PIL.Image.new("L", (800, 1000), 255)), "detection switched off"
+
+
 # -----------------------------------------------------------------------------
 # Test RUN_ACTION_PDF_2_IMAGE - missing input file.
 # -----------------------------------------------------------------------------
@@ -71,6 +109,212 @@ def test_run_action_pdf_2_image_missing_input_file(fxtr_setup_empty_db_and_inbox
     dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
 
 
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PDF_2_IMAGE - normal - page chunks.
+# -----------------------------------------------------------------------------
+def test_run_action_pdf_2_image_normal_chunks(fxtr_rmdir_opt, fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PDF_2_IMAGE - normal - page chunks."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT, "0"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_PDF2IMAGE_CHUNK_SIZE, "1"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_PDF2IMAGE_CHUNK_WORKERS, "2"),
+        ],
+    )
+    pytest.helpers.config_params_modify(
+        dcr_core.cls_setup.Setup._DCR_CFG_SECTION_CORE_ENV_TEST,
+        [
+            (dcr_core.cls_setup.Setup._DCR_CFG_DELETE_AUXILIARY_FILES, "false"),
+        ],
+    )
+
+    # -------------------------------------------------------------------------
+    stem_name = "case_5_pdf_image_large_route_inbox_pdf2image_tesseract_pypdf2_pdflib"
+    file_ext = "pdf"
+
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            (stem_name, file_ext),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_pdf_2_image_normal_chunks 1/2 <=========")
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE])
+
+    assert dcr.cfg.glob.run.run_total_processed_ok == 1, "document converted in page chunks"
+    assert dcr.cfg.glob.run.total_generated == 2, "one image file per page"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_pdf_2_image_normal_chunks 2/2 <=========")
+
+    pytest.helpers.verify_content_of_inboxes(
+        inbox_accepted=(
+            [],
+            [
+                stem_name + "_1.pdf",
+                stem_name + "_1_1." + dcr_core.core_glob.FILE_TYPE_JPEG,
+                stem_name + "_1_2." + dcr_core.core_glob.FILE_TYPE_JPEG,
+            ],
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PDF_2_IMAGE - normal - in memory.
+# -----------------------------------------------------------------------------
+def test_run_action_pdf_2_image_normal_in_memory(fxtr_rmdir_opt, fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PDF_2_IMAGE - normal - in memory."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT, "0"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_PDF2IMAGE_IN_MEMORY, "true"),
+        ],
+    )
+
+    # -------------------------------------------------------------------------
+    # Document: text page - scanned page - text page.
+    # -------------------------------------------------------------------------
+    stem_name = "pdf_text_scanned_text"
+    file_ext = "pdf"
+
+    source_files = [("pdf_mini", 0), ("pdf_scanned_ok", 0), ("pdf_text_ok", 0)]
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open() as pdf:
+        for (source_stem_name, page_no) in source_files:
+            # noinspection PyUnresolvedReferences
+            with fitz.open(os.path.join(pytest.helpers.get_test_inbox_directory_name(), source_stem_name + "." + file_ext)) as pdf_source:
+                pdf.insert_pdf(pdf_source, from_page=page_no, to_page=page_no)
+
+        pdf.save(os.path.join(dcr_core.core_glob.setup.directory_inbox, stem_name + "." + file_ext))
+
+        texts_in = [page.get_text() for page in pdf]
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_pdf_2_image_normal_in_memory 1/2 <=========")
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE])
+
+    assert dcr.cfg.glob.run.run_total_processed_ok == 1, "document converted in memory"
+    assert dcr.cfg.glob.run.total_generated == 1, "one page converted by Tesseract OCR"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_pdf_2_image_normal_in_memory 2/2 <=========")
+
+    pytest.helpers.verify_content_of_inboxes(
+        inbox_accepted=(
+            [],
+            [
+                stem_name + "_1." + file_ext,
+                stem_name + "_1_0." + file_ext,
+            ],
+        ),
+    )
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open(os.path.join(dcr_core.core_glob.setup.directory_inbox_accepted, stem_name + "_1_0." + file_ext)) as pdf:
+        texts_out = [page.get_text() for page in pdf]
+
+    assert len(texts_out) == len(texts_in), "page count of the input document"
+    assert texts_out[0] == texts_in[0], "first text page unchanged in its position"
+    assert texts_out[1].strip() != "", "scanned page with text layer in its position"
+    assert texts_out[2] == texts_in[2], "last text page unchanged in its position"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_PDF_2_IMAGE - normal - mixed document.
+# -----------------------------------------------------------------------------
+def test_run_action_pdf_2_image_normal_mixed(fxtr_rmdir_opt, fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_PDF_2_IMAGE - normal - mixed document."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_OCR_BLANK_PAGE_INK_LIMIT, "0"),
+        ],
+    )
+
+    # -------------------------------------------------------------------------
+    # Document: text page - scanned page - text page.
+    # -------------------------------------------------------------------------
+    stem_name = "pdf_text_scanned_text"
+    file_ext = "pdf"
+
+    source_files = [("pdf_mini", 0), ("pdf_scanned_ok", 0), ("pdf_text_ok", 0)]
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open() as pdf:
+        for (source_stem_name, page_no) in source_files:
+            # noinspection PyUnresolvedReferences
+            with fitz.open(os.path.join(pytest.helpers.get_test_inbox_directory_name(), source_stem_name + "." + file_ext)) as pdf_source:
+                pdf.insert_pdf(pdf_source, from_page=page_no, to_page=page_no)
+
+        pdf.save(os.path.join(dcr_core.core_glob.setup.directory_inbox, stem_name + "." + file_ext))
+
+        texts_in = [page.get_text() for page in pdf]
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_pdf_2_image_normal_mixed 1/2 <=========")
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE])
+
+    # Only the image of the scanned page is passed on to Tesseract OCR.
+    pytest.helpers.verify_content_of_inboxes(
+        inbox_accepted=(
+            [],
+            [
+                stem_name + "_1." + file_ext,
+                stem_name + "_1_2." + dcr_core.core_glob.setup.pdf2image_type,
+            ],
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_pdf_2_image_normal_mixed 2/2 <=========")
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_TESSERACT])
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open(os.path.join(dcr_core.core_glob.setup.directory_inbox_accepted, stem_name + "_1_0." + file_ext)) as pdf:
+        texts_out = [page.get_text() for page in pdf]
+
+    assert len(texts_out) == len(texts_in), "page count of the input document"
+    assert texts_out[0] == texts_in[0], "first text page unchanged in its position"
+    assert texts_out[1].strip() != "", "scanned page with text layer in its position"
+    assert texts_out[2] == texts_in[2], "last text page unchanged in its position"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test RUN_ACTION_PDF_2_IMAGE - normal - png.
 # -----------------------------------------------------------------------------
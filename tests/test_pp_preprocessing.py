@@ -0,0 +1,143 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+# pylint: disable=unused-argument
+"""Testing Module pp.preprocessing."""
+import dcr_core.core_glob
+import numpy
+import PIL.Image
+import PIL.ImageDraw
+
+import dcr.pp.preprocessing
+
+# -----------------------------------------------------------------------------
+# Constants & Globals.
+# -----------------------------------------------------------------------------
+# @pytest.mark.issue
+
+
+# -----------------------------------------------------------------------------
+# Create an image with horizontal text lines.
+# -----------------------------------------------------------------------------
+def create_image_lines() -> PIL.Image.Image:
+    """Create an image with horizontal text lines.
+
+    Returns:
+        PIL.Image.Image: A white grey level image with ten black lines.
+    """
+    image = PIL.Image.new("L", (800, 600), 255)
+
+    draw = PIL.ImageDraw.Draw(image)
+
+    for line_no in range(10):
+        draw.rectangle((100, 60 + line_no * 50, 700, 66 + line_no * 50), fill=0)
+
+    return image
+
+
+# -----------------------------------------------------------------------------
+# Count the pixel rows with dark pixels.
+# -----------------------------------------------------------------------------
+def get_ink_rows(image: PIL.Image.Image) -> int:
+    """Count the pixel rows with dark pixels.
+
+    Args:
+        image (PIL.Image.Image): The image.
+
+    Returns:
+        int: The number of pixel rows with at least one dark pixel.
+    """
+    return int(numpy.count_nonzero((numpy.asarray(image.convert("L")) < 128).any(axis=1)))
+
+
+# -----------------------------------------------------------------------------
+# Test Function - binarise_image().
+# -----------------------------------------------------------------------------
+def test_binarise_image():
+    """Test: binarise_image()."""
+    image = PIL.Image.fromarray(numpy.array([[40, 60, 180, 220]] * 4, dtype=numpy.uint8))
+
+    pixels = numpy.asarray(dcr.pp.preprocessing.binarise_image(image))
+
+    assert pixels.tolist() == [[0, 0, 255, 255]] * 4, "dark pixels black, light pixels white"
+
+    # -------------------------------------------------------------------------
+    image_rgb = PIL.Image.merge("RGB", (image, image, image))
+
+    assert dcr.pp.preprocessing.binarise_image(image_rgb).mode == "L", "colour image converted to grey levels"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - deskew_image().
+# -----------------------------------------------------------------------------
+def test_deskew_image(fxtr_setup_logger_environment):
+    """Test: deskew_image()."""
+    image = create_image_lines()
+
+    assert dcr.pp.preprocessing.deskew_image(image) is image, "straight image unchanged"
+
+    # -------------------------------------------------------------------------
+    image_skewed = image.rotate(3, resample=PIL.Image.Resampling.BILINEAR, fillcolor=255)
+
+    assert get_ink_rows(image_skewed) > get_ink_rows(image), "skewed lines cover more pixel rows"
+
+    image_deskewed = dcr.pp.preprocessing.deskew_image(image_skewed)
+
+    assert image_deskewed.size == image_skewed.size, "image size unchanged"
+    assert get_ink_rows(image_deskewed) == get_ink_rows(image), "lines straightened"
+
+    # -------------------------------------------------------------------------
+    image_blank = PIL.Image.new("L", (800, 600), 255)
+
+    assert dcr.pp.preprocessing.deskew_image(image_blank) is image_blank, "blank image unchanged"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - downscale_image().
+# -----------------------------------------------------------------------------
+def test_downscale_image(fxtr_setup_logger_environment):
+    """Test: downscale_image()."""
+    dcr_core.core_glob.setup.ocr_preprocessing_dpi = 300
+
+    image = PIL.Image.new("L", (1200, 900), 255)
+    image.info["dpi"] = (600, 600)
+
+    image_downscaled = dcr.pp.preprocessing.downscale_image(image)
+
+    assert image_downscaled.size == (600, 450), "image halved"
+    assert image_downscaled.info["dpi"] == (300, 300), "target resolution"
+
+    # -------------------------------------------------------------------------
+    image.info["dpi"] = (300, 300)
+
+    assert dcr.pp.preprocessing.downscale_image(image) is image, "image with the target resolution unchanged"
+
+    # -------------------------------------------------------------------------
+    del image.info["dpi"]
+
+    assert dcr.pp.preprocessing.downscale_image(image) is image, "image with the default resolution unchanged"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.setup.ocr_preprocessing_dpi = 0
+
+    image.info["dpi"] = (600, 600)
+
+    assert dcr.pp.preprocessing.downscale_image(image) is image, "downscaling switched off"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - get_otsu_threshold().
+# -----------------------------------------------------------------------------
+def test_get_otsu_threshold():
+    """Test: get_otsu_threshold()."""
+    pixels = numpy.array([50] * 100 + [200] * 100, dtype=numpy.uint8)
+
+    threshold = dcr.pp.preprocessing.get_otsu_threshold(pixels)
+
+    assert 50 <= threshold < 200, "threshold between the two grey levels"
+
+    # -------------------------------------------------------------------------
+    pixels = numpy.array([20] * 50 + [60] * 50 + [230] * 100, dtype=numpy.uint8)
+
+    assert 60 <= dcr.pp.preprocessing.get_otsu_threshold(pixels) < 230, "threshold between the dark and the light pixels"
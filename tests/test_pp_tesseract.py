@@ -4,15 +4,22 @@
 
 # pylint: disable=unused-argument
 """Testing Module pp.tesseract."""
+import glob
+import os
 
 import dcr_core.cls_setup
 import dcr_core.core_glob
+import fitz
 import pytest
+import sqlalchemy
 
 import dcr.cfg.cls_setup
 import dcr.cfg.glob
+import dcr.db.cls_db_core
+import dcr.db.cls_document
 import dcr.db.cls_run
 import dcr.launcher
+import dcr.pp.tesseract
 
 # -----------------------------------------------------------------------------
 # Constants & Globals.
@@ -20,6 +27,181 @@ import dcr.launcher
 # @pytest.mark.issue
 
 
+# -----------------------------------------------------------------------------
+# Test Function - merge_pages().
+# -----------------------------------------------------------------------------
+def test_merge_pages(fxtr_setup_logger_environment, tmp_path):
+    """Test: merge_pages()."""
+    full_name_base = str(tmp_path / "base.pdf")
+    full_name_ocr = str(tmp_path / "ocr.pdf")
+
+    # -------------------------------------------------------------------------
+    # Base document: text page - blank page - page converted by Tesseract
+    # OCR - blank page in landscape format.
+    # -------------------------------------------------------------------------
+    # noinspection PyUnresolvedReferences
+    with fitz.open() as pdf:
+        pdf.new_page(width=595, height=842).insert_text((72, 72), "page 1 text")
+        pdf.new_page(width=595, height=842)
+        pdf.new_page(width=595, height=842)
+        pdf.new_page(width=842, height=595)
+        pdf.save(full_name_base)
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open() as pdf:
+        pdf.new_page(width=595, height=842).insert_text((72, 72), "page 3 ocr")
+        pdf.save(full_name_ocr)
+
+    # -------------------------------------------------------------------------
+    dcr.pp.tesseract.merge_pages(full_name_base, full_name_ocr, [3])
+
+    # noinspection PyUnresolvedReferences
+    with fitz.open(full_name_ocr) as pdf:
+        assert pdf.page_count == 4, "page count of the base document"
+        assert [page.get_text().strip() for page in pdf] == ["page 1 text", "", "page 3 ocr", ""], "original page order"
+        assert (pdf[3].rect.width, pdf[3].rect.height) == (842, 595), "empty page with the size of the blank page"
+
+    assert not os.path.isfile(full_name_ocr + ".merged"), "temporary file removed"
+
+
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_IMAGE_2_PDF - normal - artifact cache.
+# -----------------------------------------------------------------------------
+def test_run_action_image_2_pdf_normal_artifact_cache(fxtr_rmdir_opt, fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_IMAGE_2_PDF - normal - artifact cache."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_ARTIFACT_CACHE_DIRECTORY, "data/artifact_cache_test"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_IGNORE_DUPLICATES, "true"),
+        ],
+    )
+
+    fxtr_rmdir_opt("data/artifact_cache_test")
+
+    stem_name = "pdf_scanned_ok"
+    file_ext = "pdf"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_image_2_pdf_normal_artifact_cache 1/2 <=========")
+
+    pytest.helpers.copy_files_4_pytest_2_dir(source_files=[(stem_name, file_ext)], target_path=dcr_core.core_glob.setup.directory_inbox)
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_TESSERACT])
+
+    assert os.path.isfile(
+        os.path.join(dcr_core.core_glob.setup.directory_inbox_accepted, stem_name + "_1_0." + dcr_core.core_glob.FILE_TYPE_PDF)
+    ), "first document converted by Tesseract OCR"
+
+    artifacts = glob.glob(os.path.join("data/artifact_cache_test", "*", "*." + dcr_core.core_glob.FILE_TYPE_PDF))
+    assert len(artifacts) == 1, "ocr result stored in the artifact cache"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_image_2_pdf_normal_artifact_cache 2/2 <=========")
+
+    pytest.helpers.copy_files_4_pytest_2_dir(source_files=[(stem_name, file_ext)], target_path=dcr_core.core_glob.setup.directory_inbox)
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PDF2IMAGE])
+
+    assert os.path.isfile(
+        os.path.join(dcr_core.core_glob.setup.directory_inbox_accepted, stem_name + "_2_0." + dcr_core.core_glob.FILE_TYPE_PDF)
+    ), "ocr result of the identical document restored from the artifact cache"
+    assert not os.path.isfile(
+        os.path.join(dcr_core.core_glob.setup.directory_inbox_accepted, stem_name + "_2_1." + dcr_core.core_glob.setup.pdf2image_type)
+    ), "identical document not converted by pdf2image"
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_TESSERACT])
+
+    assert dcr.cfg.glob.run.run_total_processed_ok == 0, "identical document not converted by Tesseract OCR"
+
+    artifacts = glob.glob(os.path.join("data/artifact_cache_test", "*", "*." + dcr_core.core_glob.FILE_TYPE_PDF))
+    assert len(artifacts) == 1, "no further artifact in the artifact cache"
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        action_codes = [
+            conn.execute(sqlalchemy.select(dbt.c.action_code).where(dbt.c.id_document == id_document).order_by(dbt.c.id)).scalars().all()
+            for id_document in (1, 2)
+        ]
+        conn.close()
+
+    assert action_codes[0] == action_codes[1], "same action history as without the artifact cache"
+
+    # -------------------------------------------------------------------------
+    fxtr_rmdir_opt("data/artifact_cache_test")
+
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test RUN_ACTION_IMAGE_2_PDF - normal - corrupt image file.
+# -----------------------------------------------------------------------------
+def test_run_action_image_2_pdf_normal_corrupt(fxtr_setup_empty_db_and_inbox):
+    """Test RUN_ACTION_IMAGE_2_PDF - normal - corrupt image file."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_DOC_ID_IN_FILE_NAME, "after"),
+        ],
+    )
+
+    stem_name = "png_corrupt"
+    file_ext = "png"
+
+    with open(os.path.join(dcr_core.core_glob.setup.directory_inbox, stem_name + "." + file_ext), "wb") as file_handle:
+        file_handle.write(b"no image")
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_image_2_pdf_normal_corrupt 1/2 <=========")
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_TESSERACT])
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.info("=========> test_run_action_image_2_pdf_normal_corrupt 2/2 <=========")
+
+    pytest.helpers.verify_content_of_inboxes(
+        inbox_accepted=(
+            [],
+            [
+                stem_name + "_1." + file_ext,
+            ],
+        ),
+    )
+
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        status = conn.execute(
+            sqlalchemy.select(dbt.c.status).where(dbt.c.action_code == dcr.db.cls_run.Run.ACTION_CODE_TESSERACT)
+        ).scalar_one()
+        conn.close()
+
+    assert status == dcr.db.cls_document.Document.DOCUMENT_STATUS_ERROR, "unidentified image finalised as an error"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
 # -----------------------------------------------------------------------------
 # Test RUN_ACTION_IMAGE_2_PDF - normal - duplicate.
 # -----------------------------------------------------------------------------
@@ -4,6 +4,7 @@
 
 # pylint: disable=unused-argument
 """Testing Module dcr.utils."""
+import hashlib
 import pathlib
 
 import dcr_core.core_glob  # pylint: disable=cyclic-import
@@ -20,6 +21,26 @@ import dcr.utils
 # @pytest.mark.issue
 
 
+# -----------------------------------------------------------------------------
+# Test Function - compute_sha256().
+# -----------------------------------------------------------------------------
+def test_compute_sha256(tmp_path):
+    """Test: compute_sha256()."""
+    content = bytes(range(256)) * (dcr.utils.SHA256_BUFFER_SIZE // 256 * 2 + 1)
+
+    file = tmp_path / "sha256_larger_than_buffer.bin"
+    file.write_bytes(content)
+
+    assert len(content) > dcr.utils.SHA256_BUFFER_SIZE, "file larger than the buffer"
+    assert dcr.utils.compute_sha256(file) == hashlib.sha256(content).hexdigest(), "sha256 of a file larger than the buffer"
+
+    # -------------------------------------------------------------------------
+    file = tmp_path / "sha256_empty.bin"
+    file.write_bytes(b"")
+
+    assert dcr.utils.compute_sha256(file) == hashlib.sha256(b"").hexdigest(), "sha256 of an empty file"
+
+
 # -----------------------------------------------------------------------------
 # Test Function - get_file_type().
 # -----------------------------------------------------------------------------
@@ -66,6 +87,80 @@ def test_get_stem_name():
     assert dcr_core.core_utils.get_stem_name(None) == ""
 
 
+# -----------------------------------------------------------------------------
+# Test Function - move_file().
+# -----------------------------------------------------------------------------
+def test_move_file(fxtr_setup_logger_environment, tmp_path):
+    """Test: move_file()."""
+    dcr_core.core_glob.setup.inbox_move_journal_file = str(tmp_path / "inbox_move_journal.jsonl")
+
+    full_name_curr = tmp_path / "move.pdf"
+    full_name_curr.write_bytes(b"%PDF-")
+    full_name_next = tmp_path / "move_1.pdf"
+    full_name_next.write_bytes(b"%PDF-existing")
+
+    assert not dcr.utils.move_file(full_name_curr, full_name_next), "target file exists"
+    assert full_name_next.read_bytes() == b"%PDF-existing", "target file not overwritten"
+    assert full_name_curr.is_file(), "file not moved"
+
+    # -------------------------------------------------------------------------
+    full_name_next.unlink()
+
+    assert dcr.utils.move_file(full_name_curr, full_name_next), "file moved"
+    assert not full_name_curr.is_file(), "file removed"
+    assert full_name_next.read_bytes() == b"%PDF-", "target file created"
+
+    # The move remains open until the database records the processing of the file.
+    dcr.utils.reconcile_move_journal(lambda full_name: False)
+
+    assert full_name_curr.read_bytes() == b"%PDF-", "not recorded in the database: file moved back"
+    assert not full_name_next.is_file(), "not recorded in the database: target file removed"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - reconcile_move_journal().
+# -----------------------------------------------------------------------------
+def test_reconcile_move_journal(fxtr_setup_logger_environment, tmp_path):
+    """Test: reconcile_move_journal()."""
+    dcr_core.core_glob.setup.inbox_move_journal_file = str(tmp_path / "inbox_move_journal.jsonl")
+
+    moves = {}
+
+    for stem_name in ("aborted", "committed", "moved_committed", "moved_uncommitted", "uncommitted"):
+        full_name_curr = tmp_path / (stem_name + ".pdf")
+        full_name_curr.write_bytes(b"%PDF-")
+        full_name_next = tmp_path / (stem_name + "_1.pdf")
+        full_name_next.write_bytes(b"%PDF-")
+        moves[stem_name] = (full_name_curr, full_name_next)
+
+        dcr.utils.write_move_journal(dcr.utils.MOVE_JOURNAL_START, full_name_curr, full_name_next)
+
+    dcr.utils.write_move_journal(dcr.utils.MOVE_JOURNAL_ABORT, *moves["aborted"])
+
+    moves["moved_committed"][0].unlink()
+    moves["moved_uncommitted"][0].unlink()
+
+    # -------------------------------------------------------------------------
+    dcr.utils.reconcile_move_journal(lambda full_name: full_name in (str(moves["committed"][0]), str(moves["moved_committed"][0])))
+
+    assert moves["aborted"][0].is_file(), "aborted move: file unchanged"
+    assert moves["aborted"][1].is_file(), "aborted move: existing target file unchanged"
+
+    assert not moves["committed"][0].is_file(), "recorded in the database: file removed"
+    assert moves["committed"][1].is_file(), "recorded in the database: target file kept"
+
+    assert not moves["moved_committed"][0].is_file(), "moved and recorded in the database: file not restored"
+    assert moves["moved_committed"][1].is_file(), "moved and recorded in the database: target file kept"
+
+    assert moves["moved_uncommitted"][0].is_file(), "moved and not recorded in the database: file moved back"
+    assert not moves["moved_uncommitted"][1].is_file(), "moved and not recorded in the database: target file removed"
+
+    assert moves["uncommitted"][0].is_file(), "not recorded in the database: file kept"
+    assert not moves["uncommitted"][1].is_file(), "not recorded in the database: target file removed"
+
+    assert not pathlib.Path(dcr_core.core_glob.setup.inbox_move_journal_file).is_file(), "move journal emptied"
+
+
 # -----------------------------------------------------------------------------
 # Test Function - progress_msg_disconnected() - case 1.
 # -----------------------------------------------------------------------------
@@ -0,0 +1,172 @@
+# Copyright (c) 2022 Konnexions GmbH. All rights reserved. Use of this
+# source code is governed by the Konnexions Public License (KX-PL)
+# Version 2020.05, that can be found in the LICENSE file.
+
+# pylint: disable=unused-argument
+"""Testing Module dcr.worker."""
+import concurrent.futures
+import concurrent.futures.process
+import os
+import types
+
+import dcr_core.core_glob
+import pytest
+import sqlalchemy
+
+import dcr.cfg.cls_setup
+import dcr.cfg.glob
+import dcr.db.cls_db_core
+import dcr.db.cls_run
+import dcr.launcher
+import dcr.worker
+
+# -----------------------------------------------------------------------------
+# Constants & Globals.
+# -----------------------------------------------------------------------------
+# @pytest.mark.issue
+
+
+# -----------------------------------------------------------------------------
+# Test Function - add_counters().
+# -----------------------------------------------------------------------------
+def test_add_counters():
+    """Test: add_counters()."""
+    run = types.SimpleNamespace(**{counter: 1 for counter in dcr.worker.RUN_COUNTERS})
+
+    for counters in (
+        {counter: 2 for counter in dcr.worker.RUN_COUNTERS},
+        {"run_total_processed_ok": 3},
+        {},
+    ):
+        dcr.worker.add_counters(run, counters)
+
+    for counter in dcr.worker.RUN_COUNTERS:
+        assert getattr(run, counter) == (6 if counter == "run_total_processed_ok" else 3), f"counter {counter}"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - get_counters().
+# -----------------------------------------------------------------------------
+def test_get_counters(fxtr_setup_logger_environment):
+    """Test: get_counters()."""
+    future = concurrent.futures.Future()
+    future.set_result({"run_total_processed_ok": 1})
+
+    assert dcr.worker.get_counters(future, dcr.worker.RUN_COUNTERS_ERROR) == {"run_total_processed_ok": 1}, "completed task"
+
+    # -------------------------------------------------------------------------
+    future = concurrent.futures.Future()
+    future.set_exception(concurrent.futures.process.BrokenProcessPool("worker process terminated"))
+
+    assert dcr.worker.get_counters(future, dcr.worker.RUN_COUNTERS_ERROR) == dcr.worker.RUN_COUNTERS_ERROR, "failed task"
+
+
+# -----------------------------------------------------------------------------
+# Test Function - process_actions() - parallel processing of a process step.
+# -----------------------------------------------------------------------------
+def test_process_actions_parallel(fxtr_setup_empty_db_and_inbox):
+    """Test: process_actions() - parallel processing of a process step."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_mini", "pdf"),
+            ("pdf_text_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_PDFLIB, "2"),
+        ],
+    )
+
+    # -------------------------------------------------------------------------
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_PDFLIB])
+
+    # -------------------------------------------------------------------------
+    # The counters of the worker processes are added to the current run.
+    # -------------------------------------------------------------------------
+    assert dcr.cfg.glob.run.run_total_processed_to_be == 2, "run: actions to be processed"
+    assert dcr.cfg.glob.run.run_total_processed_ok == 2, "run: actions processed"
+    assert dcr.cfg.glob.run.total_status_ready == 2, "run: actions ready"
+    assert dcr.cfg.glob.run.run_total_erroneous == 0, "run: actions erroneous"
+
+    # -------------------------------------------------------------------------
+    # Each action has been processed exactly once.
+    # -------------------------------------------------------------------------
+    dcr.cfg.glob.db_core = dcr.db.cls_db_core.DBCore()
+
+    dbt = dcr.cfg.glob.db_core.get_dbt(dcr.db.cls_db_core.DBCore.DBT_ACTION)
+
+    with dcr.cfg.glob.db_core.db_orm_engine.connect() as conn:
+        id_documents = (
+            conn.execute(sqlalchemy.select(dbt.c.id_document).where(dbt.c.action_code == dcr.db.cls_run.Run.ACTION_CODE_PARSER_LINE))
+            .scalars()
+            .all()
+        )
+        conn.close()
+
+    assert sorted(id_documents) == [1, 2], "one parser action per document"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)
+
+
+# -----------------------------------------------------------------------------
+# Test Function - process_inbox_file() - parallel processing of the inbox.
+# -----------------------------------------------------------------------------
+def test_process_inbox_file_parallel(fxtr_setup_empty_db_and_inbox):
+    """Test: process_inbox_file() - parallel processing of the inbox."""
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_START)
+
+    # -------------------------------------------------------------------------
+    pytest.helpers.copy_files_4_pytest_2_dir(
+        source_files=[
+            ("pdf_mini", "pdf"),
+            ("pdf_text_ok", "pdf"),
+        ],
+        target_path=dcr_core.core_glob.setup.directory_inbox,
+    )
+
+    pytest.helpers.copy_files_4_pytest(
+        [
+            (("pdf_text_ok", "pdf"), (dcr_core.core_glob.setup.directory_inbox, ["pdf_text_ok_copy"], "pdf")),
+        ]
+    )
+
+    pytest.helpers.config_params_modify(
+        dcr.cfg.cls_setup.Setup._DCR_CFG_SECTION_ENV_TEST,
+        [
+            (dcr.cfg.cls_setup.Setup._DCR_CFG_MAX_WORKERS_INBOX, "2"),
+        ],
+    )
+
+    # -------------------------------------------------------------------------
+    dcr.launcher.main([dcr.launcher.DCR_ARGV_0, dcr.db.cls_run.Run.ACTION_CODE_INBOX])
+
+    # -------------------------------------------------------------------------
+    # The counters of the worker processes are added to the current run.
+    # -------------------------------------------------------------------------
+    assert dcr.cfg.glob.run.run_total_processed_to_be == 3, "run: inbox files to be processed"
+    assert dcr.cfg.glob.run.run_total_processed_ok == 2, "run: inbox files accepted"
+    assert dcr.cfg.glob.run.run_total_erroneous == 1, "run: inbox files rejected"
+    assert dcr.cfg.glob.run.total_processed_pdflib == 2, "run: inbox files for pdflib"
+
+    # -------------------------------------------------------------------------
+    # The duplicate is detected across the worker processes.
+    # -------------------------------------------------------------------------
+    assert not os.listdir(dcr_core.core_glob.setup.directory_inbox), "inbox: all files processed"
+    assert len(os.listdir(dcr_core.core_glob.setup.directory_inbox_accepted)) == 2, "inbox_accepted: the original files"
+
+    files_rejected = os.listdir(dcr_core.core_glob.setup.directory_inbox_rejected)
+    assert len(files_rejected) == 1, "inbox_rejected: one file"
+    assert files_rejected[0].startswith("pdf_text_ok_copy"), "inbox_rejected: the later duplicate"
+
+    # -------------------------------------------------------------------------
+    dcr_core.core_glob.logger.debug(dcr_core.core_glob.LOGGER_END)